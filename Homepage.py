@@ -12,9 +12,9 @@ question_page_pairs = [
     ("Which countries have reduced their fossil fuel consumption the most in the last decade?", "1_Countries_Reducing_Fossil_Consumption"),
     ("Which regions or countries show a consistent decline in oil/gas/coal demand?", "2_Regions_Declining_Oil_Gas_Coal"),
     ("How has fossil fuel demand changed globally vs. in specific countries (e.g., India, China, US)?", "3_Global_vs_Country_Demand_Change"),
-    ("How have petroleum and liquid‑fuel production trends changed for individual countries (or globally) from 1973 to 2023?", "4_Petroleum_and_Liquids_Production"),
+    ("How have petroleum and liquid‑fuel production trends changed for individual countries (or globally) from 1973 to 2023?", "4_Petroleum & Liquids Production by Country"),
     ("How has global energy intensity (measured in MJ per unit GDP PPP) changed over time, and is the world becoming more energy efficient?", "5_Global_Energy_Intensity_vs_GDP"),
-    # Removed question 6
+    ("How has the world's total energy supply mix changed by source since 1990?", "6_Energy_Supply_by_Source"),
     ("What is the trend in modern renewables consumption (SDG 7.2 goal)?", "7_SDG72_Trend"),
     ("How does renewable energy growth correlate with reduction in fossil fuels?", "8_Renewables_vs_Fossil_Reduction"),
     ("Which regions are leaders in renewables adoption?", "9_Regions_Leading_Renewables"),
@@ -22,7 +22,9 @@ question_page_pairs = [
     ("What is the energy supply per unit GDP? Who is the most energy‑efficient?", "11_Energy_Supply_per_GDP"),
     ("Compare fossil fuel usage trends between developed vs. developing nations.", "12_Developed_vs_Developing_Fossil"),
     ("How does India compare to other BRICS nations in reducing fossil fuel use?", "13_India_vs_BRICS"),
-    ("How far is the world from achieving a renewable‑dominant energy mix?", "16_Progress_Towards_Renewable_Mix"),
+    ("How far is the world from achieving a renewable‑dominant energy mix?", "14_Progress_Towards_Renewable_Mix"),
+    ("How has the energy transition spread across the world map over time?", "15_Animated_Energy_Maps"),
+    ("I have my own question – can I chart any metric for any country?", "16_Metric_Explorer"),
     
 ]
 
@@ -39,3 +41,23 @@ st.page_link(
     f"pages/{selected_page}.py",
     label="🔗 Open selected analysis page",
 )
+
+# ────────────────────────────────────────────────────────────
+# Full dataset export (generated only when clicked)
+# ────────────────────────────────────────────────────────────
+def _full_panel_csv():
+    # imported here so the homepage itself never pays for pandas/openpyxl
+    from utils.data import read_owid
+    from utils.export import download_bytes, export_file
+
+    return download_bytes(export_file(read_owid, "owid-energy-data", "csv", filters="full"))
+
+with st.expander("⬇️ Download the full OWID energy panel"):
+    st.caption("All countries, years and columns of `owid-energy-data.xlsx` as CSV. Per-page tables can be downloaded from each page's *Data Source* section.")
+    st.download_button(
+        "⬇️ CSV",
+        data=_full_panel_csv,
+        file_name="owid-energy-data.csv",
+        mime="text/csv",
+        on_click="ignore",
+    )
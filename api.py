@@ -0,0 +1,220 @@
+"""
+Read-only metrics API served next to the Streamlit dashboard.
+
+Other tools can fetch the computed tables as JSON or CSV instead of scraping
+the UI.  Tables come from the same disk-cached functions the pages use
+(``utils.metrics``, ``utils.rankings``), so a warm dashboard means a warm
+API and vice versa.
+
+Run
+---
+    python api.py --port 8502
+
+Endpoints
+---------
+``GET /metrics``
+    List of available metrics.
+``GET /metrics/<name>``
+    One metric table.
+``GET /query?metrics=a,b``
+    Several metrics in one response (JSON: ``{name: {...}}``; CSV: rows
+    tagged with a ``metric`` column).
+
+``HEAD`` is accepted on every endpoint and returns the ``GET`` headers.
+
+Query parameters: ``countries=India,China`` filters rows (case-insensitive;
+world-only metrics such as ``world_renewables_share`` are returned whole),
+``format=json|csv`` selects the encoding (default ``json``).
+
+Responses carry a weak ``ETag`` derived from the data version, the code
+version and the request, so clients sending ``If-None-Match`` get
+``304 Not Modified`` until the source files or the table code change.
+Bodies are gzip-compressed when the client accepts it (``Vary:
+Accept-Encoding``).  A source file that is missing or does not match its
+schema gives ``503`` with a JSON ``error``.
+"""
+
+import argparse
+import gzip
+import hashlib
+import io
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import pandas as pd
+
+from utils.cache import code_version, data_version
+from utils.metrics import fossil_reductions, world_renewables_share
+from utils.rankings import ranking_index
+
+# responses smaller than this are not worth compressing
+GZIP_MIN_BYTES = 1024
+
+
+def _reductions():
+    table, start_year, max_year = fossil_reductions()
+    table = table.rename(columns={start_year: "start_twh", max_year: "end_twh"})
+    table.columns = table.columns.astype(str)
+    return table, {"start_year": start_year, "end_year": max_year, "page": 1}
+
+
+def _energy_per_gdp():
+    # the same index page 11 ranks from, so aggregates are excluded by ISO code in both
+    index = ranking_index("energy_per_gdp", ascending=True)
+    meta = {"year": None, "unit": "kWh per 2015 USD", "page": 11}
+    years = index.years_with_data()
+    if not years:
+        return pd.DataFrame(columns=["rank", "country", "energy_per_gdp"]), meta
+    year = years[-1]
+    table = index.top(year).rename(columns={"entity": "country", "value": "energy_per_gdp"})
+    return table, {**meta, "year": year}
+
+
+def _world_renewables():
+    table = world_renewables_share()[["country", "year", "renewables_share_energy"]]
+    return table.reset_index(drop=True), {"unit": "% of primary energy", "page": 14, "world_only": True}
+
+
+METRICS = {
+    "fossil_reductions": (_reductions, "10-year % change in coal + oil + gas consumption by country"),
+    "energy_per_gdp": (_energy_per_gdp, "Countries ranked by energy per unit GDP, latest year"),
+    "world_renewables_share": (_world_renewables, "World renewables share of primary energy by year"),
+}
+
+# in-process memo on top of the disk tier: {(name, data_version): (table, meta)}
+_tables = {}
+_tables_lock = threading.Lock()
+
+
+def get_table(name: str):
+    """Return ``(DataFrame, meta)`` for metric ``name`` at the current data version."""
+    key = (name, data_version())
+    with _tables_lock:
+        if key not in _tables:
+            # drop entries of older data versions before adding the new one
+            for stale in [k for k in _tables if k[1] != key[1]]:
+                del _tables[stale]
+            _tables[key] = METRICS[name][0]()
+        return _tables[key]
+
+
+def filter_countries(df: pd.DataFrame, countries, meta=None):
+    """Rows of ``countries``; tables without a country column or marked ``world_only`` are returned whole."""
+    if not countries or "country" not in df.columns or (meta or {}).get("world_only"):
+        return df
+    wanted = {c.strip().lower() for c in countries}
+    return df[df["country"].str.lower().isin(wanted)]
+
+
+def _records(df: pd.DataFrame):
+    return json.loads(df.to_json(orient="records"))
+
+
+def render(names, countries, fmt):
+    """Encode the requested metrics; returns ``(body_bytes, content_type)``."""
+    tables = {name: get_table(name) for name in names}
+
+    if fmt == "csv":
+        frames = []
+        for name, (df, meta) in tables.items():
+            df = filter_countries(df, countries, meta)
+            frames.append(df.assign(metric=name) if len(names) > 1 else df)
+        buf = io.StringIO()
+        pd.concat(frames, ignore_index=True).to_csv(buf, index=False)
+        return buf.getvalue().encode(), "text/csv; charset=utf-8"
+
+    payload = {
+        name: {"meta": meta, "rows": _records(filter_countries(df, countries, meta))}
+        for name, (df, meta) in tables.items()
+    }
+    if len(names) == 1:
+        payload = payload[names[0]]
+    return json.dumps(payload).encode(), "application/json"
+
+
+class MetricsHandler(BaseHTTPRequestHandler):
+    server_version = "EnergyMetrics/1.0"
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        params = parse_qs(url.query)
+        fmt = params.get("format", ["json"])[0]
+        countries = [c for v in params.get("countries", []) for c in v.split(",") if c.strip()]
+
+        if url.path.rstrip("/") == "/metrics":
+            body = {name: desc for name, (_, desc) in METRICS.items()}
+            return self._send(200, json.dumps(body).encode(), "application/json")
+
+        if url.path.startswith("/metrics/"):
+            names = [url.path[len("/metrics/"):].strip("/")]
+        elif url.path.rstrip("/") == "/query":
+            names = [n for v in params.get("metrics", []) for n in v.split(",") if n.strip()]
+        else:
+            return self._error(404, "unknown endpoint")
+
+        unknown = [n for n in names if n not in METRICS]
+        if not names or unknown:
+            return self._error(404, f"unknown metric(s): {', '.join(unknown) or '(none given)'}")
+        if fmt not in ("json", "csv"):
+            return self._error(400, "format must be json or csv")
+
+        # weak: the gzip and identity encodings of a response share one tag
+        version = f"{data_version()}|{code_version()}|{self.path}"
+        etag = 'W/"{}"'.format(hashlib.sha1(version.encode()).hexdigest()[:20])
+        sent = [t.strip().removeprefix("W/") for t in self.headers.get("If-None-Match", "").split(",")]
+        if etag.removeprefix("W/") in sent or "*" in sent:
+            return self._send(304, b"", None, etag)
+
+        try:
+            body, ctype = render(names, countries, fmt)
+        except (FileNotFoundError, ValueError) as exc:  # SchemaError is a ValueError
+            return self._error(503, f"data unavailable: {exc}")
+        self._send(200, body, ctype, etag)
+
+    do_HEAD = do_GET  # same headers, no body (see _send)
+
+    def _error(self, status, message):
+        self._send(status, json.dumps({"error": message}).encode(), "application/json")
+
+    def _send(self, status, body, ctype, etag=None):
+        if len(body) >= GZIP_MIN_BYTES and "gzip" in self.headers.get("Accept-Encoding", ""):
+            body = gzip.compress(body, compresslevel=6)
+            gzipped = True
+        else:
+            gzipped = False
+
+        self.send_response(status)
+        if ctype:
+            self.send_header("Content-Type", ctype)
+        if etag:
+            self.send_header("ETag", etag)
+            self.send_header("Cache-Control", "no-cache")  # revalidate with If-None-Match
+        if gzipped:
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("Vary", "Accept-Encoding")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(body)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve dashboard metrics as JSON/CSV.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8502)
+    args = parser.parse_args(argv)
+
+    server = ThreadingHTTPServer((args.host, args.port), MetricsHandler)
+    print(f"Serving metrics on http://{args.host}:{args.port}/metrics")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
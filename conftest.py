@@ -0,0 +1,2 @@
+# Makes the repository root importable (``utils``, ``api``), so plain ``pytest`` works
+# as well as ``python -m pytest``.
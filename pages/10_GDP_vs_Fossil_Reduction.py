@@ -9,25 +9,31 @@ Logic tweak
 * Work **backwards** up to 10 years; choose the earliest year within that
   window that still has complete data for the same countries.
 * Calculate %‑change (GDP ↑ vs Fossils ↓).
+
+Rolling windows
+---------------
+The heatmap shows the same comparison for **every** window of the chosen
+length and every country (`utils/decoupling.py`): GDP growth, fossil growth,
+their elasticity, or the decoupling class, one cell per country × start year.
 """
 
 import streamlit as st
+import numpy as np
 import pandas as pd
-import plotly.express as px
+
+from utils.data import read_owid
+from utils.decoupling import STATUS, rolling_decoupling
+from utils.schema import OWID, require
+from utils.ui import end_page, export_buttons, fragment, load_or_stop, profile_page, stop
 
 st.set_page_config(page_title="GDP ↑ vs Fossil ↓", layout="wide", page_icon="📈")
+profile_page(__file__)
 
 st.title("📈 Countries Growing GDP while Cutting Fossil-Fuel Use")
 
 @st.cache_data
-def load_data(path: str = "data/owid-energy-data.xlsx"):
-    df = pd.read_excel(path)
-    df.columns = df.columns.str.strip().str.lower()
-
-    required = ["country", "year", "gdp", "fossil_fuel_consumption"]
-    if any(c not in df.columns for c in required):
-        st.error("Dataset missing required columns.")
-        st.stop()
+def load_data():
+    df = require(read_owid(), ["gdp", "fossil_fuel_consumption"], OWID)
 
     # keep only rows with both metrics
     df = df.dropna(subset=["gdp", "fossil_fuel_consumption"])
@@ -46,8 +52,7 @@ def load_data(path: str = "data/owid-energy-data.xlsx"):
             break
 
     if base_year is None:
-        st.error("Could not find a suitable base year with overlapping data.")
-        st.stop()
+        return None, None, latest_year
 
     latest = df[df["year"] == latest_year][["country", "gdp", "fossil_fuel_consumption"]]
     base = df[df["year"] == base_year][["country", "gdp", "fossil_fuel_consumption"]]
@@ -62,28 +67,117 @@ def load_data(path: str = "data/owid-energy-data.xlsx"):
     return merged, base_year, latest_year
 
 # load
-plot_df, base_year, latest_year = load_data()
-
-# multiselect
-countries = sorted(plot_df["country"].unique())
-select = st.multiselect("Highlight countries (optional):", countries)
-show_df = plot_df if not select else plot_df[plot_df["country"].isin(select)]
-
-# scatter
-fig = px.scatter(
-    show_df,
-    x="gdp_change_pct",
-    y="fossil_change_pct",
-    hover_name="country",
-    title=f"GDP change vs Fossil change  ( {base_year} → {latest_year} )",
-    labels={"gdp_change_pct": "GDP change %", "fossil_change_pct": "Fossil‑fuel change %"},
-    color="gdp_change_pct",
-    template="plotly_white"
-)
-fig.add_vline(x=0, line_dash="dash", line_color="grey")
-fig.add_hline(y=0, line_dash="dash", line_color="grey")
-fig.update_layout(hovermode="closest")
-st.plotly_chart(fig, use_container_width=True)
+plot_df, base_year, latest_year = load_or_stop(load_data)
+if base_year is None:
+    st.error("Could not find a suitable base year with overlapping data.")
+    stop()
+
+@fragment
+def decoupling_scatter():
+    # multiselect
+    countries = sorted(plot_df["country"].unique())
+    select = st.multiselect("Highlight countries (optional):", countries)
+    show_df = plot_df if not select else plot_df[plot_df["country"].isin(select)]
+
+    # scatter
+    import plotly.express as px
+
+    fig = px.scatter(
+        show_df,
+        x="gdp_change_pct",
+        y="fossil_change_pct",
+        hover_name="country",
+        title=f"GDP change vs Fossil change  ( {base_year} → {latest_year} )",
+        labels={"gdp_change_pct": "GDP change %", "fossil_change_pct": "Fossil‑fuel change %"},
+        color="gdp_change_pct",
+        template="plotly_white"
+    )
+    fig.add_vline(x=0, line_dash="dash", line_color="grey")
+    fig.add_hline(y=0, line_dash="dash", line_color="grey")
+    fig.update_layout(hovermode="closest")
+    st.plotly_chart(fig, use_container_width=True)
+
+decoupling_scatter()
+
+# ──────────────────────────────────────────────────────────
+# Every rolling window: country × start-year heatmap
+# ──────────────────────────────────────────────────────────
+st.subheader("🗓️ Decoupling over every rolling window")
+
+@st.cache_data
+def load_rolling(window: int):
+    return rolling_decoupling(window)
+
+HEATMAP_METRICS = {
+    "Decoupling class": "status",
+    "Elasticity (fossil vs GDP)": "elasticity",
+    "GDP change %": "gdp_growth",
+    "Fossil-fuel change %": "fossil_growth",
+}
+
+@fragment
+def decoupling_heatmap():
+    c1, c2, c3 = st.columns([1, 2, 1])
+    window = c1.slider("Window (years)", 3, 20, 10)
+    label = c2.radio("Show", list(HEATMAP_METRICS), horizontal=True)
+    top_n = c3.number_input("Countries", 5, 250, 30, step=5, help="Ranked by share of windows with absolute decoupling")
+
+    roll = load_or_stop(load_rolling, window)
+    has_data = roll.status > 0
+    cols = has_data.any(axis=0)
+    share = roll.decoupled_share()
+    ranked = [i for i in np.argsort(-np.nan_to_num(share, nan=-1), kind="stable") if has_data[i].any()]
+    picked = st.multiselect("Countries (optional – overrides the ranking):", roll.countries, key="heatmap_countries")
+    rows = [roll.countries.index(c) for c in picked] if picked else ranked[:top_n]
+    if not rows or not cols.any():
+        st.info("No country has both GDP and fossil-fuel data for this window length.")
+        return
+
+    import plotly.graph_objects as go
+
+    z = getattr(roll, HEATMAP_METRICS[label])[np.ix_(rows, cols)]
+    starts = roll.start_years[cols]
+    names = [roll.countries[i] for i in rows]
+    hover = "%{y}<br>%{x}–%{customdata}<br>" + label + ": %{z:.2f}<extra></extra>"
+    custom = np.broadcast_to(starts + window, z.shape)
+    if label == "Decoupling class":
+        colors = ["#2ca02c", "#98df8a", "#d62728", "#7f7f7f"]  # one flat band per class code 1–4
+        scale = [[edge, c] for k, c in enumerate(colors) for edge in (k / 4, (k + 1) / 4)]
+        z = np.where(z == 0, np.nan, z).astype(float)
+        heat = go.Heatmap(z=z, x=starts, y=names, zmin=0.5, zmax=4.5, colorscale=scale,
+                          colorbar={"tickvals": list(STATUS), "ticktext": list(STATUS.values())},
+                          customdata=custom, hovertemplate="%{y}<br>%{x}–%{customdata}<extra></extra>")
+    elif label.startswith("Elasticity"):
+        heat = go.Heatmap(z=z, x=starts, y=names, zmid=0, zmin=-2, zmax=2, colorscale="RdYlGn_r",
+                          customdata=custom, hovertemplate=hover)
+    else:
+        bound = float(np.nanpercentile(np.abs(z), 95)) if np.isfinite(z).any() else 1.0
+        heat = go.Heatmap(z=z, x=starts, y=names, zmid=0, zmin=-bound, zmax=bound,
+                          colorscale="RdYlGn" if label.startswith("GDP") else "RdYlGn_r",
+                          customdata=custom, hovertemplate=hover)
+    fig = go.Figure(heat)
+    fig.update_layout(
+        title=f"{label} over {window}-year windows (x = start year)",
+        template="plotly_white",
+        height=max(350, 18 * len(rows) + 120),
+        yaxis={"autorange": "reversed"},
+        xaxis_title="Window start year",
+    )
+    st.plotly_chart(fig, use_container_width=True)
+
+    latest = int(starts[-1])
+    st.caption(
+        f"Elasticity = Δln(fossil use) / Δln(GDP): below 0 is absolute decoupling, 0–1 relative decoupling. "
+        f"In the latest window ({latest}–{latest + window}) "
+        f"{int((roll.status[:, cols][:, -1] == 1).sum())} of {int(has_data[:, cols][:, -1].sum())} countries decoupled absolutely."
+    )
+    export_buttons(
+        f"decoupling_{window}y",
+        lambda: pd.concat([roll.frame(int(y)) for y in starts], ignore_index=True),
+        filters={"window": window},
+    )
+
+decoupling_heatmap()
 
 with st.expander("🔍 Full table"):
     st.dataframe(plot_df.sort_values("gdp_change_pct", ascending=False))
@@ -91,8 +185,13 @@ with st.expander("🔍 Full table"):
 with st.expander("📌 Insights"):
     st.markdown(
         f"**Upper‑left quadrant**  → GDP ↑, Fossils ↓  → successful decoupling.\n"
-        f"Period analysed: **{base_year}** → **{latest_year}**."
+        f"Period analysed: **{base_year}** → **{latest_year}**.\n\n"
+        f"The heatmap repeats this test for every window: long green runs mark sustained decoupling, "
+        f"while isolated green cells are often recession or data-revision years."
     )
 
 with st.expander("📊 Data Source"):
     st.markdown("OWID energy dataset · variables: gdp, fossil_fuel_consumption · XLSX file")
+    export_buttons("gdp_vs_fossil_change", plot_df)
+
+end_page(__file__)
@@ -6,8 +6,9 @@ Lower values → higher efficiency.
 """
 
 import streamlit as st
-import pandas as pd
-import plotly.express as px
+
+from utils.rankings import ranking_index
+from utils.ui import end_page, export_buttons, fragment, load_or_stop, profile_page, stop
 
 # ────────────────────────────────────────────────────────────────────────────────
 # Page config
@@ -17,6 +18,7 @@ st.set_page_config(
     layout="wide",
     page_icon="⚡️"
 )
+profile_page(__file__)
 
 st.title("⚡️ Energy Supply per Unit GDP (Energy Intensity)")
 st.markdown(
@@ -30,49 +32,48 @@ st.markdown(
 # Data loader
 # ────────────────────────────────────────────────────────────────────────────────
 @st.cache_data
-def load_data(path: str = "data/owid-energy-data.xlsx"):
-    df = pd.read_excel(path)
-    df.columns = df.columns.str.strip().str.lower()
-
-    if "energy_per_gdp" not in df.columns:
-        st.error("Column `energy_per_gdp` not found – ensure OWID data version includes this metric.")
-        st.stop()
-
-    latest_year = int(df[df["energy_per_gdp"].notna()]["year"].max())
-    latest_df = df[(df["year"] == latest_year) & df["energy_per_gdp"].notna()][["country", "energy_per_gdp"]].copy()
+def load_data():
+    return ranking_index("energy_per_gdp", ascending=True)  # lowest (best) first
 
-    # remove aggregates
-    aggregates = ["world", "asia", "europe", "north america", "south america", "africa", "european union", "oceania"]
-    latest_df = latest_df[~latest_df["country"].str.lower().isin(aggregates)]
+# load (rankings for every year are precomputed; the sliders below only slice)
+index = load_or_stop(load_data)
+years = index.years_with_data()
+if not years:
+    st.warning("No energy per GDP values in the OWID dataset.")
+    stop()
 
-    latest_df = latest_df.sort_values("energy_per_gdp")  # lowest (best) first
-    return latest_df, latest_year
+@fragment
+def ranking_view():
+    # year + top‑N sliders
+    col_year, col_n = st.columns([2, 1])
+    year = col_year.select_slider("Year", options=years, value=years[-1])
+    N = col_n.slider("Show top N most efficient countries", 5, 30, 15)
+    rank_df = index.top(year).rename(columns={"entity": "country", "value": "energy_per_gdp"})
+    plot_df = rank_df.head(N)
 
-# load
-rank_df, year = load_data()
+    # bar chart (lower is better)
+    import plotly.express as px
 
-# top‑N slider
-N = st.slider("Show top N most efficient countries", 5, 30, 15)
-plot_df = rank_df.head(N)
+    fig = px.bar(
+        plot_df,
+        x="country",
+        y="energy_per_gdp",
+        title=f"Top {N} Energy‑Efficient Countries – {year}",
+        labels={"energy_per_gdp": "Energy per GDP (kWh / 2015 USD)", "country": "Country"},
+        color="energy_per_gdp",
+        color_continuous_scale="Blues_r",  # reversed so darker = lower (better)
+        height=550,
+        template="plotly_white"
+    )
+    fig.update_layout(xaxis_tickangle=-45)
+    st.plotly_chart(fig, use_container_width=True)
 
-# bar chart (lower is better)
-fig = px.bar(
-    plot_df,
-    x="country",
-    y="energy_per_gdp",
-    title=f"Top {N} Energy‑Efficient Countries – {year}",
-    labels={"energy_per_gdp": "Energy per GDP (kWh / 2015 USD)", "country": "Country"},
-    color="energy_per_gdp",
-    color_continuous_scale="Blues_r",  # reversed so darker = lower (better)
-    height=550,
-    template="plotly_white"
-)
-fig.update_layout(xaxis_tickangle=-45)
-st.plotly_chart(fig, use_container_width=True)
+    # full table
+    with st.expander("🔍 Full table"):
+        st.dataframe(rank_df, hide_index=True)
+        export_buttons(f"energy_per_gdp_ranking_{year}", rank_df)
 
-# full table
-with st.expander("🔍 Full table"):
-    st.dataframe(rank_df.reset_index(drop=True))
+ranking_view()
 
 # insights
 with st.expander("📌 Insights"):
@@ -80,7 +81,7 @@ with st.expander("📌 Insights"):
         f"""
         - Countries at the top (lowest bars) use **less energy per unit of economic output**, indicating **higher energy efficiency**.
         - Energy intensity depends on industrial structure, technology, and climate policies.
-        - Metric year: **{year}**.
+        - Metric years: **{years[0]}–{years[-1]}** (pick one with the year slider).
         """
     )
 
@@ -93,3 +94,5 @@ with st.expander("📊 Data Source"):
         - Lower value ⇒ more GDP produced per unit energy.
         """
     )
+
+end_page(__file__)
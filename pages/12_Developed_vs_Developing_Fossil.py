@@ -8,73 +8,65 @@ Dashboard: **Fossil‑fuel usage – Developed vs Developing (World Bank, Countr
     * **Developed** ▶ GDP‑per‑capita ≥ 25 000 USD (2015 constant)
     * **Developing** ▶ below that threshold.
 
-Metric plotted = `fossil_fuel_consumption` (TWh) from OWID.
+Metric plotted = `fossil_fuel_consumption` (TWh) from OWID, summed per group
+through the peer-group membership matrix (`utils/peers.py`).
 """
 
 import streamlit as st
-import pandas as pd
-import plotly.express as px
+
+from utils.data import read_owid
+from utils.peers import development_status, peer_groups, peer_series
+from utils.schema import OWID, require
+from utils.ui import end_page, export_buttons, fragment, load_or_stop, profile_page
 
 st.set_page_config(page_title="Developed vs Developing – Fossil Trends", layout="wide", page_icon="🌐")
+profile_page(__file__)
 
 st.title("🌐 Fossil‑Fuel Consumption: Developed vs Developing (World Bank GDP‑per‑capita)")
 
 # ──────────────────────────────────────────────────────────
-# Load World Bank Countries.csv (user‑provided format)
+# Classification (World Bank Countries.csv) and group totals
 # ──────────────────────────────────────────────────────────
 @st.cache_data
-def load_wb(path: str = "data/Countries.csv"):
-    wb = pd.read_csv(path)
-    wb.columns = wb.columns.str.strip().str.lower()
-    wb = wb.rename(columns={"country name": "country", "country code": "iso_code"})
-    # keep latest year per country
-    wb_latest = wb.sort_values("year").groupby("iso_code").tail(1)
-    wb_latest = wb_latest[["iso_code", "country", "gdp per capita"]].dropna()
-
-    threshold = 25_000
-    wb_latest["dev_status"] = wb_latest["gdp per capita"].apply(lambda x: "Developed" if x >= threshold else "Developing")
-    return wb_latest
+def load_group_totals():
+    """Developed / Developing totals per year (one sparse membership aggregate)."""
+    groups = {name: codes for name, codes in peer_groups().items() if name in ("Developed", "Developing")}
+    frame = peer_series("fossil_fuel_consumption", groups).frame()
+    return frame.rename(columns={"group": "dev_status", "value": "fossil_fuel_consumption"})
 
-# ──────────────────────────────────────────────────────────
-# Load OWID energy data
-# ──────────────────────────────────────────────────────────
 @st.cache_data
-def load_owid(path: str = "data/owid-energy-data.xlsx"):
-    ow = pd.read_excel(path)
-    ow.columns = ow.columns.str.strip().str.lower()
-    return ow
-
-wb_df = load_wb()
-owid_df = load_owid()
-
-# merge on ISO code
-merged = owid_df.merge(wb_df[["iso_code", "dev_status", "gdp per capita"]], on="iso_code", how="left")
-merged = merged.dropna(subset=["dev_status", "fossil_fuel_consumption"])
+def load_latest():
+    merged = require(read_owid(), ["fossil_fuel_consumption"], OWID).merge(development_status()[["iso_code", "dev_status", "gdp per capita"]], on="iso_code")
+    merged = merged.dropna(subset=["fossil_fuel_consumption"])
+    return merged[merged["year"] == merged["year"].max()]
+
+aggs = load_or_stop(load_group_totals)
+latest_merged = load_or_stop(load_latest)
+
+@fragment
+def trend_chart():
+    min_y, max_y = int(aggs["year"].min()), int(aggs["year"].max())
+    start, end = st.slider("Select year range", min_y, max_y, (min_y, max_y))
+    agg_range = aggs[(aggs["year"] >= start) & (aggs["year"] <= end)]
+
+    import plotly.express as px
+
+    fig = px.line(
+        agg_range,
+        x="year",
+        y="fossil_fuel_consumption",
+        color="dev_status",
+        labels={"fossil_fuel_consumption": "Fossil Consumption (TWh)", "dev_status": "Group"},
+        title=f"Fossil Consumption by Development Status ({start}–{end})",
+        template="plotly_white"
+    )
+    fig.update_traces(mode="lines+markers")
+    st.plotly_chart(fig, use_container_width=True)
 
-# ──────────────────────────────────────────────────────────
-# Aggregate developed vs developing trends
-# ──────────────────────────────────────────────────────────
-aggs = merged.groupby(["year", "dev_status"], as_index=False)["fossil_fuel_consumption"].sum()
-
-min_y, max_y = int(aggs["year"].min()), int(aggs["year"].max())
-start, end = st.slider("Select year range", min_y, max_y, (min_y, max_y))
-agg_range = aggs[(aggs["year"] >= start) & (aggs["year"] <= end)]
-
-fig = px.line(
-    agg_range,
-    x="year",
-    y="fossil_fuel_consumption",
-    color="dev_status",
-    labels={"fossil_fuel_consumption": "Fossil Consumption (TWh)", "dev_status": "Group"},
-    title=f"Fossil Consumption by Development Status ({start}–{end})",
-    template="plotly_white"
-)
-fig.update_traces(mode="lines+markers")
-st.plotly_chart(fig, use_container_width=True)
+trend_chart()
 
 # Latest‑year country table
-latest_yr = int(merged["year"].max())
-latest_tbl = merged[merged["year"] == latest_yr][["country", "dev_status", "fossil_fuel_consumption", "gdp per capita"]]
+latest_tbl = latest_merged[["country", "dev_status", "fossil_fuel_consumption", "gdp per capita"]]
 
 with st.expander("🗺️ Country development status (latest year)"):
     st.dataframe(latest_tbl.sort_values("fossil_fuel_consumption", ascending=False).reset_index(drop=True))
@@ -95,3 +87,9 @@ with st.expander("📊 Data Source"):
         * **World Bank Countries.csv** – GDP per capita for development classification
         """
     )
+    st.caption("Group totals by year")
+    export_buttons("fossil_by_development_status", aggs)
+    st.caption("Country classification (latest year)")
+    export_buttons("country_development_status", latest_tbl)
+
+end_page(__file__)
@@ -2,8 +2,9 @@
 """
 Dashboard: **How does India compare to other BRICS nations in reducing fossil‑fuel use?**
 
-BRICS = Brazil, Russia, India, China, South Africa  (OWID naming:
-"Brazil", "Russian Federation", "India", "China", "South Africa").
+BRICS = Brazil, Russia, India, China, South Africa, selected by ISO code
+through the peer-group definitions in `utils/peers.py` (so OWID's naming,
+e.g. "Russia", doesn't matter).
 Metric → `fossil_fuel_consumption` (TWh) from OWID.
 """
 
@@ -11,37 +12,32 @@ import streamlit as st
 import pandas as pd
 import plotly.express as px
 
+from utils.data import owid_matrix, read_owid
+from utils.peers import peer_groups, peer_series
+from utils.schema import OWID, require
+from utils.similarity import similarity_index
+from utils.ui import end_page, export_buttons, fragment, load_or_stop, profile_page, stop
+
 st.set_page_config(page_title="India vs BRICS – Fossil Trends", layout="wide", page_icon="🇮🇳")
+profile_page(__file__)
 
 st.title("🇮🇳 India vs Other BRICS Countries – Fossil‑Fuel Reduction")
 
-# Map OWID names → Display names
-OWID_BRICS = {
-    "Brazil": "Brazil",
-    "Russian Federation": "Russia",
-    "India": "India",
-    "China": "China",
-    "South Africa": "South Africa",
-}
+BRICS = peer_groups(derived=False)["BRICS"]
 
 # ────────────────────────────────────────────────────────────────────────────────
 # Load OWID data
 # ────────────────────────────────────────────────────────────────────────────────
 @st.cache_data
-def load_owid(path: str = "data/owid-energy-data.xlsx"):
-    df = pd.read_excel(path)
-    df.columns = df.columns.str.strip().str.lower()
-    # Keep rows where country matches BRICS OWID names exactly (case‑insensitive)
-    df = df[df["country"].str.lower().isin([c.lower() for c in OWID_BRICS.keys()])]
-    # Replace with display names
-    df["country"] = df["country"].str.title().map({k.title(): v for k, v in OWID_BRICS.items()})
-    return df
+def load_owid():
+    df = require(read_owid(), ["fossil_fuel_consumption"], OWID)
+    return df[df["iso_code"].isin(BRICS)]
 
-df = load_owid()
+df = load_or_stop(load_owid)
 
 if df.empty:
-    st.error("BRICS rows not found – check OWID country names.")
-    st.stop()
+    st.error("BRICS rows not found – check the ISO codes in the OWID file.")
+    stop()
 
 # ────────────────────────────────────────────────────────────────────────────────
 # Line chart
@@ -84,6 +80,108 @@ fig_bar.add_hline(y=0, line_dash="dash", line_color="grey")
 fig_bar.update_layout(xaxis_title="Country", yaxis_title="% Change")
 st.plotly_chart(fig_bar, use_container_width=True)
 
+# ────────────────────────────────────────────────────────────────────────────────
+# BRICS against other peer groups
+# ────────────────────────────────────────────────────────────────────────────────
+PEER_METRICS = {
+    "fossil_fuel_consumption": "Fossil consumption (TWh)",
+    "renewables_share_energy": "Renewables share of energy (%)",
+    "fossil_share_energy": "Fossil share of energy (%)",
+}
+
+@st.cache_data
+def load_peer_series(metric: str):
+    # every group's series in one aggregate over the country × year matrix
+    return peer_series(metric)
+
+st.subheader("👥 BRICS vs other peer groups")
+@fragment
+def peer_comparison():
+    col_m, col_g, col_h = st.columns([2, 3, 1])
+    metric = col_m.selectbox("Metric", list(PEER_METRICS), format_func=PEER_METRICS.get, key="peer_metric")
+    series = load_or_stop(load_peer_series, metric)
+    default = [g for g in ("BRICS", "G7", "EU-27", "OPEC") if g in series.groups]
+    groups = col_g.multiselect("Groups", series.groups, default=default)
+    # shares only make sense as a member average
+    how = "mean" if metric.endswith("_share_energy") else col_h.radio("Aggregate", ["total", "mean"], horizontal=True)
+    if not groups:
+        st.info("Select at least one group.")
+        return
+
+    peer_df = series.frame(groups, how=how, min_share=0.5)
+    fig_peer = px.line(
+        peer_df,
+        x="year",
+        y="value",
+        color="group",
+        hover_data=["reporting"],
+        labels={"value": f"{PEER_METRICS[metric]} – group {how}", "group": "Group", "reporting": "Members reporting"},
+        title=f"{PEER_METRICS[metric]} by peer group ({how} over members)",
+        template="plotly_white"
+    )
+    st.plotly_chart(fig_peer, use_container_width=True)
+    st.caption("Years where fewer than half of a group's members report are hidden.")
+    export_buttons("peer_groups", peer_df, filters={"metric": metric, "groups": groups, "how": how})
+
+peer_comparison()
+
+# ────────────────────────────────────────────────────────────────────────────────
+# Countries with a similar trajectory (beyond BRICS)
+# ────────────────────────────────────────────────────────────────────────────────
+SIMILARITY_METRICS = {
+    "fossil_fuel_consumption": "Fossil consumption (TWh)",
+    "fossil_share_energy": "Fossil share of energy (%)",
+    "renewables_share_energy": "Renewables share of energy (%)",
+    "energy_per_gdp": "Energy per GDP (kWh / $)",
+}
+
+@st.cache_data
+def load_similarity(metric: str, method: str):
+    return similarity_index(metric, method, k=20)
+
+@st.cache_data
+def load_series(metric: str):
+    countries, years, values = owid_matrix(metric)
+    return pd.DataFrame(values, index=countries, columns=years)
+
+st.subheader("🔎 Countries with a trajectory like …")
+@fragment
+def similar_trajectories():
+    col_c, col_m, col_s, col_k = st.columns([2, 2, 1, 1])
+    sim_metric = col_m.selectbox("Metric", list(SIMILARITY_METRICS), format_func=SIMILARITY_METRICS.get)
+    method = col_s.radio("Score", ["correlation", "distance"], horizontal=True)
+    k = col_k.slider("Neighbours", 3, 20, 5)
+
+    index = load_or_stop(load_similarity, sim_metric, method)
+    default = index.countries.index("India") if "India" in index.countries else 0
+    target = col_c.selectbox("Country", index.countries, index=default)
+
+    neighbours = index.lookup(target).head(k)
+    if neighbours.empty:
+        st.info(f"Not enough overlapping {SIMILARITY_METRICS[sim_metric].lower()} data to compare {target}.")
+    else:
+        series = load_series(sim_metric).loc[[target] + neighbours["country"].tolist()]
+        # z-normalise so the chart compares shapes, like the index does
+        z = series.sub(series.mean(axis=1), axis=0).div(series.std(axis=1, ddof=0), axis=0)
+        sim_long = z.rename_axis("country").reset_index().melt(id_vars="country", var_name="year", value_name="z").dropna()
+
+        col_tbl, col_fig = st.columns([1, 2])
+        col_tbl.dataframe(neighbours, hide_index=True)
+        fig_sim = px.line(
+            sim_long,
+            x="year",
+            y="z",
+            color="country",
+            labels={"z": f"{SIMILARITY_METRICS[sim_metric]} (z-score)"},
+            title=f"Normalised trajectories: {target} and its {len(neighbours)} closest matches",
+            template="plotly_white"
+        )
+        fig_sim.update_traces(line_width=1)
+        fig_sim.update_traces(selector={"name": target}, line_width=4)
+        col_fig.plotly_chart(fig_sim, use_container_width=True)
+
+similar_trajectories()
+
 # ────────────────────────────────────────────────────────────────────────────────
 # Insights
 # ────────────────────────────────────────────────────────────────────────────────
@@ -96,3 +194,6 @@ with st.expander("📌 Insights"):
 
 with st.expander("📊 Data Source"):
     st.markdown("OWID energy dataset – variable: `fossil_fuel_consumption` (TWh)")
+    export_buttons("brics_fossil_consumption", line_df)
+
+end_page(__file__)
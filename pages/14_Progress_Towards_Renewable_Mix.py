@@ -5,29 +5,32 @@ Dashboard: **How far is the world from achieving a renewable-dominant energy mix
 Goal: Plot global progress in renewables share over time.
 Metric: `renewables_share_energy` from OWID.
 Criteria: Highlight years when the share exceeds 50% (renewables-dominant).
+Projection: linear / logistic trends fitted to every country at once
+(`utils/projections.py`) give an estimated 50% crossing year with an interval.
 """
 
 import streamlit as st
 import pandas as pd
 import plotly.express as px
 
+from utils.metrics import world_renewables_share
+from utils.projections import MODELS, renewables_projection
+from utils.ui import end_page, export_buttons, fragment, load_or_stop, profile_page, stop
+
 st.set_page_config(page_title="Renewables Share Over Time", layout="wide", page_icon="🌍")
+profile_page(__file__)
 
 st.title("🌍 Global Progress Towards Renewable‑Dominant Energy Mix")
 
 @st.cache_data
-def load_data(path: str = "data/owid-energy-data.xlsx"):
-    df = pd.read_excel(path)
-    df.columns = df.columns.str.strip().str.lower()
-    world_df = df[df["country"] == "World"]
-    world_df = world_df.dropna(subset=["renewables_share_energy"])
-    return world_df
+def load_data():
+    return world_renewables_share()
 
-df = load_data()
+df = load_or_stop(load_data)
 
 if df.empty:
     st.error("Global (World) data not found in OWID file.")
-    st.stop()
+    stop()
 
 # Line chart of renewables share
 over_50 = df[df["renewables_share_energy"] >= 50]
@@ -44,6 +47,67 @@ fig.add_hline(y=50, line_dash="dot", line_color="green", annotation_text="Renewa
 
 st.plotly_chart(fig, use_container_width=True)
 
+# ──────────────────────────────────────────────────────────
+# Projection: when does each country cross 50%?
+# ──────────────────────────────────────────────────────────
+@st.cache_data
+def load_projection(model: str, window: int):
+    return renewables_projection(model, window)
+
+def _fmt_year(value):
+    if pd.isna(value):
+        return "–"
+    return "never on trend" if value == float("inf") else str(int(round(value)))
+
+@fragment
+def projection_view():
+    st.subheader("🔮 Projected 50% Crossing Year")
+    c1, c2 = st.columns(2)
+    model = c1.selectbox("Trend model", MODELS, format_func=str.capitalize)
+    window = c2.slider("Fit window (last N years)", 5, 40, 20, step=5)
+
+    proj = load_projection(model, window)
+    table = proj.table()
+    if table.empty:
+        st.info("Not enough recent data to fit trends.")
+        return
+
+    entity = st.selectbox("Show fitted trend for", table["entity"].tolist())
+    i = proj.index(entity)
+    horizon = proj.years[-1] + 80
+    future = list(range(int(proj.years[0]), int(horizon) + 1))
+    observed = pd.DataFrame({"year": proj.years, "share": proj.values[i], "series": "Observed"}).dropna()
+    fitted = pd.DataFrame({"year": future, "share": proj.curve(entity, future), "series": f"{model.capitalize()} trend"})
+    fitted = fitted[(fitted["year"] >= proj.x0 - window / 2) & fitted["share"].between(0, 100)]
+
+    fig = px.line(
+        pd.concat([observed, fitted]), x="year", y="share", color="series",
+        labels={"share": "Renewables Share (%)", "year": "Year", "series": ""},
+        title=f"{entity}: observed share and {model} trend ({window}-year fit)",
+        template="plotly_white",
+    )
+    fig.add_hline(y=proj.target, line_dash="dot", line_color="green")
+    st.plotly_chart(fig, use_container_width=True)
+
+    row = table[table["entity"] == entity].iloc[0]
+    if not pd.isna(row["reached_in"]):
+        st.markdown(f"**{entity}** first reached {proj.target:.0f}% in **{int(row['reached_in'])}**.")
+    else:
+        st.markdown(
+            f"**{entity}** is projected to cross {proj.target:.0f}% in **{_fmt_year(row['crossing_year'])}** "
+            f"(interval {_fmt_year(row['crossing_lo'])} – {_fmt_year(row['crossing_hi'])})."
+        )
+
+    pending = table[table["reached_in"].isna()].sort_values("crossing_year")
+    shown = pending.assign(**{
+        col: pending[col].map(_fmt_year) for col in ("crossing_year", "crossing_lo", "crossing_hi")
+    }).drop(columns="reached_in")
+    st.markdown("**Countries not yet at 50%, by projected crossing year**")
+    st.dataframe(shown.round(2), use_container_width=True, hide_index=True)
+    export_buttons("renewables_projection", table, filters={"model": model, "window": window})
+
+projection_view()
+
 # Latest year summary
 latest = df.sort_values("year").iloc[-1]
 with st.expander("📌 Insights"):
@@ -56,3 +120,7 @@ with st.expander("📌 Insights"):
 
 with st.expander("📊 Data Source"):
     st.markdown("OWID energy dataset – variable: `renewables_share_energy` (% of total energy)")
+    st.markdown("Projections: least-squares trends over the last N years of every country; intervals move the fitted slope by ±1.96 standard errors.")
+    export_buttons("world_renewables_share", df)
+
+end_page(__file__)
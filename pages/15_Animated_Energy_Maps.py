@@ -0,0 +1,70 @@
+# pages/15_Animated_Energy_Maps.py
+"""
+Dashboard: **How has the energy transition spread across the world over time?**
+
+Animated world choropleth for key OWID metrics, keyed by ISO code.
+Frames are precomputed and quantised per metric (see `utils/maps.py`),
+so the animation stays small enough to send to the browser quickly.
+"""
+
+import streamlit as st
+
+from utils.data import read_owid
+from utils.maps import MAP_METRICS, animated_choropleth, map_frames
+from utils.ui import end_page, export_buttons, load_or_stop, profile_page, stop
+
+st.set_page_config(page_title="Animated Energy Maps", layout="wide", page_icon="🗺️")
+profile_page(__file__)
+
+st.title("🗺️ The Energy Transition on the World Map")
+st.markdown("Pick a metric and press ▶ (or drag the year slider) to watch it change country by country.")
+
+@st.cache_data
+def load_figure(metric: str):
+    title, unit, colorscale = MAP_METRICS[metric]
+    frames = map_frames(metric)
+    fig = animated_choropleth(frames, title, unit, colorscale)
+    return fig, len(frames.years), len(frames.iso), frames.step, unit
+
+metric = st.radio(
+    "Metric",
+    list(MAP_METRICS),
+    format_func=lambda m: MAP_METRICS[m][0],
+    horizontal=True
+)
+
+fig, n_years, n_countries, step, unit = load_or_stop(load_figure, metric)
+
+if n_years == 0:
+    st.warning("No data available for this metric.")
+    stop()
+
+st.plotly_chart(fig, use_container_width=True)
+st.caption(
+    f"{n_years} yearly frames × {n_countries} countries · colour values rounded to steps of {step:g} {unit}"
+)
+
+with st.expander("📌 Insights"):
+    st.markdown(
+        """
+        - **Fossil share** remains dominant in most countries; watch where the colour fades first.
+        - **Renewables share** is highest where hydropower is abundant (e.g. Norway, Brazil) and rises fastest where wind and solar scale up.
+        - **Energy per GDP** falls in most countries over time, showing improving energy efficiency.
+        """
+    )
+
+with st.expander("📊 Data Source"):
+    st.markdown(
+        """
+        - **Dataset:** `owid-energy-data.xlsx` (Our World in Data)
+        - **Variables:** `fossil_share_energy`, `renewables_share_energy`, `energy_per_gdp`, mapped by `iso_code`
+        - Aggregates (World, continents, income groups) are excluded.
+        """
+    )
+    export_buttons(
+        f"{metric}_by_country",
+        lambda: read_owid().dropna(subset=["iso_code", metric])[["country", "iso_code", "year", metric]],
+        filters={"metric": metric}
+    )
+
+end_page(__file__)
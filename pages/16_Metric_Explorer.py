@@ -0,0 +1,135 @@
+# pages/16_Metric_Explorer.py
+"""
+Dashboard: **Explore any OWID metric**
+
+Pick any numeric OWID column, a set of countries/regions and a year range,
+and chart it as a line, bar or scatter.  Queries are answered from one
+shared columnar copy of the dataset (`utils/query.py`), and the search box
+looks up metrics, units, entities and the dashboard's question pages in a
+prebuilt inverted index.
+"""
+
+import streamlit as st
+
+from utils.cache import code_version, data_version
+from utils.query import label_of, query_engine
+from utils.ui import end_page, export_buttons, fragment, load_or_stop, profile_page
+
+st.set_page_config(page_title="Metric Explorer", layout="wide", page_icon="🔎")
+profile_page(__file__)
+
+st.title("🔎 Metric Explorer")
+st.markdown("Chart **any** OWID energy metric for any countries or regions – or search for the question page that already answers it.")
+
+# one engine per process, data version and code version: columns and query results are shared by every session
+@st.cache_resource(max_entries=2)
+def load_engine(version: str, code: str):
+    return query_engine()
+
+engine = load_or_stop(load_engine, data_version(), code_version())
+store = engine.store
+
+def metric_label(metric: str) -> str:
+    unit = store.units.get(metric)
+    return f"{label_of(metric)} ({unit})" if unit else label_of(metric)
+
+# ──────────────────────────────────────────────────────────
+# Search
+# ──────────────────────────────────────────────────────────
+@fragment
+def search_box():
+    text = st.text_input("Search metrics, countries and questions", placeholder="e.g. solar share, india, per capita")
+    if not text:
+        return
+    hits = engine.index.search(text, limit=30)
+    if not hits:
+        st.caption("No matches.")
+        return
+
+    metrics = [h for h in hits if h[0] == "metric"]
+    entities = [h for h in hits if h[0] == "entity"]
+    pages = [h for h in hits if h[0] == "page"]
+    c1, c2, c3 = st.columns(3)
+    with c1:
+        st.markdown("**Metrics**")
+        for _, key, _, _ in metrics[:10]:
+            st.markdown(f"- `{key}` – {metric_label(key)}")
+    with c2:
+        st.markdown("**Countries / regions**")
+        for _, key, _, code in entities[:10]:
+            st.markdown(f"- {key}" + (f" ({code})" if code else ""))
+    with c3:
+        st.markdown("**Question pages**")
+        for _, page, question, _ in pages[:10]:
+            st.page_link(f"pages/{page}.py", label=question)
+
+search_box()
+
+# ──────────────────────────────────────────────────────────
+# Explorer
+# ──────────────────────────────────────────────────────────
+@fragment
+def explorer():
+    metrics = store.metrics()
+    default_metric = "fossil_fuel_consumption" if "fossil_fuel_consumption" in metrics else metrics[0]
+    c1, c2 = st.columns([2, 1])
+    metric = c1.selectbox("Metric", metrics, index=metrics.index(default_metric), format_func=metric_label)
+    chart = c2.radio("Chart", ["Line", "Bar", "Scatter"], horizontal=True)
+
+    x_metric = None
+    if chart == "Scatter":
+        others = [m for m in metrics if m != metric]
+        default_x = "gdp" if "gdp" in others else others[0]
+        x_metric = st.selectbox("X-axis metric", others, index=others.index(default_x), format_func=metric_label)
+
+    defaults = [e for e in ("World", "China", "India", "United States") if e in store.entities]
+    entities = st.multiselect("Countries / regions", store.entities, default=defaults)
+    first, last = store.year_range()
+    start, end = st.slider("Years", first, last, (max(first, last - 30), last))
+
+    if not entities:
+        st.info("Select at least one country or region.")
+        return
+
+    df = engine.query([metric] + ([x_metric] if x_metric else []), entities, start, end)
+    if df.empty:
+        st.warning("No data for this selection.")
+        return
+
+    import plotly.express as px
+
+    labels = {metric: metric_label(metric), "entity": "", "year": "Year"}
+    if chart == "Line":
+        fig = px.line(df, x="year", y=metric, color="entity", markers=True, labels=labels)
+        fig.update_layout(hovermode="x unified")
+    elif chart == "Bar":
+        latest = df.dropna(subset=[metric]).groupby("entity").tail(1).sort_values(metric, ascending=False)
+        fig = px.bar(latest, x="entity", y=metric, hover_data=["year"], labels=labels,
+                     title=f"Latest value in {start}–{end}")
+    else:
+        labels[x_metric] = metric_label(x_metric)
+        fig = px.scatter(df.dropna(), x=x_metric, y=metric, color="entity", hover_data=["year"], labels=labels)
+    st.plotly_chart(fig, use_container_width=True)
+
+    st.caption("Download this selection")
+    export_buttons(
+        "metric_explorer",
+        df,
+        filters={"metrics": [metric, x_metric], "entities": sorted(entities), "years": [start, end]},
+    )
+
+explorer()
+
+with st.expander("📌 Insights"):
+    st.markdown(f"""
+    The explorer covers **{len(store.metrics())} metrics** for **{len(store.entities)} countries and regions**.
+    Use it for quick comparisons; the question pages add context and derived indicators for specific questions.
+    """)
+
+with st.expander("📊 Data Source"):
+    st.markdown("""
+    - **File:** `data/owid-energy-data.xlsx` (Our World in Data)
+    - Units are inferred from OWID's column naming conventions.
+    """)
+
+end_page(__file__, shared=("engine", "store"))
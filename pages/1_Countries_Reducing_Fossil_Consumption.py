@@ -1,8 +1,10 @@
 # pages/1_Countries_Reducing_Fossil_Consumption.py
 
 import streamlit as st
-import pandas as pd
-import plotly.express as px
+
+from utils.data import read_owid
+from utils.metrics import fossil_reductions
+from utils.ui import end_page, export_buttons, fragment, load_or_stop, profile_page, stop
 
 # Page configuration
 st.set_page_config(
@@ -10,6 +12,7 @@ st.set_page_config(
     layout="wide",
     page_icon="📉"
 )
+profile_page(__file__)
 
 st.title("📉 Countries Reducing Fossil Fuel Consumption the Most (Last Decade)")
 st.markdown("""
@@ -19,26 +22,13 @@ over the last decade, and lets you explore their full consumption trends.
 
 @st.cache_data
 def compute_reductions():
-    df = pd.read_excel("data/owid-energy-data.xlsx")
-    df.columns = df.columns.str.strip().str.lower()
-    max_year = int(df["year"].max())
-    start_year = max_year - 10
-    df = df[df["year"].isin([start_year, max_year])]
-    df["fossil_total"] = (
-        df["coal_consumption"].fillna(0) +
-        df["oil_consumption"].fillna(0) +
-        df["gas_consumption"].fillna(0)
-    )
-    pivot = df.pivot(index="country", columns="year", values="fossil_total").dropna()
-    pivot["change_pct"] = ((pivot[max_year] - pivot[start_year]) / pivot[start_year] * 100).round(2)
-    result = pivot.reset_index().sort_values("change_pct")
-    return result, start_year, max_year
+    return fossil_reductions()
 
-reductions_df, start_year, max_year = compute_reductions()
+reductions_df, start_year, max_year = load_or_stop(compute_reductions)
 
 if reductions_df.empty:
     st.error("Insufficient data to compute reductions.")
-    st.stop()
+    stop()
 
 # Show top 10
 top_n = 10
@@ -52,50 +42,57 @@ st.dataframe(
     })[[ "country", f"{start_year} (TWh)", f"{max_year} (TWh)", "Change (%)" ]]
 )
 
-# Dropdown for selecting countries to plot
-all_countries = reductions_df["country"].tolist()
-default_countries = top10["country"].tolist()
-selected = st.multiselect(
-    "Select countries to view full consumption trends:",
-    options=all_countries,
-    default=default_countries
-)
-
 # Load full time series
 @st.cache_data
 def load_trends(countries):
-    df_full = pd.read_excel("data/owid-energy-data.xlsx")
-    df_full.columns = df_full.columns.str.strip().str.lower()
+    df_full = read_owid()
     df_full = df_full[df_full["country"].isin(countries)]
     df_full["fossil_total"] = (
         df_full["coal_consumption"].fillna(0) +
         df_full["oil_consumption"].fillna(0) +
         df_full["gas_consumption"].fillna(0)
     )
-    df_full = df_full.dropna(subset=["year", "fossil_total"])
-    df_full["year"] = df_full["year"].astype(int)
+    df_full = df_full.dropna(subset=["fossil_total"])
     return df_full
 
-trend_df = load_trends(selected)
-
-if trend_df.empty:
-    st.warning("No trend data available for the selected countries.")
-else:
-    fig = px.line(
-        trend_df,
-        x="year",
-        y="fossil_total",
-        color="country",
-        title="Fossil Fuel Consumption Trends",
-        labels={
-            "year": "Year",
-            "fossil_total": "Total Fossil Consumption (TWh)",
-            "country": "Country"
-        },
-        markers=True
+@fragment
+def trend_explorer():
+    # Dropdown for selecting countries to plot
+    all_countries = reductions_df["country"].tolist()
+    default_countries = top10["country"].tolist()
+    selected = st.multiselect(
+        "Select countries to view full consumption trends:",
+        options=all_countries,
+        default=default_countries
     )
-    fig.update_layout(hovermode="x unified")
-    st.plotly_chart(fig, use_container_width=True)
+
+    trend_df = load_trends(selected)
+
+    if trend_df.empty:
+        st.warning("No trend data available for the selected countries.")
+    else:
+        import plotly.express as px
+
+        fig = px.line(
+            trend_df,
+            x="year",
+            y="fossil_total",
+            color="country",
+            title="Fossil Fuel Consumption Trends",
+            labels={
+                "year": "Year",
+                "fossil_total": "Total Fossil Consumption (TWh)",
+                "country": "Country"
+            },
+            markers=True
+        )
+        fig.update_layout(hovermode="x unified")
+        st.plotly_chart(fig, use_container_width=True)
+
+    st.caption("Download trends for the selected countries")
+    export_buttons("fossil_trends", trend_df, filters={"countries": selected})
+
+trend_explorer()
 
 # Narrative
 with st.expander("📌 Narrative"):
@@ -111,3 +108,6 @@ with st.expander("📊 Data Source"):
     - **Columns used:** `country`, `year`, `coal_consumption`, `oil_consumption`, `gas_consumption`  
     - Data provided by Our World in Data.
     """)
+    export_buttons("fossil_reductions", reductions_df)
+
+end_page(__file__)
@@ -1,17 +1,23 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
 import plotly.express as px
 
+from utils.data import read_bp_scenarios
+from utils.decline import FUELS, decline_stats
+from utils.ui import end_page, export_buttons, fragment, load_or_stop, profile_page
+
 st.set_page_config(
     layout="wide",
     page_title="Regions Declining Fossil Demand",
     page_icon="🌍"
 )
+profile_page(__file__)
 
 @st.cache_data
 def load_data():
     # Load the region-scenario table
-    df = pd.read_excel("data/bpEO24-change-in-oil-demand-by-region.xlsx")
+    df = read_bp_scenarios()
     # Rename the first column to 'scenario'
     df = df.rename(columns={"Year": "scenario"})
     
@@ -24,7 +30,7 @@ def load_data():
     )
     return long
 
-df = load_data()
+df = load_or_stop(load_data)
 
 st.title("Which regions show consistent decline in oil/gas/coal demand?")
 st.markdown("""
@@ -49,6 +55,68 @@ fig = px.bar(
 )
 st.plotly_chart(fig, use_container_width=True)
 
+# --- Historical decliners (OWID consumption data) ---
+@st.cache_data
+def load_decline(window: int):
+    return decline_stats(window)
+
+st.subheader("Which countries have actually been cutting oil, gas or coal?")
+st.markdown("""
+Ranks every country in the OWID dataset by its **trend over a rolling window** of historical consumption.
+A decline counts as *consistent* when the trend is negative **and** most year‑on‑year steps in the window fell.
+""")
+
+@fragment
+def decline_ranking():
+    c1, c2, c3 = st.columns(3)
+    fuel = c1.radio("Fuel", list(FUELS), horizontal=True, format_func=str.capitalize)
+    window = c2.slider("Window length (years)", 5, 20, 10)
+    min_share = c3.slider("Min. share of declining years", 0.5, 1.0, 0.7, 0.05)
+
+    stats = load_or_stop(load_decline, window)[fuel]
+    end_year = st.select_slider("Window ends in", options=stats.end_years.tolist(), value=int(stats.end_years[-1]))
+    col = int(np.searchsorted(stats.end_years, end_year))
+    year_col = int(np.searchsorted(stats.years, end_year))
+
+    ranking = pd.DataFrame({
+        "country": stats.countries,
+        "trend_pct_per_year": stats.rel_slope[:, col],
+        "trend_twh_per_year": stats.slope[:, col],
+        "declining_years_share": stats.decline_share[:, col],
+        "current_streak_years": stats.streak[:, year_col],
+    }).dropna(subset=["trend_pct_per_year"])
+    ranking["consistent"] = (ranking["trend_pct_per_year"] < 0) & (ranking["declining_years_share"] >= min_share)
+    decliners = ranking[ranking["consistent"]].sort_values("trend_pct_per_year")
+
+    st.metric(
+        f"Countries with consistent {fuel} decline ({end_year - window + 1}–{end_year})",
+        f"{len(decliners)} of {len(ranking)}"
+    )
+    if decliners.empty:
+        st.info("No country meets the consistency criteria for this window.")
+    else:
+        fig_dec = px.bar(
+            decliners.head(20),
+            x="country",
+            y="trend_pct_per_year",
+            color="declining_years_share",
+            color_continuous_scale="Reds",
+            title=f"Steepest consistent {fuel} decliners ({end_year - window + 1}–{end_year})",
+            labels={
+                "country": "Country",
+                "trend_pct_per_year": "Trend (% of window mean per year)",
+                "declining_years_share": "Declining years"
+            }
+        )
+        fig_dec.update_layout(xaxis_tickangle=-45)
+        st.plotly_chart(fig_dec, use_container_width=True)
+
+    with st.expander("🔍 Full ranking"):
+        st.dataframe(ranking.sort_values("trend_pct_per_year").round(3).reset_index(drop=True))
+        export_buttons(f"{fuel}_decline_ranking", ranking)
+
+decline_ranking()
+
 with st.expander("📌 Narrative"):
     st.markdown("""
     - Under the **Net Zero** pathway, all regions cut demand far more sharply than under the current trajectory.  
@@ -60,4 +128,8 @@ with st.expander("📊 Data Source"):
     st.markdown("""
     - `data/bpEO24-change-in-oil-demand-by-region.xlsx`  
     - Table of projected fossil demand change (TWh) by region under two scenarios  
+    - `data/owid-energy-data.xlsx` – `coal_consumption`, `oil_consumption`, `gas_consumption` (TWh) for the historical ranking  
     """)
+    export_buttons("bp_demand_change", df)
+
+end_page(__file__)
@@ -2,23 +2,28 @@ import streamlit as st
 import pandas as pd
 import plotly.express as px
 
+from utils.data import read_owid
+from utils.metrics import FOSSIL_COLUMNS
+from utils.schema import OWID, require
+from utils.ui import end_page, export_buttons, load_or_stop, profile_page
+
 st.set_page_config(
     layout="wide",
     page_title="Global vs Country Demand",
     page_icon="🌐"
 )
+profile_page(__file__)
 
 @st.cache_data
 def load_data():
     # Load OWID energy data
-    df = pd.read_excel("data/owid-energy-data.xlsx")
-    df.columns = df.columns.str.strip().str.lower()
+    df = require(read_owid(), FOSSIL_COLUMNS, OWID)
     
     # Calculate total fossil consumption per country-year
     df['fossil_total'] = (
-        df.get('coal_consumption', 0).fillna(0) +
-        df.get('oil_consumption', 0).fillna(0) +
-        df.get('gas_consumption', 0).fillna(0)
+        df['coal_consumption'].fillna(0) +
+        df['oil_consumption'].fillna(0) +
+        df['gas_consumption'].fillna(0)
     )
     
     # Filter for years >= 2000
@@ -36,7 +41,7 @@ def load_data():
     # Combine
     return pd.concat([global_df, country_df], ignore_index=True)
 
-df = load_data()
+df = load_or_stop(load_data)
 
 st.title("Global vs Specific Countries Fossil Demand")
 st.markdown("""
@@ -70,3 +75,6 @@ with st.expander("📊 Data Source"):
     - `data/owid-energy-data.xlsx`  
     - Columns used: `country`, `year`, `coal_consumption`, `oil_consumption`, `gas_consumption`
     """)
+    export_buttons("global_vs_country_fossil", df)
+
+end_page(__file__)
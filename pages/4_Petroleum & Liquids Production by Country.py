@@ -1,88 +1,92 @@
 import streamlit as st
-import pandas as pd
-import plotly.express as px
-import re
+
+from utils.petroleum import production_index
+from utils.ui import end_page, export_buttons, load_or_stop, profile_page
 
 st.set_page_config(
     layout="wide",
     page_title="Petroleum & Liquids Production by Country",
     page_icon="🌐"
 )
+profile_page(__file__)
 
 st.title("🌐 Petroleum & Liquids Production by Country")
 
 st.markdown("""
-Select a country (or “World”) to see how its various petroleum‐liquid production series evolved from 1973–2023.
+Select a country (or “World”) to see how its various petroleum‐liquid production series evolved from 1973–2023,
+or select several countries to overlay one series and their combined total.
 """)
 
 @st.cache_data
-def load_data():
-    # Load Excel file and skip metadata row
-    df = pd.read_excel("data/INT-Export-04-03-2025_21-40-52.xlsx", skiprows=1, dtype=str)
-    df.columns = [str(c).strip() for c in df.columns]  # Force headers to string
-
-    # Rename the first two columns
-    df.rename(columns={df.columns[0]: "series_code", df.columns[1]: "series_name"}, inplace=True)
-
-    # Detect and assign country
-    df["country"] = None
-    current_country = None
-    for i, row in df.iterrows():
-        code, name = row["series_code"], row["series_name"]
-        if pd.isna(code) or str(name).strip().lower() == "production":
-            prev_name = df.at[i - 1, "series_name"] if i > 0 else None
-            if prev_name:
-                current_country = str(prev_name).strip()
-        df.at[i, "country"] = current_country or "World"
-
-    # Filter out non-data rows
-    df = df[~df["series_name"].str.strip().isin(["Production"] + df["country"].unique().tolist())]
-
-    # Detect year columns (string safe)
-    year_cols = [str(c) for c in df.columns if str(c).isdigit() and len(str(c)) == 4]
-
-    # Melt to long format
-    df_long = df.melt(
-        id_vars=["country", "series_name"],
-        value_vars=year_cols,
-        var_name="year",
-        value_name="production_mbpd"
-    )
-
-    df_long["year"] = pd.to_numeric(df_long["year"], errors="coerce", downcast="integer")
-    df_long["production_mbpd"] = pd.to_numeric(df_long["production_mbpd"], errors="coerce")
-
-    return df_long.dropna(subset=["production_mbpd"])
-
-# Load the data
-df = load_data()
-
-# Dropdown for country selection
-available_countries = sorted(df["country"].unique())
-selected_country = st.selectbox("Select a Country", ["World"] + [c for c in available_countries if c != "World"])
-
-# Filter data for selected country
-filtered = df[df["country"] == selected_country]
-
-# Display line chart
-if not filtered.empty:
-    fig = px.line(
-        filtered,
-        x="year",
-        y="production_mbpd",
-        color="series_name",
-        title=f"{selected_country}: Petroleum-Liquid Production (Mb/d)",
-        labels={
-            "year": "Year",
-            "production_mbpd": "Production (Mb/d)",
-            "series_name": "Category"
-        },
-        markers=True
-    )
-    fig.update_layout(hovermode="x unified")
-    st.plotly_chart(fig, use_container_width=True)
+def load_index():
+    return production_index()
+
+# Load the per-country index (country list is precomputed, World first)
+index = load_or_stop(load_index)
+
+selected = st.multiselect("Select countries", index.countries, default=["World"])
+
+if not selected:
+    st.info("Select at least one country.")
+elif len(selected) == 1:
+    # Single country: every series of that country
+    selected_country = selected[0]
+    filtered = index.country_frame(selected_country)
+
+    # Display line chart
+    if not filtered.empty:
+        import plotly.express as px
+
+        fig = px.line(
+            filtered,
+            x="year",
+            y="production_mbpd",
+            color="series_name",
+            title=f"{selected_country}: Petroleum-Liquid Production (Mb/d)",
+            labels={
+                "year": "Year",
+                "production_mbpd": "Production (Mb/d)",
+                "series_name": "Category"
+            },
+            markers=True
+        )
+        fig.update_layout(hovermode="x unified")
+        st.plotly_chart(fig, use_container_width=True)
+    else:
+        st.warning("No data found for selected country.")
 else:
-    st.warning("No data found for selected country.")
+    # Several countries: overlay one series, optionally with their sum
+    default_series = "Total petroleum and other liquids (Mb/d)"
+    col_series, col_sum = st.columns([3, 1])
+    series = col_series.selectbox(
+        "Series",
+        index.series,
+        index=index.series.index(default_series) if default_series in index.series else 0
+    )
+    with_sum = col_sum.checkbox("Show sum of selected", value=True)
+
+    overlay = index.overlay(selected, series, with_sum=with_sum)
+    if not overlay.empty:
+        import plotly.express as px
+
+        fig = px.line(
+            overlay,
+            x="year",
+            y="production_mbpd",
+            color="country",
+            title=f"{series} – {len(selected)} countries",
+            labels={
+                "year": "Year",
+                "production_mbpd": "Production (Mb/d)",
+                "country": "Country"
+            },
+            markers=True
+        )
+        fig.update_traces(selector={"name": "Sum of selected"}, line_dash="dash", line_width=3)
+        fig.update_layout(hovermode="x unified")
+        st.plotly_chart(fig, use_container_width=True)
+    else:
+        st.warning(f"No {series} data found for the selected countries.")
 
 # --- Narrative and Data Source ---
 with st.expander("📌 Narrative"):
@@ -92,6 +96,7 @@ with st.expander("📌 Narrative"):
     By selecting a specific country or the global view ("World"), users can:
     - Track historical trends in total and segmented petroleum output.
     - Observe when certain countries increased or reduced their production.
+    - Overlay several producers on one series and compare them with their combined total.
     - Compare between different petroleum liquid series such as:
         - Crude oil, NGPL, and other liquids
         - NGPL (Natural Gas Plant Liquids)
@@ -108,3 +113,6 @@ with st.expander("📊 Data Source"):
     - Series include multiple petroleum-based metrics in million barrels per day (Mb/d)
     - Country segments are identified based on structure of the file (e.g., 'Production' headers)
     """)
+    export_buttons("petroleum_production", lambda: index.long_frame(selected), filters={"countries": selected})
+
+end_page(__file__)
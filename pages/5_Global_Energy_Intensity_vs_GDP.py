@@ -1,48 +1,63 @@
 # Page: Global Energy Intensity vs GDP
-# Version 1: For GDP (not PPP)
+# GDP at market exchange rates, with an optional PPP-based comparison
 
 import streamlit as st
 import pandas as pd
 import plotly.express as px
 
+from utils.iea import iea_series, read_iea_world
+from utils.ui import end_page, export_buttons, load_or_stop, profile_page, stop
+
 st.set_page_config(
     page_title="Global Energy Intensity vs GDP",
     layout="wide",
     page_icon="📉"
 )
+profile_page(__file__)
 
 st.title("📉 Global Energy Intensity Over Time (GDP-based)")
 st.markdown("""
 This dashboard visualizes the change in global **energy intensity** over time,
-based on **GDP** (not adjusted for purchasing power parity).
+based on **GDP** at market exchange rates, optionally compared with **GDP PPP** (adjusted for purchasing power parity).
 Energy intensity is expressed in **MJ per thousand 2015 USD**.
 """)
 
 @st.cache_data
 def load_data():
-    df = pd.read_excel("data/Total-energy-supply-_TES_-by-GDP-World.xlsx", skiprows=3)
-    df.columns = df.columns.str.strip()
-    return df
+    return read_iea_world()
+
+iea = load_or_stop(load_data)
 
-df = load_data()
+BASES = {
+    "GDP (market exchange rates)": "TES/GDP",
+    "GDP PPP (purchasing power parity)": "TES/GDP PPP",
+}
+missing = [ind for ind in BASES.values() if ind not in set(iea["indicator"])]
+if "TES/GDP" in missing:
+    st.error("Expected indicator 'TES/GDP' not found in the IEA World-series files.")
+    stop()
 
-if "Year" not in df.columns or "TES/GDP" not in df.columns:
-    st.error("Expected columns 'Year' and 'TES/GDP' not found in the Excel file.")
-    st.stop()
+options = [label for label, ind in BASES.items() if ind not in missing]
+chosen = st.multiselect("GDP basis", options, default=options[:1])
+if not chosen:
+    st.info("Select at least one GDP basis.")
+    stop()
 
 # Filter and convert
-plot_df = df[["Year", "TES/GDP"]].dropna()
-plot_df["Year"] = pd.to_numeric(plot_df["Year"], errors="coerce").astype("Int64")
-plot_df["TES/GDP"] = pd.to_numeric(plot_df["TES/GDP"], errors="coerce")
-plot_df = plot_df.dropna()
+plot_df = pd.concat(
+    [iea_series(iea, BASES[label]).assign(basis=label) for label in chosen],
+    ignore_index=True
+)
+unit = plot_df["unit"].dropna().iloc[0] if plot_df["unit"].notna().any() else "MJ per 1,000 USD"
 
 # Chart
 fig = px.line(
     plot_df,
-    x="Year",
-    y="TES/GDP",
+    x="year",
+    y="value",
+    color="basis",
     title="Global Energy Intensity (MJ per 1,000 USD GDP)",
-    labels={"Year": "Year", "TES/GDP": "MJ per 1,000 USD"},
+    labels={"year": "Year", "value": unit, "basis": "GDP basis"},
     markers=True
 )
 fig.update_layout(hovermode="x unified")
@@ -51,7 +66,8 @@ st.plotly_chart(fig, use_container_width=True)
 # Narrative
 with st.expander("📌 Key Insights"):
     st.markdown("""
-    - Shows how efficiently the world uses energy relative to **GDP (not PPP)**.
+    - Shows how efficiently the world uses energy relative to **GDP** (and, if selected, **GDP PPP**).
+    - PPP-based intensity is lower because PPP GDP values output in emerging economies more highly.
     - A **downward trend** indicates improved energy efficiency.
     - Useful for tracking **sustainability progress** relative to economic activity.
     """)
@@ -59,7 +75,10 @@ with st.expander("📌 Key Insights"):
 # Data Source
 with st.expander("📊 Data Source"):
     st.markdown("""
-    - **File:** `Total-energy-supply-_TES_-by-GDP-World.xlsx`
-    - **Columns:** `Year`, `TES/GDP`
-    - Data reflects energy use per GDP, **not adjusted for PPP**.
+    - **Files:** `Total-energy-supply-_TES_-by-GDP-World.xlsx`, `Total-energy-supply-_TES_-by-GDP-_PPP_-World.xlsx`
+    - **Columns:** `Year`, `TES/GDP`, `TES/GDP PPP`
+    - The `TES/GDP` series is **not adjusted for PPP**; `TES/GDP PPP` is.
     """)
+    export_buttons("energy_intensity", plot_df)
+
+end_page(__file__)
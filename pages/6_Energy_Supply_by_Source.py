@@ -0,0 +1,74 @@
+# pages/6_Energy_Supply_by_Source.py
+
+import streamlit as st
+import plotly.express as px
+
+from utils.iea import read_iea_world
+from utils.ui import end_page, export_buttons, load_or_stop, profile_page, stop
+
+# Page config
+st.set_page_config(
+    page_title="Global Energy Supply by Source",
+    layout="wide",
+    page_icon="🏭"
+)
+profile_page(__file__)
+
+st.title("🏭 Global Total Energy Supply by Source")
+st.markdown("""
+How has the world's **total energy supply (TES)** mix changed since 1990?
+Switch between absolute supply (exajoules) and each source's share of the total.
+""")
+
+@st.cache_data
+def load_data():
+    iea = read_iea_world()
+    df = iea[iea["dataset"] == "Total energy supply (TES) by source"].copy()
+    df["supply_ej"] = df["value"] / 1e6  # TJ → EJ
+    df["share_pct"] = df["supply_ej"] / df.groupby("year")["supply_ej"].transform("sum") * 100
+    return df.rename(columns={"indicator": "source"})[["year", "source", "supply_ej", "share_pct"]]
+
+# Load data
+df = load_or_stop(load_data)
+
+if df.empty:
+    st.error("`Total-energy-supply-_TES_-by-source-World.xlsx` not found or empty.")
+    stop()
+
+view = st.radio("Show", ["Absolute supply (EJ)", "Share of total (%)"], horizontal=True)
+y_col = "supply_ej" if view.startswith("Absolute") else "share_pct"
+
+# Stacked area chart
+fig = px.area(
+    df,
+    x="year",
+    y=y_col,
+    color="source",
+    title="World Total Energy Supply by Source",
+    labels={"year": "Year", "supply_ej": "Supply (EJ)", "share_pct": "Share of TES (%)", "source": "Source"}
+)
+fig.update_layout(hovermode="x unified")
+st.plotly_chart(fig, use_container_width=True)
+
+# Key Insights
+first, last = int(df["year"].min()), int(df["year"].max())
+fossil = ["Coal", "Natural gas", "Oil"]
+fossil_share = df[df["source"].isin(fossil)].groupby("year")["share_pct"].sum()
+with st.expander("📌 Key Insights"):
+    st.markdown(f"""
+    - Fossil fuels (coal, natural gas, oil) supplied **{fossil_share.get(first, float('nan')):.1f}%** of world TES in {first}
+      and **{fossil_share.get(last, float('nan')):.1f}%** in {last}.
+    - Growth in **wind, solar, etc.** is fast in relative terms but starts from a very small base.
+    """)
+
+# Data Source
+with st.expander("📊 Data Source"):
+    st.markdown("""
+    - **File:** `Total-energy-supply-_TES_-by-source-World.xlsx`
+    - **Columns Used:** `Year`, one column per source, `Units` (TJ)
+    - **Entity:** Global only
+    - **Source:** IEA World Energy Balances
+    """)
+    export_buttons("energy_supply_by_source", df)
+
+end_page(__file__)
@@ -1,15 +1,18 @@
 # pages/7_SDG72_Trend.py
 
 import streamlit as st
-import pandas as pd
 import plotly.express as px
 
+from utils.iea import iea_series, read_iea_world
+from utils.ui import end_page, export_buttons, load_or_stop, profile_page
+
 # Page config
 st.set_page_config(
     page_title="Global Renewable Energy Share Trend (SDG 7.2)",
     layout="wide",
     page_icon="🔋"
 )
+profile_page(__file__)
 
 st.title("🔋 Global Growth in Renewable Energy Share")
 st.markdown("""
@@ -19,17 +22,12 @@ as defined under **Sustainable Development Goal 7.2**. It reflects how the world
 
 @st.cache_data
 def load_data():
-    df = pd.read_excel("data/Renewable-share-_modern-renewables_-in-final-energy-consumption-_SDG-7.2_-World.xlsx", skiprows=3)
-    df.columns = df.columns.str.strip()
-    df = df.rename(columns={"Share of modern renewables": "Renewable Share (%)"})
-    df = df[["Year", "Renewable Share (%)"]].dropna()
-    df["Year"] = pd.to_numeric(df["Year"], errors="coerce")
-    df["Renewable Share (%)"] = pd.to_numeric(df["Renewable Share (%)"], errors="coerce")
-    df = df.dropna()
-    return df
+    df = iea_series(read_iea_world(), "Share of modern renewables")
+    df = df.rename(columns={"year": "Year", "value": "Renewable Share (%)"})
+    return df[["Year", "Renewable Share (%)"]]
 
 # Load data
-df = load_data()
+df = load_or_stop(load_data)
 
 # Preview
 total_years = df.shape[0]
@@ -65,3 +63,6 @@ with st.expander("📊 Data Source"):
     - **Entity:** Global only
     - **Source:** IEA / Our World in Data
     """)
+    export_buttons("sdg72_renewable_share", df)
+
+end_page(__file__)
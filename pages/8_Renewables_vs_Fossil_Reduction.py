@@ -1,23 +1,23 @@
 import streamlit as st
-import pandas as pd
-import plotly.express as px
+
+from utils.data import read_owid
+from utils.schema import OWID, require
+from utils.ui import end_page, export_buttons, fragment, load_or_stop, profile_page
 
 st.set_page_config(layout="wide", page_title="Renewables vs Fossil Correlation", page_icon="🔗")
+profile_page(__file__)
 
 @st.cache_data
 def load_data():
-    df = pd.read_excel("data/owid-energy-data.xlsx")
-    df.columns = df.columns.str.strip().str.lower()
-    if 'year' not in df.columns:
-        raise KeyError("The 'year' column is missing.")
+    df = require(read_owid(), ['renewables_share_energy', 'fossil_fuel_consumption'], OWID)
     latest_year = df['year'].max()
     df_latest = df[df['year'] == latest_year]
-    df_latest = df_latest[['country', 'renewables_share_energy', 'fossil_fuel_consumption']]
+    df_latest = df_latest[['country', 'iso_code', 'renewables_share_energy', 'fossil_fuel_consumption']]
     df_latest = df_latest.dropna(subset=['country', 'renewables_share_energy', 'fossil_fuel_consumption'])
     return df_latest, latest_year
 
 # Load data
-df, year = load_data()
+df, year = load_or_stop(load_data)
 
 # Title and description
 st.title("Renewables Growth vs Fossil Reduction Correlation")
@@ -25,26 +25,42 @@ st.markdown(f"""
 This scatter plot compares countries' **renewable energy share** and **fossil fuel consumption** in the year **{year}**.
 """)
 
-# Country selection
-default_countries = df['country'].unique().tolist()
-selected_countries = st.multiselect("Select countries to display:", default_countries, default=default_countries)
-
-# Filter based on selection
-filtered_df = df[df['country'].isin(selected_countries)]
-
-# Plot
-fig = px.scatter(
-    filtered_df,
-    x="renewables_share_energy",
-    y="fossil_fuel_consumption",
-    hover_name="country",
-    title=f"Renewable Share vs Fossil Fuel Consumption ({year})",
-    labels={
-        "renewables_share_energy": "Renewable Share (%)",
-        "fossil_fuel_consumption": "Fossil Consumption (TWh)"
-    }
-)
-st.plotly_chart(fig, use_container_width=True)
+DEFAULT_COUNTRIES = 25
+
+@fragment
+def scatter_explorer():
+    # Country selection (default: the largest fossil consumers, so the default state stays small;
+    # rows without an ISO code or with an OWID_ one are aggregates such as "World" or "Asia")
+    all_countries = sorted(df['country'].unique().tolist())
+    iso = df['iso_code'].astype('string')
+    countries_only = df[iso.notna() & ~iso.str.startswith('OWID_', na=False)]
+    default_countries = countries_only.nlargest(DEFAULT_COUNTRIES, 'fossil_fuel_consumption')['country'].tolist()
+    selected_countries = st.multiselect("Select countries to display:", all_countries, default=default_countries, key="scatter_countries")
+
+    # Filter based on selection
+    filtered_df = df[df['country'].isin(selected_countries)]
+
+    # Plot
+    import plotly.express as px
+
+    fig = px.scatter(
+        filtered_df,
+        x="renewables_share_energy",
+        y="fossil_fuel_consumption",
+        hover_name="country",
+        title=f"Renewable Share vs Fossil Fuel Consumption ({year})",
+        labels={
+            "renewables_share_energy": "Renewable Share (%)",
+            "fossil_fuel_consumption": "Fossil Consumption (TWh)"
+        }
+    )
+    st.plotly_chart(fig, use_container_width=True)
+
+    # Download the current selection
+    st.caption("Download the selected countries")
+    export_buttons("renewables_vs_fossil", filtered_df, filters={"countries": selected_countries})
+
+scatter_explorer()
 
 # Narrative
 with st.expander("📌 Narrative"):
@@ -58,3 +74,5 @@ with st.expander("📊 Data Source"):
     - Source: [OWID Energy Data](https://github.com/owid/energy-data)
     - File used: `owid-energy-data.xlsx`
     """)
+
+end_page(__file__)
@@ -3,12 +3,17 @@
 Dashboard: Which regions *or* countries are leaders in renewables adoption?
 
 * If the OWID dataset has a **`continent`** column → rank continents.
-* If it does **not** → fall back to ranking **countries**.
+* If it does **not** → fall back to ranking **countries** (OWID aggregates excluded).
+
+Rankings for every year are precomputed, so the year and top‑N sliders only slice.
 """
 
 import streamlit as st
-import pandas as pd
-import plotly.express as px
+
+from utils.data import read_owid
+from utils.rankings import build_ranking, ranking_index
+from utils.schema import OWID, require
+from utils.ui import end_page, export_buttons, fragment, load_or_stop, profile_page, stop
 
 # --------------------------------------------------
 # Page config
@@ -18,6 +23,7 @@ st.set_page_config(
     layout="wide",
     page_icon="🌱"
 )
+profile_page(__file__)
 
 st.title("🌱 Leaders in Renewable Energy Adoption")
 
@@ -25,69 +31,77 @@ st.title("🌱 Leaders in Renewable Energy Adoption")
 # Data loader
 # --------------------------------------------------
 @st.cache_data
-def load_data(path: str = "data/owid-energy-data.xlsx"):
-    df = pd.read_excel(path)
-    df.columns = df.columns.str.strip().str.lower()
+def load_data():
+    """Per-year ranking index, by continent if OWID provides one, else by country."""
+    df = require(read_owid(), ["renewables_share_energy"], OWID)
 
-    if "renewables_share_energy" not in df.columns:
-        st.error("Column `renewables_share_energy` not found in the dataset.")
-        st.stop()
+    if "continent" in df.columns:
+        wide = (
+            df.dropna(subset=["continent"])
+            .groupby(["continent", "year"])["renewables_share_energy"].mean()
+            .unstack("year")
+        )
+        index = build_ranking(
+            "renewables_share_energy", wide.index, wide.columns.to_numpy(dtype=int),
+            wide.to_numpy(dtype=float), ascending=False
+        )
+        return index, "continent"
 
-    latest_year = int(df[df["renewables_share_energy"].notna()]["year"].max())
-    latest_df = df[(df["year"] == latest_year) & df["renewables_share_energy"].notna()].copy()
-
-    return latest_df, latest_year
+    return ranking_index("renewables_share_energy", ascending=False), "country"
 
 # --------------------------------------------------
 # Load data and determine grouping level
 # --------------------------------------------------
-latest_df, year = load_data()
-
-if "continent" in latest_df.columns:
-    group_mode = "continent"
-    data_df = (
-        latest_df.dropna(subset=["continent"])
-        .groupby("continent", as_index=False)["renewables_share_energy"].mean()
-        .rename(columns={"renewables_share_energy": "renew_share"})
-        .sort_values("renew_share", ascending=False)
-    )
-else:
-    group_mode = "country"
-    data_df = (
-        latest_df[["country", "renewables_share_energy"]]
-        .rename(columns={"renewables_share_energy": "renew_share"})
-        .sort_values("renew_share", ascending=False)
+index, group_mode = load_or_stop(load_data)
+years = index.years_with_data()
+if not years:
+    st.warning("No renewables share values in the OWID dataset.")
+    stop()
+
+@fragment
+def ranking_view():
+    # --------------------------------------------------
+    # UI controls (pure slicing of the precomputed ranking)
+    # --------------------------------------------------
+    col_year, col_n = st.columns([2, 1])
+    year = col_year.select_slider("Year", options=years, value=years[-1])
+    data_df = index.top(year).rename(columns={"entity": group_mode, "value": "renew_share"})
+
+    if len(data_df) > 3:
+        max_n = min(25 if group_mode == "country" else len(data_df), len(data_df))
+        N = col_n.slider("Show top N", 3, max_n, min(10, max_n))
+    else:  # too few entries for a slider: show them all
+        N = len(data_df)
+    plot_df = data_df.head(N)
+
+    # --------------------------------------------------
+    # Chart
+    # --------------------------------------------------
+    import plotly.express as px
+
+    fig = px.bar(
+        plot_df,
+        x=group_mode,
+        y="renew_share",
+        title=f"Top {N} {group_mode.capitalize()}s by Renewable Share – {year}",
+        labels={"renew_share": "Renewables Share (%)", group_mode: group_mode.capitalize()},
+        color="renew_share",
+        color_continuous_scale="Greens",
+        height=500,
+        template="plotly_white"
     )
+    fig.update_layout(xaxis_tickangle=-45)
+    st.plotly_chart(fig, use_container_width=True)
 
-# --------------------------------------------------
-# UI controls
-# --------------------------------------------------
-max_n = 25 if group_mode == "country" else len(data_df)
-N = st.slider("Show top N", 3, max_n, min(10, max_n))
-plot_df = data_df.head(N)
+    # --------------------------------------------------
+    # All data section
+    # --------------------------------------------------
+    st.subheader(f"Full Ranking of All {group_mode.capitalize()}s – {year}")
+    st.dataframe(data_df, hide_index=True)
 
-# --------------------------------------------------
-# Chart
-# --------------------------------------------------
-fig = px.bar(
-    plot_df,
-    x=group_mode,
-    y="renew_share",
-    title=f"Top {N} {group_mode.capitalize()}s by Renewable Share – {year}",
-    labels={"renew_share": "Renewables Share (%)", group_mode: group_mode.capitalize()},
-    color="renew_share",
-    color_continuous_scale="Greens",
-    height=500,
-    template="plotly_white"
-)
-fig.update_layout(xaxis_tickangle=-45)
-st.plotly_chart(fig, use_container_width=True)
+    export_buttons(f"renewables_ranking_{year}", data_df)
 
-# --------------------------------------------------
-# All data section
-# --------------------------------------------------
-st.subheader("Full Ranking of All Countries")
-st.dataframe(data_df.reset_index(drop=True))
+ranking_view()
 
 # --------------------------------------------------
 # Insights & source
@@ -96,7 +110,7 @@ with st.expander("📌 Key Insights"):
     st.markdown(
         f"""
         - The bars show which {group_mode}s have the **highest share** of renewables in their total energy mix.
-        - Adjust the slider to reveal more or fewer entries.
+        - Adjust the sliders to reveal more or fewer entries, or to look back at earlier years.
         - Hover a bar to see the exact percentage.
         """
     )
@@ -106,7 +120,9 @@ with st.expander("📊 Data Source"):
         f"""
         - **Dataset:** `owid-energy-data.xlsx` (Our World in Data)
         - **Metric used:** `renewables_share_energy`
-        - **Year displayed:** {year}
+        - **Years available:** {years[0]}–{years[-1]} (latest shown by default)
         - Grouped by **{group_mode}**.
         """
     )
+
+end_page(__file__)
@@ -0,0 +1,117 @@
+"""
+Batch-render one-page energy profiles for every country.
+
+The shared datasets are loaded once from the result cache, each country's
+inputs are sliced and hashed, and only countries whose inputs changed since
+the last run (per ``manifest.json`` in the output directory) are rendered,
+spread over a process pool.  HTML is always written; PNG and PDF need a
+working ``kaleido`` (probed with one small export) and are skipped with a
+note otherwise.
+
+Usage
+-----
+    python scripts/build_profiles.py                          # all countries, HTML
+    python scripts/build_profiles.py --formats html,png,pdf --workers 8
+    python scripts/build_profiles.py --countries India China --force
+"""
+
+import argparse
+import html
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from urllib.parse import quote
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from utils.profiles import (image_export_available, is_current, load_shared,  # noqa: E402
+                            manifest_key, profile_countries, profile_inputs, render_profile, slug)
+
+OUT_DIR = Path(os.environ.get("ENERGY_PROFILE_DIR", ROOT / ".cache" / "profiles"))
+MANIFEST = "manifest.json"
+
+
+def write_index(out_dir: Path, countries) -> None:
+    """List every country with an HTML profile in ``out_dir``, not just this run's."""
+    built = sorted(c for c in countries if (out_dir / f"{slug(c)}.html").exists())
+    links = "".join(
+        f"<li><a href=\"{html.escape(quote(slug(c) + '.html'))}\">{html.escape(c)}</a></li>" for c in built
+    )
+    (out_dir / "index.html").write_text(
+        f"<!DOCTYPE html><html><head><meta charset='utf-8'><title>Country energy profiles</title></head>"
+        f"<body><h1>Country energy profiles</h1><ul>{links}</ul></body></html>",
+        encoding="utf-8",
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--out", type=Path, default=OUT_DIR, help="output directory")
+    parser.add_argument("--countries", nargs="*", help="only these countries (default: all)")
+    parser.add_argument("--formats", default="html", help="comma-separated: html, png, pdf")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="render processes")
+    parser.add_argument("--force", action="store_true", help="re-render even if inputs are unchanged")
+    args = parser.parse_args(argv)
+
+    formats = tuple(f.strip() for f in args.formats.split(",") if f.strip())
+    if {"png", "pdf"} & set(formats) and not image_export_available():
+        print("Image export is unavailable (kaleido, and Chrome for kaleido 1.x, are needed) – writing HTML only.")
+        formats = tuple(f for f in formats if f == "html") or ("html",)
+
+    out_dir = args.out
+    out_dir.mkdir(parents=True, exist_ok=True)
+    manifest_path = out_dir / MANIFEST
+    manifest = json.loads(manifest_path.read_text()) if manifest_path.exists() else {}
+
+    shared = load_shared()
+    countries = profile_countries(shared)
+    if args.countries:
+        unknown = sorted(set(args.countries) - set(countries))
+        if unknown:
+            print(f"Unknown countries ignored: {', '.join(unknown)}")
+        countries = [c for c in countries if c in set(args.countries)]
+
+    # slice + hash in the parent; only changed countries travel to the pool
+    todo = {}
+    for country in countries:
+        inputs = profile_inputs(country, shared)
+        key = manifest_key(inputs, formats)
+        if args.force or not is_current(manifest, country, key, out_dir, formats):
+            todo[country] = (inputs, key)
+
+    print(f"{len(countries)} countries, {len(countries) - len(todo)} unchanged, rendering {len(todo)} …")
+
+    if "html" in formats and todo:
+        from plotly.offline import get_plotlyjs
+
+        (out_dir / "plotly.min.js").write_text(get_plotlyjs(), encoding="utf-8")
+
+    failed = []
+    with ProcessPoolExecutor(max_workers=max(args.workers or 1, 1)) as pool:
+        futures = {pool.submit(render_profile, inputs, out_dir, formats): (country, key)
+                   for country, (inputs, key) in todo.items()}
+        for done, future in enumerate(as_completed(futures), 1):
+            country, key = futures[future]
+            try:
+                future.result()
+                manifest[country] = key
+            except Exception as exc:  # keep going; report at the end
+                failed.append(f"{country}: {exc}")
+            if done % 25 == 0 or done == len(futures):
+                print(f"  {done}/{len(futures)}")
+                manifest_path.write_text(json.dumps(manifest, indent=1, sort_keys=True))
+
+    if "html" in formats:
+        write_index(out_dir, sorted(set(manifest) | set(countries)))
+    manifest_path.write_text(json.dumps(manifest, indent=1, sort_keys=True))
+    for msg in failed:
+        print(f"FAILED  {msg}", file=sys.stderr)
+    print(f"Profiles in {out_dir}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,130 @@
+"""
+Import-time profile for ``Homepage.py`` and every page script.
+
+For each script the header ``import`` statements are collected (without
+running any Streamlit code) and replayed in a fresh interpreter under
+``python -X importtime``.  The report lists the cold-import cost paid before
+the page can render, the heaviest top-level packages behind it, and the
+imports the script defers until a chart is actually built.
+
+Usage
+-----
+    python scripts/profile_imports.py                 # report only
+    python scripts/profile_imports.py --top 5         # show 5 heaviest packages
+    python scripts/profile_imports.py --budget Homepage.py=400 --repeat 3
+    python scripts/profile_imports.py Homepage.py     # only the given scripts
+
+With ``--budget`` the script doubles as an import-time benchmark: it exits
+with status 1 if the best-of-``--repeat`` time of a script exceeds its
+budget in milliseconds.
+"""
+
+import argparse
+import ast
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def page_scripts():
+    return [ROOT / "Homepage.py"] + sorted(
+        (ROOT / "pages").glob("*.py"), key=lambda p: int(p.name.split("_", 1)[0])
+    )
+
+
+def split_imports(path: Path):
+    """Return ``(startup, deferred)`` import statements of ``path`` as source lines.
+
+    *startup* are the imports in the script header, which run before the page
+    renders anything; *deferred* are imports placed later in the script (next
+    to the chart that needs them).
+    """
+    tree = ast.parse(path.read_text(encoding="utf-8"))
+    body = tree.body
+    if body and isinstance(body[0], ast.Expr) and isinstance(body[0].value, ast.Constant):
+        body = body[1:]  # module docstring
+
+    startup = []
+    for node in body:
+        if not isinstance(node, (ast.Import, ast.ImportFrom)):
+            break
+        startup.append(node)
+    deferred = [
+        node
+        for node in ast.walk(tree)
+        if isinstance(node, (ast.Import, ast.ImportFrom)) and node not in startup
+    ]
+    return [ast.unparse(n) for n in startup], sorted({ast.unparse(n) for n in deferred})
+
+
+def measure(statements):
+    """Run ``statements`` under ``-X importtime``; return {module: cumulative µs}."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "\n".join(statements) or "pass"],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1])
+
+    cumulative = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cum_us, name = line[len("import time:"):].split("|")
+        # only count top-level entries (no indentation) so totals don't double up
+        if name.startswith("  "):
+            continue
+        cumulative[name.strip()] = int(cum_us)
+    return cumulative
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("scripts", nargs="*", metavar="SCRIPT", help="profile only these scripts (default: all)")
+    parser.add_argument("--top", type=int, default=3, help="heaviest packages to list per script")
+    parser.add_argument("--repeat", type=int, default=1, help="runs per script; the fastest is reported")
+    parser.add_argument(
+        "--budget",
+        action="append",
+        default=[],
+        metavar="SCRIPT=MS",
+        help="fail if SCRIPT's import time exceeds MS milliseconds (repeatable)",
+    )
+    args = parser.parse_args(argv)
+
+    budgets = {}
+    for item in args.budget:
+        name, _, ms = item.partition("=")
+        budgets[name] = float(ms)
+
+    failed = []
+    print(f"{'script':<55} {'ms':>8}  heaviest imports")
+    for path in page_scripts():
+        name = str(path.relative_to(ROOT))
+        if args.scripts and name not in args.scripts and path.name not in args.scripts:
+            continue
+        statements, deferred = split_imports(path)
+        runs = [measure(statements) for _ in range(max(args.repeat, 1))]
+        best = min(runs, key=lambda r: sum(r.values()))
+        total_ms = sum(best.values()) / 1000
+        heavy = sorted(best.items(), key=lambda kv: kv[1], reverse=True)[: args.top]
+        heavy_txt = ", ".join(f"{mod} {us / 1000:.0f}ms" for mod, us in heavy)
+        print(f"{name:<55} {total_ms:>8.1f}  {heavy_txt}")
+        if deferred:
+            print(f"{'':<55} {'':>8}  deferred: {'; '.join(deferred)}")
+
+        limit = budgets.get(name, budgets.get(path.name))
+        if limit is not None and total_ms > limit:
+            failed.append(f"{name}: {total_ms:.1f} ms > budget {limit:.0f} ms")
+
+    for msg in failed:
+        print(f"BUDGET EXCEEDED  {msg}", file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,55 @@
+"""
+Incremental refresh after dropping a new OWID release into ``data/``.
+
+Diffs the new ``owid-energy-data.xlsx`` against the snapshot from the last
+refresh at ``(country, year, column)`` granularity, recomputes only the
+affected parts of the derived tables (fossil totals, period changes,
+rankings, coverage), publishes them to the result cache and appends the
+changed cells to ``.cache/owid/changelog.csv``.  The first run has nothing
+to diff against and builds everything.
+
+Usage
+-----
+    python scripts/refresh_owid.py              # refresh + summary
+    python scripts/refresh_owid.py --show 50    # also list 50 changed cells
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from utils.refresh import CHANGELOG, STORE_DIR, refresh  # noqa: E402
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--show", type=int, default=0, help="changed cells to print")
+    args = parser.parse_args(argv)
+
+    report = refresh()
+    if report.full:
+        print(f"No previous snapshot – built all derived tables for data version {report.version}.")
+        return 0
+
+    changes = report.changes
+    print(f"Data version {report.version}: {len(changes)} changed cell(s) "
+          f"in {changes['country'].nunique() if len(changes) else 0} entities.")
+    if len(changes):
+        print(report.summary().to_string(index=False))
+    print("\nRecomputed:")
+    for table, what in report.recomputed.items():
+        if isinstance(what, list):
+            what = f"{len(what)}: {', '.join(map(str, what[:8]))}{' …' if len(what) > 8 else ''}" if what else "nothing"
+        print(f"  {table:<40} {what}")
+    if args.show and len(changes):
+        print()
+        print(changes.head(args.show).to_string(index=False))
+    print(f"\nChangelog: {STORE_DIR / CHANGELOG}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,13 @@
+import pandas as pd
+
+from api import filter_countries
+
+
+def test_filter_countries_is_case_insensitive():
+    df = pd.DataFrame({"country": ["India", "China", "Chad"], "value": [1, 2, 3]})
+    assert filter_countries(df, [" india", "CHINA"])["country"].tolist() == ["India", "China"]
+
+
+def test_world_only_tables_are_not_filtered():
+    df = pd.DataFrame({"country": ["World", "World"], "year": [2020, 2021]})
+    assert len(filter_countries(df, ["India"], {"world_only": True})) == 2
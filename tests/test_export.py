@@ -0,0 +1,14 @@
+import pandas as pd
+import pytest
+
+from utils import export
+
+
+def test_export_round_trip_and_download_limit(tmp_path, monkeypatch):
+    monkeypatch.setattr(export, "EXPORT_DIR", tmp_path)
+    df = pd.DataFrame({"country": ["A", "B"], 2020: [1.0, 2.0]})
+    path = export.export_file(df, "table", "csv")
+    assert export.export_file(df, "table", "csv") == path  # reused, not rewritten
+    assert export.download_bytes(path) == b"country,2020\nA,1.0\nB,2.0\n"
+    with pytest.raises(export.ExportTooLarge):
+        export.download_bytes(path, limit=10)
@@ -0,0 +1,25 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+SCRIPT = ROOT / "scripts" / "profile_imports.py"
+# generous enough for a loaded CI runner; the homepage imports only streamlit (~0.4 s)
+BUDGET_MS = float(os.environ.get("ENERGY_IMPORT_BUDGET_MS", "1500"))
+
+
+def _profile(*args):
+    return subprocess.run([sys.executable, str(SCRIPT), *args], cwd=ROOT, capture_output=True, text=True)
+
+
+def test_homepage_import_within_budget():
+    proc = _profile("Homepage.py", "--repeat", "3", "--top", "20", "--budget", f"Homepage.py={BUDGET_MS:g}")
+    assert proc.returncode == 0, proc.stdout + proc.stderr
+
+
+def test_homepage_defers_data_and_chart_libraries():
+    proc = _profile("Homepage.py", "--top", "50")
+    startup = proc.stdout.splitlines()[1]
+    for heavy in ("pandas", "plotly", "numpy", "openpyxl"):
+        assert f" {heavy} " not in startup, startup
@@ -0,0 +1,28 @@
+import numpy as np
+
+from utils.maps import MapFrames, animated_choropleth
+
+
+def _frames(years):
+    n = 2 if years else 0
+    return MapFrames(
+        metric="renewables_share_energy", iso=["FRA", "TCD"][:n], countries=["France", "Chad"][:n],
+        years=years, codes=np.array([[0, 3], [1, -1]], dtype=np.int16)[:len(years), :n],
+        lo=0.0, step=10.0, zmin=0.0, zmax=30.0,
+    )
+
+
+def test_frames_dequantise_with_gaps():
+    assert _frames([2000, 2001]).z(1) == [10.0, None]
+
+
+def test_play_resumes_from_the_current_frame():
+    fig = animated_choropleth(_frames([2000, 2001]), "t", "%", "Greens")
+    assert len(fig.frames) == 2
+    play = fig.layout.updatemenus[0].buttons[0]
+    assert play.args[1]["fromcurrent"] is True
+
+
+def test_no_data_gives_an_empty_figure():
+    fig = animated_choropleth(_frames([]), "t", "%", "Greens")
+    assert not fig.data and not fig.frames
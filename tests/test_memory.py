@@ -0,0 +1,15 @@
+from utils.memory import trim_plan
+
+
+def test_trims_largest_state_first():
+    sizes = {"small": 10, "big": 100, "mid": 50}
+    assert trim_plan(sizes, budget=100) == ["big"]
+
+
+def test_page_objects_alone_over_budget_trim_nothing():
+    assert trim_plan({"a": 10, "b": 20}, budget=100, fixed=150) == []
+
+
+def test_protected_keys_are_kept():
+    sizes = {"widget": 100, "store": 60, "note": 5}
+    assert trim_plan(sizes, budget=130, fixed=20, protected={"widget"}) == ["store"]
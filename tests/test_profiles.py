@@ -0,0 +1,63 @@
+import pickle
+
+import numpy as np
+import plotly.graph_objects as go
+
+from utils.profiles import image_export_available, input_hash, is_current, manifest_key
+
+
+def inputs(value=1.0):
+    return {
+        "country": "Peru",
+        "gdp": {"year": np.arange(2000, 2005), "value": np.array([1.0, 2.0, 3.0, 4.0, value])},
+        "intensity_rank": (3, 120),
+        "petroleum": None,
+    }
+
+
+def test_input_hash_is_stable():
+    a = inputs()
+    assert input_hash(a) == input_hash(inputs())
+    assert input_hash(a) == input_hash(pickle.loads(pickle.dumps(a)))
+    # a strided view with the same values hashes like a fresh array
+    strided = inputs()
+    strided["gdp"]["value"] = np.array([1.0, 0, 2.0, 0, 3.0, 0, 4.0, 0, 1.0])[::2]
+    assert input_hash(strided) == input_hash(a)
+    assert input_hash(dict(reversed(list(a.items())))) == input_hash(a)
+
+
+def test_input_hash_changes_with_inputs():
+    base = input_hash(inputs())
+    assert input_hash(inputs(value=1.5)) != base
+    other_dtype = inputs()
+    other_dtype["gdp"]["year"] = other_dtype["gdp"]["year"].astype(np.int32)
+    assert input_hash(other_dtype) != base
+    ranked = inputs()
+    ranked["intensity_rank"] = (4, 120)
+    assert input_hash(ranked) != base
+
+
+def test_unchanged_profile_is_skipped(tmp_path):
+    formats = ("html",)
+    key = manifest_key(inputs(), formats)
+    (tmp_path / "Peru.html").write_text("<html></html>")
+    manifest = {"Peru": key}
+    assert is_current(manifest, "Peru", manifest_key(inputs(), formats), tmp_path, formats)
+    # changed inputs, other formats, a missing output or no manifest entry all re-render
+    assert not is_current(manifest, "Peru", manifest_key(inputs(value=2.0), formats), tmp_path, formats)
+    assert not is_current(manifest, "Peru", manifest_key(inputs(), ("html", "png")), tmp_path, ("html", "png"))
+    assert not is_current({}, "Peru", key, tmp_path, formats)
+    (tmp_path / "Peru.html").unlink()
+    assert not is_current(manifest, "Peru", key, tmp_path, formats)
+
+
+def test_image_export_falls_back_when_write_fails(monkeypatch):
+    def broken(self, *args, **kwargs):
+        raise RuntimeError("no Chrome")
+
+    monkeypatch.setattr(go.Figure, "write_image", broken)
+    image_export_available.cache_clear()
+    try:
+        assert image_export_available() is False
+    finally:
+        image_export_available.cache_clear()
@@ -0,0 +1,9 @@
+from utils import profiling
+
+
+def test_cold_runs_need_the_configured_token(monkeypatch):
+    monkeypatch.setattr(profiling, "COLD_TOKEN", "")
+    assert not profiling.cold_allowed("")
+    monkeypatch.setattr(profiling, "COLD_TOKEN", "s3cret")
+    assert not profiling.cold_allowed("guess")
+    assert profiling.cold_allowed("s3cret")
@@ -0,0 +1,12 @@
+import numpy as np
+
+from utils.query import OwidColumns
+
+
+def test_entity_rows_use_the_precomputed_positions():
+    store = OwidColumns(
+        entities=["Chad", "France"], iso=["TCD", "FRA"], offsets=np.array([0, 2, 5]),
+        year=np.array([2000, 2001, 2000, 2001, 2002]), columns={}, units={},
+    )
+    assert store.position == {"Chad": 0, "France": 1}
+    assert store.entity_rows("France") == slice(2, 5)
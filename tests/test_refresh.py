@@ -0,0 +1,85 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.data import country_matrix
+from utils.metrics import coverage_table, fossil_totals, period_changes
+from utils.rankings import build_ranking
+from utils.refresh import (PERIOD_YEARS, diff_releases, refresh, update_coverage, update_periods,
+                           update_ranking, update_totals)
+
+METRIC = "energy_per_gdp"
+
+
+def release(years=range(2000, 2013)):
+    rng = np.random.default_rng(0)
+    rows = [(c, iso, y) for c, iso in [("Chad", "TCD"), ("France", "FRA"), ("Peru", "PER"), ("World", "OWID_WRL")]
+            for y in years]
+    df = pd.DataFrame(rows, columns=["country", "iso_code", "year"])
+    for col in ("coal_consumption", "oil_consumption", "gas_consumption", METRIC):
+        df[col] = rng.uniform(1, 100, len(df)).round(2)
+    df.loc[df.index % 7 == 3, "gas_consumption"] = np.nan
+    return df
+
+
+def full(frame):
+    totals = fossil_totals(frame)
+    max_year = int(frame["year"].max())
+    start_year = max_year - PERIOD_YEARS
+    ranking = build_ranking(METRIC, *country_matrix(frame, METRIC), ascending=True)
+    return totals, (period_changes(totals, start_year, max_year), start_year, max_year), ranking, coverage_table(frame)
+
+
+def incremental(old, new):
+    totals, periods, ranking, coverage = full(old)
+    changes = diff_releases(old, new)
+    totals = update_totals(totals, new, changes)
+    table, start_year, max_year, _ = update_periods(periods, totals, changes)
+    ranking, _ = update_ranking(ranking, *country_matrix(new, METRIC))
+    return totals, (table, start_year, max_year), ranking, update_coverage(coverage, changes)
+
+
+def added_year(old):
+    return pd.concat([old, release(range(2013, 2014))], ignore_index=True)
+
+
+def removed_row(old):
+    return old[~((old["country"] == "Peru") & (old["year"] == 2005))].reset_index(drop=True)
+
+
+def revised_cells(old):
+    new = old.copy()
+    new.loc[(new["country"] == "Chad") & (new["year"] == 2012), "coal_consumption"] += 5  # period end
+    new.loc[(new["country"] == "France") & (new["year"] == 2002), "oil_consumption"] = np.nan  # period start
+    new.loc[(new["country"] == "Peru") & (new["year"] == 2004), METRIC] *= 3
+    new.loc[(new["country"] == "Chad") & (new["year"] == 2006), "gas_consumption"] = 7.0
+    return new
+
+
+@pytest.mark.parametrize("change", [added_year, removed_row, revised_cells])
+def test_incremental_refresh_equals_full_recompute(change):
+    old = release()
+    new = change(old)
+    expected = full(new)
+    totals, periods, ranking, coverage = incremental(old, new)
+
+    by_key = lambda df: df.sort_values(["country", "year"]).reset_index(drop=True)
+    pd.testing.assert_frame_equal(by_key(totals), by_key(expected[0]), check_dtype=False)
+
+    by_country = lambda df: df.sort_values("country").reset_index(drop=True)
+    assert periods[1:] == expected[1][1:]
+    pd.testing.assert_frame_equal(by_country(periods[0]), by_country(expected[1][0]))
+
+    want = expected[2]
+    assert ranking.entities == want.entities
+    np.testing.assert_array_equal(ranking.years, want.years)
+    np.testing.assert_array_equal(ranking.order, want.order)
+    np.testing.assert_array_equal(ranking.counts, want.counts)
+
+    pd.testing.assert_frame_equal(coverage.sort_index().sort_index(axis=1),
+                                  expected[3].sort_index().sort_index(axis=1), check_dtype=False)
+
+
+def test_refresh_rejects_paths_outside_data_dir(tmp_path):
+    with pytest.raises(ValueError, match="data/"):
+        refresh(tmp_path / "owid-energy-data.xlsx", store_dir=tmp_path)
@@ -0,0 +1,41 @@
+import pandas as pd
+import pytest
+
+from utils.schema import Column, Schema, SchemaError, require, validate
+
+SCHEMA = Schema(
+    source="test.xlsx",
+    columns=(
+        Column("country", "str", key=True),
+        Column("year", "int", key=True),
+        Column("code", "str", required=False),
+        Column("share", min=0, max=100, required=False),
+    ),
+)
+
+
+def test_str_columns_become_stripped_text():
+    df = pd.DataFrame({"country": [" France ", "Chad"], "year": [2020, 2021], "code": [" FRA", None]})
+    out = validate(df, SCHEMA)
+    assert out["country"].tolist() == ["France", "Chad"]
+    assert out["code"].iloc[0] == "FRA"
+    assert pd.isna(out["code"].iloc[1])
+
+
+def test_numeric_key_column_is_rejected():
+    df = pd.DataFrame({"country": [1990, 1991], "year": [2020, 2021]})
+    with pytest.raises(SchemaError, match="country"):
+        validate(df, SCHEMA)
+
+
+def test_out_of_range_values_become_nan():
+    df = pd.DataFrame({"country": ["A", "B"], "year": ["2020", "2021"], "share": [50, 150]})
+    out = validate(df, SCHEMA)
+    assert out["year"].dtype == "int64"
+    assert out["share"].tolist()[0] == 50 and pd.isna(out["share"].iloc[1])
+
+
+def test_require_names_missing_columns():
+    df = pd.DataFrame({"country": ["A"], "year": [2020]})
+    with pytest.raises(SchemaError, match="share"):
+        require(df, ["share"], SCHEMA)
@@ -0,0 +1,65 @@
+import numpy as np
+
+from utils.similarity import pairwise_correlation, pairwise_distance
+
+
+def test_identical_shared_years_score_one():
+    years = np.arange(30, dtype=float)
+    target = np.sin(years / 4) + years / 10
+    follower = np.full(30, np.nan)
+    follower[10:] = target[10:]  # same path, but only over the last 20 years
+    noise = np.random.default_rng(0).normal(size=30)
+
+    r, overlap = pairwise_correlation(np.vstack([target, follower, noise]))
+
+    assert overlap[0, 1] == 20
+    assert np.isclose(r[0, 1], 1.0)
+    assert abs(r[0, 2]) < 0.5
+
+
+def test_matches_pearson_on_shared_years():
+    rng = np.random.default_rng(1)
+    values = rng.normal(size=(4, 25)) * [[1], [1e3], [5], [0.1]] + [[0], [1e5], [3], [-2]]
+    values[rng.random(values.shape) < 0.3] = np.nan
+
+    r, overlap = pairwise_correlation(values)
+
+    for i in range(4):
+        for j in range(4):
+            shared = ~np.isnan(values[i]) & ~np.isnan(values[j])
+            assert overlap[i, j] == shared.sum()
+            assert np.isclose(r[i, j], np.corrcoef(values[i, shared], values[j, shared])[0, 1])
+
+
+def test_constant_or_short_overlap_is_nan():
+    values = np.array([[1.0, 2.0, 3.0], [5.0, 5.0, 5.0], [np.nan, np.nan, 1.0]])
+    r, _ = pairwise_correlation(values)
+    assert np.isnan(r[0, 1]) and np.isnan(r[0, 2])
+
+
+def test_distance_matches_rms_of_z_scores_on_shared_years():
+    rng = np.random.default_rng(2)
+    values = rng.normal(size=(4, 25)) * [[1], [1e3], [5], [0.1]] + [[0], [1e5], [3], [-2]]
+    values[rng.random(values.shape) < 0.3] = np.nan
+    z = (values - np.nanmean(values, axis=1, keepdims=True)) / np.nanstd(values, axis=1, keepdims=True)
+
+    d, overlap = pairwise_distance(values)
+
+    for i in range(4):
+        for j in range(4):
+            shared = ~np.isnan(values[i]) & ~np.isnan(values[j])
+            assert overlap[i, j] == shared.sum()
+            assert np.isclose(d[i, j], np.sqrt(np.mean((z[i, shared] - z[j, shared]) ** 2)), atol=1e-6)
+
+
+def test_distance_is_not_a_function_of_correlation():
+    rising = np.arange(20, dtype=float)
+    early = np.full(20, np.nan)
+    early[:10] = rising[:10]    # the same straight line, but only the first half
+    full = rising.copy()
+
+    r, _ = pairwise_correlation(np.vstack([rising, early, full]))
+    d, _ = pairwise_distance(np.vstack([rising, early, full]))
+
+    assert np.isclose(r[0, 1], 1.0) and np.isclose(r[0, 2], 1.0)
+    assert np.isclose(d[0, 2], 0.0, atol=1e-6) and d[0, 1] > 0.5  # early sits low in rising's range
@@ -0,0 +1 @@
+"""Shared data loading and caching helpers for the dashboard pages."""
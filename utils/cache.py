@@ -0,0 +1,161 @@
+"""
+Persistent on-disk result cache.
+
+``@st.cache_data`` keeps results in process memory only, so every deploy,
+crash or autoscale event starts cold.  :func:`disk_cache` adds a second tier
+underneath it: results are pickled to ``.cache/results`` keyed by function,
+arguments, :func:`data_version` and :func:`code_version`, so a restarted
+replica reads the blob back instead of re-parsing the source workbooks,
+while a deploy that changes any ``utils`` module starts from fresh results.
+
+Typical use is to decorate the expensive loader and keep ``st.cache_data``
+on the page-level function that calls it::
+
+    @disk_cache
+    def read_owid(path): ...
+
+Arguments are bound to the signature (defaults applied) before hashing, so
+``read_owid()`` and ``read_owid(OWID_PATH)`` share one entry.  A result that
+was computed some other way (e.g. updated incrementally by
+:mod:`utils.refresh`) can be stored with ``read_owid.prime(result, ...)``.
+
+Configuration (environment variables)
+-------------------------------------
+``ENERGY_CACHE_DIR``     cache directory (default ``<repo>/.cache/results``)
+``ENERGY_CACHE_MAX_MB``  size budget; least recently used blobs are evicted (default 512)
+``ENERGY_CACHE_DISABLE`` set to ``1`` to bypass the disk tier entirely
+
+:func:`recompute` makes the current thread skip cached blobs (results are
+still stored), which the page profiler uses for cold-path runs.
+"""
+
+import functools
+import hashlib
+import inspect
+import os
+import pickle
+import tempfile
+import threading
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+DATA_DIR = ROOT / "data"
+CACHE_DIR = Path(os.environ.get("ENERGY_CACHE_DIR", ROOT / ".cache" / "results"))
+MAX_BYTES = int(float(os.environ.get("ENERGY_CACHE_MAX_MB", "512")) * 1024 * 1024)
+
+# code changes in utils/ invalidate results on their own (see code_version); bump this
+# for changes outside it that make stored blobs unreadable, e.g. a pandas upgrade
+CACHE_FORMAT = 4
+
+_local = threading.local()
+
+
+def data_version(data_dir: Path = DATA_DIR) -> str:
+    """Fingerprint of the files in ``data/`` (name, size, mtime).
+
+    Any replaced or edited source file yields a new version, which in turn
+    invalidates every cached result derived from it.
+    """
+    h = hashlib.sha1()
+    for p in sorted(Path(data_dir).glob("*")):
+        if p.is_file():
+            info = p.stat()
+            h.update(f"{p.name}:{info.st_size}:{info.st_mtime_ns};".encode())
+    return h.hexdigest()[:16]
+
+
+@functools.lru_cache(maxsize=1)
+def code_version(package_dir: Path = ROOT / "utils") -> str:
+    """Fingerprint of the ``utils`` sources the cached functions are built from (once per process)."""
+    h = hashlib.sha1()
+    for p in sorted(Path(package_dir).glob("*.py")):
+        h.update(p.name.encode())
+        h.update(p.read_bytes())
+    return h.hexdigest()[:16]
+
+
+def _key(func, args, kwargs) -> str:
+    bound = inspect.signature(func).bind(*args, **kwargs)
+    bound.apply_defaults()
+    h = hashlib.sha1()
+    h.update(f"{CACHE_FORMAT}:{code_version()}:{func.__module__}.{func.__qualname__}:{data_version()}".encode())
+    h.update(pickle.dumps(sorted(bound.arguments.items()), protocol=4))
+    return h.hexdigest()
+
+
+def evict(cache_dir: Path, max_bytes: int, patterns=("*.pkl",)) -> None:
+    """Delete least recently used files matching ``patterns`` until ``cache_dir`` fits ``max_bytes``."""
+    blobs = []
+    for pattern in patterns:
+        for p in cache_dir.glob(pattern):
+            try:
+                info = p.stat()
+            except FileNotFoundError:  # removed by another process
+                continue
+            blobs.append((info.st_mtime, info.st_size, p))
+
+    total = sum(size for _, size, _ in blobs)
+    for _, size, p in sorted(blobs):
+        if total <= max_bytes:
+            break
+        p.unlink(missing_ok=True)
+        total -= size
+
+
+def _store(path: Path, result) -> None:
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=CACHE_DIR, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as fh:
+            pickle.dump(result, fh, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)  # atomic, so concurrent readers never see partial blobs
+    except OSError:
+        Path(tmp).unlink(missing_ok=True)
+        return
+    evict(CACHE_DIR, MAX_BYTES)
+
+
+def recompute(enabled: bool = True) -> None:
+    """Make :func:`disk_cache` functions called from this thread ignore stored blobs (and overwrite them)."""
+    _local.recompute = enabled
+
+
+def disk_cache(func):
+    """Memoise ``func`` on disk, keyed by arguments and data version."""
+
+    def blob_path(args, kwargs) -> Path:
+        return CACHE_DIR / f"{func.__name__}-{_key(func, args, kwargs)}.pkl"
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if os.environ.get("ENERGY_CACHE_DISABLE") == "1":
+            return func(*args, **kwargs)
+
+        path = blob_path(args, kwargs)
+        if getattr(_local, "recompute", False):
+            result = func(*args, **kwargs)
+            _store(path, result)
+            return result
+        try:
+            with open(path, "rb") as fh:
+                result = pickle.load(fh)
+            os.utime(path)  # mark as recently used for eviction
+            return result
+        except FileNotFoundError:
+            pass
+        except Exception:
+            # truncated or incompatible blob → recompute and overwrite
+            path.unlink(missing_ok=True)
+
+        result = func(*args, **kwargs)
+        _store(path, result)
+        return result
+
+    def prime(result, *args, **kwargs):
+        """Store ``result`` as the cached value of ``func(*args, **kwargs)`` for the current data version."""
+        if os.environ.get("ENERGY_CACHE_DISABLE") != "1":
+            _store(blob_path(args, kwargs), result)
+
+    wrapper.prime = prime
+    return wrapper
+
@@ -0,0 +1,120 @@
+"""
+Shared loaders for the source files in ``data/``.
+
+Each loader parses its file once and is wrapped in :func:`utils.cache.disk_cache`,
+so the result survives server restarts.  Pages keep their own
+``@st.cache_data`` functions on top and derive their views from these
+frames instead of calling ``pd.read_excel`` directly.
+
+Every loader validates its frame against the matching schema in
+:mod:`utils.schema` before it is cached, so column checks and numeric
+coercion happen once per data release and pages can rely on typed columns.
+"""
+
+from pathlib import Path
+
+import pandas as pd
+
+from utils.cache import DATA_DIR, disk_cache
+from utils.schema import BP_SCENARIOS, COUNTRIES, EMBER, OWID, PETROLEUM, require, validate
+
+OWID_PATH = DATA_DIR / "owid-energy-data.xlsx"
+PETROLEUM_PATH = DATA_DIR / "INT-Export-04-03-2025_21-40-52.xlsx"
+COUNTRIES_PATH = DATA_DIR / "Countries.csv"
+BP_SCENARIOS_PATH = DATA_DIR / "bpEO24-change-in-oil-demand-by-region.xlsx"
+EMBER_PATTERN = "emberChartData*.xlsx"
+
+
+@disk_cache
+def read_owid(path=OWID_PATH) -> pd.DataFrame:
+    """OWID energy dataset with stripped, lower-case column names."""
+    return validate(pd.read_excel(path), OWID)
+
+
+@disk_cache
+def read_petroleum(path=PETROLEUM_PATH) -> pd.DataFrame:
+    """INT-Export petroleum & liquids production in long format.
+
+    Columns: ``country``, ``series_name``, ``year``, ``production_mbpd``.
+    """
+    # Load Excel file and skip metadata row
+    df = pd.read_excel(path, skiprows=1, dtype=str)
+    df.columns = [str(c).strip() for c in df.columns]  # Force headers to string
+
+    # Rename the first two columns
+    df.rename(columns={df.columns[0]: "series_code", df.columns[1]: "series_name"}, inplace=True)
+
+    # Detect and assign country
+    df["country"] = None
+    current_country = None
+    for i, row in df.iterrows():
+        code, name = row["series_code"], row["series_name"]
+        if pd.isna(code) or str(name).strip().lower() == "production":
+            prev_name = df.at[i - 1, "series_name"] if i > 0 else None
+            if prev_name:
+                current_country = str(prev_name).strip()
+        df.at[i, "country"] = current_country or "World"
+
+    # Filter out non-data rows
+    df = df[~df["series_name"].str.strip().isin(["Production"] + df["country"].unique().tolist())]
+
+    # Detect year columns (string safe)
+    year_cols = [str(c) for c in df.columns if str(c).isdigit() and len(str(c)) == 4]
+
+    # Melt to long format
+    df_long = df.melt(
+        id_vars=["country", "series_name"],
+        value_vars=year_cols,
+        var_name="year",
+        value_name="production_mbpd"
+    )
+
+    return validate(df_long, PETROLEUM)
+
+
+@disk_cache
+def read_countries(path=COUNTRIES_PATH) -> pd.DataFrame:
+    """World Bank country indicators with stripped, lower-case column names."""
+    return validate(pd.read_csv(path), COUNTRIES)
+
+
+@disk_cache
+def read_bp_scenarios(path=BP_SCENARIOS_PATH) -> pd.DataFrame:
+    """BP Energy Outlook 2024 change in oil demand by region and scenario."""
+    return validate(pd.read_excel(path), BP_SCENARIOS)
+
+
+@disk_cache
+def read_ember(data_dir=DATA_DIR) -> pd.DataFrame:
+    """All Ember chart exports as one table: ``country_or_region, year, variable, generation_twh``.
+
+    Re-downloaded copies of the same export are dropped as duplicates.
+    """
+    frames = [pd.read_excel(p) for p in sorted(Path(data_dir).glob(EMBER_PATTERN))]
+    if not frames:
+        return pd.DataFrame(columns=[c.name for c in EMBER.columns])
+    df = validate(pd.concat(frames, ignore_index=True), EMBER)
+    return df.drop_duplicates().reset_index(drop=True)
+
+
+def country_matrix(df: pd.DataFrame, column: str):
+    """Country × year matrix of one column of an OWID frame; see :func:`owid_matrix`."""
+    iso = df["iso_code"].astype("string")
+    df = df[iso.notna() & ~iso.str.startswith("OWID_", na=False)]
+    wide = df.pivot_table(index="country", columns="year", values=column, aggfunc="first", dropna=False)
+    wide = wide.reindex(columns=range(int(df["year"].min()), int(df["year"].max()) + 1))
+    return wide.index.tolist(), wide.columns.to_numpy(dtype=int), wide.to_numpy(dtype=float)
+
+
+@disk_cache
+def owid_matrix(column: str, path=OWID_PATH):
+    """Country × year matrix of one OWID column.
+
+    Only rows with a real ISO code are kept, so aggregates such as "World" or
+    "Europe" (no code, or an ``OWID_`` code) don't pollute country rankings.
+    Returns ``(countries, years, values)``: a list of names, an int array of
+    years and a float array of shape ``(len(countries), len(years))`` with
+    NaN where OWID has no value.  Raises :class:`~utils.schema.SchemaError`
+    when this release has no ``column``.
+    """
+    return country_matrix(require(read_owid(path), [column], OWID), column)
@@ -0,0 +1,89 @@
+"""
+Consistent-decline detector for coal, oil and gas consumption.
+
+Works on the whole OWID country × year matrix at once: NumPy sliding
+windows give the least-squares slope of every country over every window,
+and a cumulative-sum trick gives the running streak of year-on-year
+declines.  Results are disk cached per window length, so a page can rank
+decliners for any end year by slicing a column.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from utils.cache import disk_cache
+from utils.data import OWID_PATH, owid_matrix
+
+FUELS = {
+    "coal": "coal_consumption",
+    "oil": "oil_consumption",
+    "gas": "gas_consumption",
+}
+
+
+@dataclass
+class DeclineStats:
+    countries: list
+    years: np.ndarray          # (T,) calendar years of the matrix
+    end_years: np.ndarray      # (E,) last year of each window, E = T - window + 1
+    slope: np.ndarray          # (n, E) least-squares slope, TWh per year
+    rel_slope: np.ndarray      # (n, E) slope as % of the window mean, per year
+    decline_share: np.ndarray  # (n, E) share of year-on-year steps in the window that fell
+    streak: np.ndarray         # (n, T) consecutive declining years ending at each year
+
+
+def rolling_slope(values: np.ndarray, window: int):
+    """Least-squares slope and mean of every full ``window``-year window.
+
+    Windows containing a NaN yield NaN.  Returns ``(slope, mean)``, each of
+    shape ``(n, T - window + 1)``.
+    """
+    windows = sliding_window_view(values, window, axis=1)  # (n, E, w) view, no copy
+    x = np.arange(window) - (window - 1) / 2
+    slope = windows @ x / (x @ x)
+    return slope, windows.mean(axis=2)
+
+
+def decline_streaks(values: np.ndarray) -> np.ndarray:
+    """Length of the run of year-on-year declines ending at each year.
+
+    A missing value on either side of a step breaks the run.
+    """
+    fell = np.zeros(values.shape, dtype=bool)
+    fell[:, 1:] = values[:, 1:] < values[:, :-1]  # NaN compares False
+    runs = np.cumsum(fell, axis=1)
+    # running total at the last non-declining step; subtracting it resets the count
+    reset = np.maximum.accumulate(np.where(fell, 0, runs), axis=1)
+    return runs - reset
+
+
+@disk_cache
+def decline_stats(window: int = 10, path=OWID_PATH) -> dict:
+    """``{fuel: DeclineStats}`` for coal, oil and gas with the given window length."""
+    if window < 3:
+        raise ValueError("window must cover at least 3 years")
+
+    stats = {}
+    for fuel, column in FUELS.items():
+        countries, years, values = owid_matrix(column, path)
+        slope, mean = rolling_slope(values, window)
+
+        fell = (values[:, 1:] < values[:, :-1]).astype(float)
+        fell[np.isnan(values[:, 1:]) | np.isnan(values[:, :-1])] = np.nan
+        decline_share = sliding_window_view(fell, window - 1, axis=1).mean(axis=2)
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            rel_slope = np.where(mean > 0, slope / mean * 100, np.nan)
+
+        stats[fuel] = DeclineStats(
+            countries=countries,
+            years=years,
+            end_years=years[window - 1:],
+            slope=slope,
+            rel_slope=rel_slope,
+            decline_share=decline_share,
+            streak=decline_streaks(values),
+        )
+    return stats
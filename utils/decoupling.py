@@ -0,0 +1,106 @@
+"""
+GDP / fossil-fuel decoupling over every rolling window.
+
+The ``gdp`` and ``fossil_fuel_consumption`` country × year matrices share
+one country list and year axis, so the growth of both over every window of
+``window`` years (for every country and start year) is a single shifted
+division of each matrix.  From the two growth rates follow the fossil–GDP
+elasticity and a decoupling class per cell.  Results are disk cached per
+window length, so switching metric or countries on a page only slices
+arrays already in memory.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from utils.cache import disk_cache
+from utils.data import OWID_PATH, owid_matrix
+
+# decoupling class codes; 0 = no data for the window
+STATUS = {
+    1: "Absolute decoupling (GDP ↑, fossil ↓)",
+    2: "Relative decoupling (fossil grows slower)",
+    3: "Coupled (fossil grows as fast or faster)",
+    4: "GDP fell",
+}
+
+
+@dataclass
+class Decoupling:
+    window: int
+    countries: list
+    start_years: np.ndarray  # (S,) first year of each window, S = T - window
+    gdp_growth: np.ndarray   # (n, S) % change of GDP from start to start + window
+    fossil_growth: np.ndarray  # (n, S) % change of fossil fuel consumption
+    elasticity: np.ndarray   # (n, S) Δln(fossil) / Δln(GDP)
+    status: np.ndarray       # (n, S) int8 code from STATUS, 0 = missing
+
+    @property
+    def end_years(self) -> np.ndarray:
+        return self.start_years + self.window
+
+    def decoupled_share(self) -> np.ndarray:
+        """(n,) share of a country's windows with data that show absolute decoupling."""
+        has = self.status > 0
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return (self.status == 1).sum(axis=1) / has.sum(axis=1)
+
+    def frame(self, start_year: int) -> pd.DataFrame:
+        """One row per country with data for the window starting in ``start_year``."""
+        col = int(np.searchsorted(self.start_years, start_year))
+        keep = self.status[:, col] > 0
+        return pd.DataFrame({
+            "country": np.asarray(self.countries)[keep],
+            "start_year": start_year,
+            "end_year": start_year + self.window,
+            "gdp_change_pct": self.gdp_growth[keep, col],
+            "fossil_change_pct": self.fossil_growth[keep, col],
+            "elasticity": self.elasticity[keep, col],
+            "status": [STATUS[s] for s in self.status[keep, col]],
+        })
+
+
+def window_growth(values: np.ndarray, window: int) -> np.ndarray:
+    """% change of every row between each year and ``window`` years later; NaN unless both are > 0."""
+    start, end = values[:, :-window], values[:, window:]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where((start > 0) & (end > 0), (end / start - 1) * 100, np.nan)
+
+
+def classify(gdp_growth: np.ndarray, fossil_growth: np.ndarray) -> np.ndarray:
+    status = np.select(
+        [gdp_growth <= 0, fossil_growth < 0, fossil_growth < gdp_growth],
+        [4, 1, 2],
+        default=3,
+    ).astype(np.int8)
+    status[np.isnan(gdp_growth) | np.isnan(fossil_growth)] = 0
+    return status
+
+
+@disk_cache
+def rolling_decoupling(window: int = 10, path=OWID_PATH) -> Decoupling:
+    """Decoupling metrics of every country over every ``window``-year period."""
+    if window < 1:
+        raise ValueError("window must be at least 1 year")
+    countries, years, gdp = owid_matrix("gdp", path)
+    fossil_countries, fossil_years, fossil = owid_matrix("fossil_fuel_consumption", path)
+    if countries != fossil_countries or not np.array_equal(years, fossil_years):
+        raise ValueError("gdp and fossil_fuel_consumption matrices are not aligned")
+
+    g = window_growth(gdp, window)
+    f = window_growth(fossil, window)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        elasticity = np.log1p(f / 100) / np.log1p(g / 100)
+    elasticity[~np.isfinite(elasticity)] = np.nan
+
+    return Decoupling(
+        window=window,
+        countries=countries,
+        start_years=years[:-window],
+        gdp_growth=g,
+        fossil_growth=f,
+        elasticity=elasticity,
+        status=classify(g, f),
+    )
@@ -0,0 +1,116 @@
+"""
+Chunked CSV / Parquet export of page datasets.
+
+Files are written to ``.cache/exports`` in chunks of ``CHUNK_ROWS`` rows, so
+a large table is never formatted into one in-memory string, and are reused
+for as long as the data version, code version and filter state stay the
+same.  Nothing is generated until a user actually asks for a download (see
+:func:`utils.ui.export_buttons`).
+
+Streamlit serves a download from memory: the file's bytes are held by the
+server (per click) until the session lets go of them.  :func:`download_bytes`
+therefore refuses files over ``ENERGY_DOWNLOAD_MAX_MB``; larger exports
+stay available on disk under the export directory.
+
+Configuration: ``ENERGY_EXPORT_DIR`` (default ``<repo>/.cache/exports``),
+``ENERGY_EXPORT_MAX_MB`` (default 1024) and ``ENERGY_DOWNLOAD_MAX_MB``
+(default 200).
+"""
+
+import hashlib
+import os
+import tempfile
+from pathlib import Path
+
+import pandas as pd
+
+from utils.cache import ROOT, code_version, data_version, evict
+
+EXPORT_DIR = Path(os.environ.get("ENERGY_EXPORT_DIR", ROOT / ".cache" / "exports"))
+MAX_BYTES = int(float(os.environ.get("ENERGY_EXPORT_MAX_MB", "1024")) * 1024 * 1024)
+DOWNLOAD_MAX_BYTES = int(float(os.environ.get("ENERGY_DOWNLOAD_MAX_MB", "200")) * 1024 * 1024)
+CHUNK_ROWS = 50_000
+
+FORMATS = {
+    "csv": "text/csv",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+
+class ExportTooLarge(ValueError):
+    """An export is too large to hand to the browser through Streamlit."""
+
+
+def export_key(name: str, fmt: str, filters=None, frame: pd.DataFrame = None) -> str:
+    """Cache key from data and code version and filter state (or the frame's content if no filters)."""
+    h = hashlib.sha1(f"{name}|{fmt}|{data_version()}|{code_version()}|{filters!r}".encode())
+    if filters is None and frame is not None:
+        h.update(pd.util.hash_pandas_object(frame, index=False).to_numpy().tobytes())
+        h.update(repr(list(frame.columns)).encode())
+    return h.hexdigest()[:16]
+
+
+def write_csv(df: pd.DataFrame, fh) -> None:
+    if df.empty:
+        df.to_csv(fh, index=False)
+    for start in range(0, len(df), CHUNK_ROWS):
+        df.iloc[start:start + CHUNK_ROWS].to_csv(fh, header=start == 0, index=False)
+
+
+def write_parquet(df: pd.DataFrame, fh) -> None:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = pa.Schema.from_pandas(df, preserve_index=False)
+    with pq.ParquetWriter(fh, schema) as writer:
+        for start in range(0, max(len(df), 1), CHUNK_ROWS):
+            chunk = df.iloc[start:start + CHUNK_ROWS]
+            writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+
+
+def export_file(frame, name: str, fmt: str = "csv", filters=None) -> Path:
+    """Path of the exported file, writing it first if this version/filter state is new.
+
+    ``frame`` is a DataFrame or a zero-argument callable returning one; a
+    callable is only invoked when the file has to be (re)generated.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"unsupported export format {fmt!r}")
+
+    if filters is None and callable(frame):
+        frame = frame()  # no filter state given → the key is derived from the content
+    key = export_key(name, fmt, filters, frame if filters is None else None)
+    path = EXPORT_DIR / f"{name}-{key}.{fmt}"
+    if path.exists():
+        os.utime(path)
+        return path
+
+    df = frame() if callable(frame) else frame
+    df = df.rename(columns=str)  # Parquet needs string column names (some tables use years)
+
+    EXPORT_DIR.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=EXPORT_DIR, suffix=".tmp")
+    try:
+        if fmt == "csv":
+            with os.fdopen(fd, "w", newline="", encoding="utf-8") as fh:
+                write_csv(df, fh)
+        else:
+            with os.fdopen(fd, "wb") as fh:
+                write_parquet(df, fh)
+        os.replace(tmp, path)
+    finally:
+        Path(tmp).unlink(missing_ok=True)
+
+    evict(EXPORT_DIR, MAX_BYTES, patterns=[f"*.{ext}" for ext in FORMATS])
+    return path
+
+
+def download_bytes(path: Path, limit: int = DOWNLOAD_MAX_BYTES) -> bytes:
+    """Contents of an exported file for a download button, refusing files over ``limit``."""
+    size = Path(path).stat().st_size
+    if size > limit:
+        raise ExportTooLarge(
+            f"{Path(path).name} is {size / 2**20:,.0f} MB, over the {limit / 2**20:,.0f} MB "
+            f"download limit (ENERGY_DOWNLOAD_MAX_MB); the file is at {path}"
+        )
+    return Path(path).read_bytes()
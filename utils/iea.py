@@ -0,0 +1,70 @@
+"""
+Unified loader for the IEA World-series workbooks (``data/*-World.xlsx``).
+
+The IEA exports share one layout: a few banner/licence rows, a header row
+starting with ``Year``, one column per indicator and a trailing ``Units``
+column.  :func:`read_iea_world` finds the header row itself, so every file
+matching the pattern is ingested in a single cached pass into one tidy
+table, and dropping another IEA export into ``data/`` needs no code change.
+"""
+
+from pathlib import Path
+
+import pandas as pd
+
+from utils.cache import DATA_DIR, disk_cache
+from utils.schema import IEA_WORLD, validate
+
+IEA_PATTERN = "*-World.xlsx"
+
+
+def dataset_name(path: Path) -> str:
+    """Readable dataset name from an IEA export file name.
+
+    ``Total-energy-supply-_TES_-by-GDP-_PPP_-World.xlsx`` →
+    ``Total energy supply (TES) by GDP (PPP)``
+    """
+    stem = path.stem.removesuffix("-World")
+    name = stem.replace("-_", " (").replace("_-", ") ").replace("_", ")").replace("-", " ")
+    return " ".join(name.split())
+
+
+def parse_iea_sheet(raw: pd.DataFrame, dataset: str) -> pd.DataFrame:
+    """Tidy one raw sheet (read with ``header=None``) into ``dataset, indicator, year, value, unit``."""
+    first_col = raw.iloc[:, 0].astype(str).str.strip()
+    header_rows = first_col.index[first_col == "Year"]
+    if header_rows.empty:
+        raise ValueError(f"{dataset}: no 'Year' header row found")
+    header = header_rows[0]
+
+    table = raw.iloc[header + 1:].copy()
+    table.columns = [str(c).strip() for c in raw.iloc[header]]
+    table = table.dropna(how="all")
+
+    units = table.pop("Units") if "Units" in table.columns else pd.Series(None, index=table.index)
+    table["unit"] = units
+    table["year"] = pd.to_numeric(table.pop("Year"), errors="coerce")
+    table = table.dropna(subset=["year"])
+
+    # value coercion and int years are left to the IEA_WORLD schema in read_iea_world
+    long = table.melt(id_vars=["year", "unit"], var_name="indicator", value_name="value")
+    long["dataset"] = dataset
+    return long[["dataset", "indicator", "year", "value", "unit"]]
+
+
+@disk_cache
+def read_iea_world(data_dir=DATA_DIR) -> pd.DataFrame:
+    """All IEA World-series files as one table: ``dataset, indicator, year, value, unit``."""
+    frames = []
+    for path in sorted(Path(data_dir).glob(IEA_PATTERN)):
+        raw = pd.read_excel(path, header=None)
+        frames.append(parse_iea_sheet(raw, dataset_name(path)))
+    if not frames:
+        return pd.DataFrame(columns=["dataset", "indicator", "year", "value", "unit"])
+    return validate(pd.concat(frames, ignore_index=True), IEA_WORLD)
+
+
+def iea_series(table: pd.DataFrame, indicator: str) -> pd.DataFrame:
+    """``year, value, unit`` rows of one indicator, sorted by year."""
+    rows = table[table["indicator"] == indicator]
+    return rows[["year", "value", "unit"]].sort_values("year").reset_index(drop=True)
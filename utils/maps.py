@@ -0,0 +1,147 @@
+"""
+Compact animation frames for world choropleth maps.
+
+A naive ``px.choropleth(..., animation_frame="year")`` repeats locations,
+hover text and styling in every frame, which for 60 years × 200 countries
+runs into megabytes.  Here the per-year values are precomputed once per
+metric (disk cached) and quantised to steps of 1/``levels`` of the colour
+range (values outside it keep their own step, so hover text stays true); the
+figure then carries locations, names and styling once on the base trace,
+and each frame carries only its ``z`` array.  Country geometry comes from
+Plotly's built-in ISO-3 world map, so it is never part of the payload.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+
+from utils.cache import disk_cache
+from utils.data import OWID_PATH, owid_matrix, read_owid
+
+MAP_METRICS = {
+    "fossil_share_energy": ("Fossil share of primary energy", "%", "YlOrBr"),
+    "renewables_share_energy": ("Renewables share of primary energy", "%", "Greens"),
+    "energy_per_gdp": ("Energy per unit GDP", "kWh / $", "Blues"),
+}
+
+
+@dataclass
+class MapFrames:
+    metric: str
+    iso: list           # ISO-3 code per location
+    countries: list     # display name per location
+    years: list         # frame years (only years with any data)
+    codes: np.ndarray   # (len(years), len(iso)) int colour step, -1 = no data
+    lo: float           # value of step 0
+    step: float         # value width of one step
+    zmin: float         # colour range; the scale saturates beyond it
+    zmax: float
+
+    def z(self, frame: int) -> list:
+        """Dequantised values of one frame, ``None`` where missing (JSON-ready)."""
+        row = self.codes[frame]
+        values = np.round(self.lo + row * self.step, 6)
+        return [None if c < 0 else float(v) for c, v in zip(row, values)]
+
+
+def _nice_step(span: float, levels: int) -> float:
+    """Smallest 1/2/5 × 10^k step that splits ``span`` into at most ``levels`` steps."""
+    raw = span / max(levels - 1, 1)
+    if raw <= 0:
+        return 1.0
+    magnitude = 10 ** np.floor(np.log10(raw))
+    for mult in (1, 2, 5, 10):
+        if mult * magnitude >= raw:
+            return float(mult * magnitude)
+    return float(10 * magnitude)
+
+
+@disk_cache
+def map_frames(metric: str, levels: int = 64, path=OWID_PATH) -> MapFrames:
+    """Quantised per-year values of ``metric`` for every country with an ISO code."""
+    countries, years, values = owid_matrix(metric, path)
+
+    df = read_owid(path)
+    iso_of = df.dropna(subset=["iso_code"]).drop_duplicates("country").set_index("country")["iso_code"]
+
+    has_data = ~np.isnan(values)
+    keep_rows = has_data.any(axis=1) & np.isin(countries, iso_of.index)
+    keep_cols = has_data.any(axis=0)
+    values = values[keep_rows][:, keep_cols]
+    countries = [c for c, k in zip(countries, keep_rows) if k]
+
+    # colour range = 1st–99th percentile, so a few outliers don't flatten the scale;
+    # the values themselves are not clipped, only the colours saturate
+    zmin, zmax = np.nanpercentile(values, [1, 99]) if values.size else (0.0, 1.0)
+    if metric.endswith("_share_energy"):
+        zmin, zmax = max(zmin, 0.0), min(zmax, 100.0)
+    step = _nice_step(zmax - zmin, levels)
+    lo = np.floor(min(np.nanmin(values), zmin) / step) * step if values.size else 0.0
+
+    codes = np.round((values - lo) / step)
+    codes = np.where(np.isnan(codes), -1, codes)
+    codes = codes.astype(np.int16 if codes.max(initial=0) < np.iinfo(np.int16).max else np.int32)
+
+    return MapFrames(
+        metric=metric,
+        iso=[iso_of[c] for c in countries],
+        countries=countries,
+        years=years[keep_cols].tolist(),
+        codes=np.ascontiguousarray(codes.T),
+        lo=float(lo),
+        step=step,
+        zmin=float(zmin),
+        zmax=float(zmax),
+    )
+
+
+def animated_choropleth(frames: MapFrames, title: str, unit: str, colorscale: str):
+    """Plotly figure with one shared base trace and ``z``-only animation frames.
+
+    A metric without any data gives an empty figure (no traces or frames).
+    """
+    import plotly.graph_objects as go
+
+    if not frames.years:
+        return go.Figure(layout={"title": title})
+    last = len(frames.years) - 1
+    base = go.Choropleth(
+        locations=frames.iso,
+        locationmode="ISO-3",
+        text=frames.countries,
+        z=frames.z(last),
+        zmin=frames.zmin,
+        zmax=frames.zmax,
+        colorscale=colorscale,
+        marker_line_width=0.3,
+        colorbar_title=unit,
+        hovertemplate="%{text}: %{z}" + f" {unit}<extra></extra>",
+    )
+    fig_frames = [
+        go.Frame(name=str(year), data=[go.Choropleth(z=frames.z(i))], traces=[0])
+        for i, year in enumerate(frames.years)
+    ]
+    steps = [
+        {"label": str(year), "method": "animate",
+         "args": [[str(year)], {"mode": "immediate", "frame": {"duration": 0, "redraw": True}}]}
+        for year in frames.years
+    ]
+    fig = go.Figure(data=[base], frames=fig_frames)
+    fig.update_layout(
+        title=title,
+        geo={"showframe": False, "projection_type": "natural earth"},
+        margin={"l": 0, "r": 0, "t": 50, "b": 0},
+        height=600,
+        sliders=[{"active": last, "steps": steps, "currentvalue": {"prefix": "Year: "}}],
+        updatemenus=[{
+            "type": "buttons",
+            "x": 0.05, "y": 0, "xanchor": "right", "yanchor": "top",
+            "buttons": [
+                {"label": "▶", "method": "animate",
+                 "args": [None, {"frame": {"duration": 300, "redraw": True}, "fromcurrent": True}]},
+                {"label": "⏸", "method": "animate",
+                 "args": [[None], {"mode": "immediate", "frame": {"duration": 0, "redraw": False}}]},
+            ],
+        }],
+    )
+    return fig
@@ -0,0 +1,187 @@
+"""
+Per-session memory accounting.
+
+Every page ends with :func:`utils.ui.end_page`, whose memory guard estimates
+the deep size of what that session holds and records it here together with
+the page name:
+
+* **state** – ``st.session_state`` (widget values and anything a page stores);
+* **page objects** – the page script's top-level variables: the frames
+  ``st.cache_data`` hands each session as its own copy, derived tables and
+  figures.  The session's fragments keep this namespace alive between full
+  reruns.
+
+The ledger is process-wide, so it can split the process's resident memory
+into the per-session estimates (by page) and **shared** memory – everything
+else (cache stores, ``st.cache_resource`` objects, imported libraries,
+interpreter), which does not grow with sessions.
+
+``ENERGY_SESSION_BUDGET_MB`` (default 32) caps one session's state plus page
+objects; when state is what pushes a session over it, the guard trims the
+largest state entries that are not bound to a widget until it fits.
+Widget values are left alone (the browser sends them back on every rerun),
+and a page whose objects alone exceed the budget is only reported.  Sessions that have not rerun for
+``ENERGY_SESSION_TTL_MIN`` minutes (default 30) drop out of the ledger.
+"""
+
+import inspect
+import os
+import sys
+import threading
+import time
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+BUDGET_BYTES = int(float(os.environ.get("ENERGY_SESSION_BUDGET_MB", "32")) * 1024 * 1024)
+TTL_SECONDS = float(os.environ.get("ENERGY_SESSION_TTL_MIN", "30")) * 60
+
+
+def deep_sizeof(obj, _seen=None) -> int:
+    """Approximate bytes held by ``obj``, following containers and pandas/numpy buffers."""
+    if _seen is None:
+        _seen = set()
+    if id(obj) in _seen:
+        return 0
+    _seen.add(id(obj))
+
+    if isinstance(obj, (pd.DataFrame, pd.Series, pd.Index)):
+        usage = obj.memory_usage(deep=True)
+        return int(usage.sum()) if isinstance(usage, pd.Series) else int(usage)
+    if isinstance(obj, np.ndarray):
+        return int(obj.nbytes)
+
+    size = sys.getsizeof(obj, 0)
+    if isinstance(obj, dict):
+        size += sum(deep_sizeof(k, _seen) + deep_sizeof(v, _seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(deep_sizeof(v, _seen) for v in obj)
+    elif hasattr(obj, "__dict__"):
+        size += deep_sizeof(vars(obj), _seen)
+    return size
+
+
+def rss_bytes() -> int:
+    """Current resident set size of this process (peak RSS where /proc is unavailable)."""
+    try:
+        with open("/proc/self/statm") as fh:
+            return int(fh.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        import resource
+
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+def page_objects(namespace: dict, shared=()) -> dict:
+    """Deep size of each top-level variable of a page script.
+
+    Modules, functions and classes are skipped, as are the names in
+    ``shared`` (objects every session sees, e.g. ``st.cache_resource``
+    results).  Objects reachable from several variables count once.
+    """
+    seen = set()
+    sizes = {}
+    for name, value in namespace.items():
+        if name.startswith("__") or name in shared:
+            continue
+        if inspect.ismodule(value) or callable(value):  # functions, classes, cached loaders
+            continue
+        sizes[name] = deep_sizeof(value, seen)
+    return sizes
+
+
+def trim_plan(sizes: dict, budget: int = BUDGET_BYTES, fixed: int = 0, protected=()) -> list:
+    """Keys to drop, largest first, until the remaining total plus ``fixed`` fits in ``budget``.
+
+    Nothing is dropped when ``fixed`` alone reaches the budget (state is not
+    what pushes the session over it) or for keys in ``protected``.
+    """
+    total = sum(sizes.values()) + fixed
+    if total <= budget or fixed >= budget:
+        return []
+    drop = []
+    for key, size in sorted(sizes.items(), key=lambda kv: kv[1], reverse=True):
+        if total <= budget:
+            break
+        if key in protected:
+            continue
+        drop.append(key)
+        total -= size
+    return drop
+
+
+@dataclass
+class SessionUsage:
+    session_id: str
+    page: str
+    state_bytes: int
+    page_bytes: int     # top-level objects of the page script
+    runs: int
+    trimmed: int        # entries dropped by the budget so far
+    updated: float      # time.time() of the last run
+
+
+class MemoryLedger:
+    """Thread-safe record of the latest footprint of every active session."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._sessions = {}
+
+    def record(self, session_id: str, page: str, state_bytes: int, page_bytes: int = 0,
+               trimmed: int = 0) -> SessionUsage:
+        now = time.time()
+        with self._lock:
+            prev = self._sessions.get(session_id)
+            usage = SessionUsage(
+                session_id=session_id,
+                page=page,
+                state_bytes=state_bytes,
+                page_bytes=page_bytes,
+                runs=(prev.runs if prev else 0) + 1,
+                trimmed=(prev.trimmed if prev else 0) + trimmed,
+                updated=now,
+            )
+            self._sessions[session_id] = usage
+            for sid in [s for s, u in self._sessions.items() if now - u.updated > TTL_SECONDS]:
+                del self._sessions[sid]
+        return usage
+
+    def sessions(self) -> pd.DataFrame:
+        with self._lock:
+            rows = [vars(u).copy() for u in self._sessions.values()]
+        columns = ["session_id", "page", "state_bytes", "page_bytes", "runs", "trimmed", "updated"]
+        df = pd.DataFrame(rows, columns=columns)
+        return df.assign(total_bytes=df["state_bytes"] + df["page_bytes"])
+
+    def by_page(self) -> pd.DataFrame:
+        """Sessions currently on each page and what they hold (bytes)."""
+        df = self.sessions()
+        return (
+            df.groupby("page")
+            .agg(sessions=("session_id", "size"), state_bytes=("state_bytes", "sum"),
+                 page_bytes=("page_bytes", "sum"), total_bytes=("total_bytes", "sum"),
+                 max_bytes=("total_bytes", "max"))
+            .sort_values("total_bytes", ascending=False)
+            .reset_index()
+        )
+
+    def summary(self) -> dict:
+        """Process RSS split into per-session memory (state + page objects) and shared memory."""
+        df = self.sessions()
+        rss = rss_bytes()
+        attributed = int(df["total_bytes"].sum())
+        return {
+            "rss_bytes": rss,
+            "sessions": len(df),
+            "session_bytes": attributed,
+            "shared_bytes": max(rss - attributed, 0),
+            "budget_bytes": BUDGET_BYTES,
+            "state_bytes": int(df["state_bytes"].sum()),
+            "over_budget": int((df["total_bytes"] > BUDGET_BYTES).sum()),
+        }
+
+
+LEDGER = MemoryLedger()
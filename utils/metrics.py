@@ -0,0 +1,66 @@
+"""
+Computed tables shared by the pages and the metrics API (``api.py``).
+
+The functions are plain (Streamlit-free) and disk cached, so the dashboard
+and the API read the same results from the shared cache tier.
+"""
+
+import pandas as pd
+
+from utils.cache import disk_cache
+from utils.data import OWID_PATH, read_owid
+from utils.schema import OWID, require
+
+FOSSIL_COLUMNS = ["coal_consumption", "oil_consumption", "gas_consumption"]
+
+
+def fossil_totals(df: pd.DataFrame) -> pd.DataFrame:
+    """``country, year, fossil_total`` (coal + oil + gas, missing fuels count as 0)."""
+    require(df, FOSSIL_COLUMNS, OWID)
+    return df[["country", "year"]].assign(fossil_total=df[FOSSIL_COLUMNS].fillna(0).sum(axis=1))
+
+
+def period_changes(totals: pd.DataFrame, start_year: int, max_year: int) -> pd.DataFrame:
+    """Per-country fossil totals in ``start_year`` and ``max_year`` and their % change."""
+    df = totals[totals["year"].isin([start_year, max_year])]
+    pivot = df.pivot(index="country", columns="year", values="fossil_total")
+    pivot = pivot.reindex(columns=[start_year, max_year]).dropna()
+    pivot["change_pct"] = ((pivot[max_year] - pivot[start_year]) / pivot[start_year] * 100).round(2)
+    pivot.columns.name = None
+    return pivot.reset_index().sort_values("change_pct")
+
+
+@disk_cache
+def fossil_reductions(path=OWID_PATH, years: int = 10):
+    """% change in coal + oil + gas consumption over the last ``years`` years.
+
+    Returns ``(table, start_year, max_year)``; the table has columns
+    ``country``, one TWh column per year (named by the year itself) and
+    ``change_pct``, and is
+    sorted so the largest reduction comes first.
+    """
+    df = read_owid(path)
+    max_year = int(df["year"].max())
+    start_year = max_year - years
+    return period_changes(fossil_totals(df), start_year, max_year), start_year, max_year
+
+
+@disk_cache
+def world_renewables_share(path=OWID_PATH) -> pd.DataFrame:
+    """World rows of the OWID dataset that have ``renewables_share_energy``."""
+    df = require(read_owid(path), ["renewables_share_energy"], OWID)
+    world_df = df[df["country"] == "World"]
+    world_df = world_df.dropna(subset=["renewables_share_energy"])
+    return world_df
+
+
+def coverage_table(df: pd.DataFrame) -> pd.DataFrame:
+    """Number of rows with a value, per column (index) and year (columns)."""
+    values = df.drop(columns=["country", "year"])
+    return values.notna().groupby(df["year"]).sum().T.astype(int)
+
+
+@disk_cache
+def column_coverage(path=OWID_PATH) -> pd.DataFrame:
+    """Data coverage of every OWID column by year; see :func:`coverage_table`."""
+    return coverage_table(read_owid(path))
@@ -0,0 +1,184 @@
+"""
+Peer-group aggregates from a sparse entity × group membership matrix.
+
+Groups are lists of ISO-3 codes, so they don't depend on how a source
+spells a country name, and may overlap freely.  Membership is stored in
+CSR form (``indptr`` / ``indices``: for each group, the rows of its member
+countries), and every group's series for a metric comes from one sparse
+product with the country × year matrix, evaluated with ``np.add.reduceat``
+over the member rows — the cost is one pass over the memberships,
+regardless of how many groups are compared.
+
+Built-in groups: BRICS, BRICS+, G7, G20, OPEC, EU-27, plus groups derived
+from World Bank GDP per capita (``Countries.csv``): Developed / Developing
+and approximate income groups.  ``ENERGY_PEER_GROUPS`` may point to a JSON
+file ``{"name": ["ISO", ...]}`` that adds or overrides groups.
+"""
+
+import json
+import os
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from utils.cache import disk_cache
+from utils.data import OWID_PATH, owid_matrix, read_countries, read_owid
+
+PEER_GROUPS = {
+    "BRICS": ["BRA", "RUS", "IND", "CHN", "ZAF"],
+    "BRICS+": ["BRA", "RUS", "IND", "CHN", "ZAF", "EGY", "ETH", "IRN", "ARE", "IDN"],
+    "G7": ["USA", "JPN", "DEU", "GBR", "FRA", "ITA", "CAN"],
+    "G20": ["ARG", "AUS", "BRA", "CAN", "CHN", "FRA", "DEU", "IND", "IDN", "ITA", "JPN", "KOR",
+            "MEX", "RUS", "SAU", "ZAF", "TUR", "GBR", "USA"],
+    "OPEC": ["DZA", "COG", "GNQ", "GAB", "IRN", "IRQ", "KWT", "LBY", "NGA", "SAU", "ARE", "VEN"],
+    "EU-27": ["AUT", "BEL", "BGR", "HRV", "CYP", "CZE", "DNK", "EST", "FIN", "FRA", "DEU", "GRC",
+              "HUN", "IRL", "ITA", "LVA", "LTU", "LUX", "MLT", "NLD", "POL", "PRT", "ROU", "SVK",
+              "SVN", "ESP", "SWE"],
+}
+
+DEVELOPED_THRESHOLD = 25_000  # GDP per capita (USD), as on the developed-vs-developing page
+
+# approximate World Bank income bands, applied to GDP (not GNI) per capita
+INCOME_BANDS = [
+    ("Low income", 0, 1_145),
+    ("Lower-middle income", 1_145, 4_515),
+    ("Upper-middle income", 4_515, 14_005),
+    ("High income", 14_005, np.inf),
+]
+
+
+@disk_cache
+def development_status(threshold: float = DEVELOPED_THRESHOLD) -> pd.DataFrame:
+    """Latest GDP per capita per country from ``Countries.csv`` with its status and income band.
+
+    Columns: ``iso_code, country, gdp per capita, dev_status, income_group``.
+    """
+    wb = read_countries().rename(columns={"country name": "country", "country code": "iso_code"})
+    latest = wb.sort_values("year").groupby("iso_code").tail(1)
+    latest = latest[["iso_code", "country", "gdp per capita"]].dropna()
+
+    gdp = latest["gdp per capita"].to_numpy()
+    latest["dev_status"] = np.where(gdp >= threshold, "Developed", "Developing")
+    edges = [lo for _, lo, _ in INCOME_BANDS[1:]]
+    latest["income_group"] = np.asarray([name for name, _, _ in INCOME_BANDS])[np.searchsorted(edges, gdp, side="right")]
+    return latest.reset_index(drop=True)
+
+
+def peer_groups(derived: bool = True) -> dict:
+    """Built-in groups, GDP-derived groups and any ``ENERGY_PEER_GROUPS`` overrides."""
+    groups = {name: list(codes) for name, codes in PEER_GROUPS.items()}
+    if derived:
+        status = development_status()
+        for column in ("dev_status", "income_group"):
+            for name, rows in status.groupby(column):
+                groups[name] = rows["iso_code"].tolist()
+    config = os.environ.get("ENERGY_PEER_GROUPS")
+    if config:
+        with open(config, encoding="utf-8") as fh:
+            groups.update({name: list(codes) for name, codes in json.load(fh).items()})
+    return groups
+
+
+@dataclass
+class Membership:
+    groups: list         # group names
+    entities: list       # ISO codes, one per matrix row
+    indptr: np.ndarray   # (len(groups) + 1,) CSR row pointer
+    indices: np.ndarray  # (nnz,) entity rows, group by group
+
+    def members(self, group: str) -> list:
+        g = self.groups.index(group)
+        return [self.entities[i] for i in self.indices[self.indptr[g]:self.indptr[g + 1]]]
+
+    def sizes(self) -> np.ndarray:
+        return np.diff(self.indptr)
+
+    def dense(self) -> np.ndarray:
+        """``(entities × groups)`` boolean matrix, for inspection."""
+        out = np.zeros((len(self.entities), len(self.groups)), dtype=bool)
+        out[self.indices, np.repeat(np.arange(len(self.groups)), self.sizes())] = True
+        return out
+
+    def aggregate(self, values: np.ndarray):
+        """Membershipᵀ · values over the rows of an ``(entities × years)`` matrix.
+
+        Returns ``(total, count)``, both ``(groups × years)``: the sum over
+        members (missing values count as 0) and the number of members with a
+        value.
+        """
+        filled = np.nan_to_num(values[self.indices], nan=0.0)
+        present = (~np.isnan(values[self.indices])).astype(np.int32)
+        total = np.zeros((len(self.groups), values.shape[1]))
+        count = np.zeros((len(self.groups), values.shape[1]), dtype=np.int32)
+        nonempty = self.sizes() > 0
+        if self.indices.size:
+            starts = self.indptr[:-1][nonempty]
+            total[nonempty] = np.add.reduceat(filled, starts, axis=0)
+            count[nonempty] = np.add.reduceat(present, starts, axis=0)
+        return total, count
+
+
+def membership(groups: dict, entities) -> Membership:
+    """CSR membership of ``entities`` (ISO codes) in each group; unknown codes are ignored."""
+    row = {code: i for i, code in enumerate(entities)}
+    names, indptr, indices = [], [0], []
+    for name, codes in groups.items():
+        rows = sorted({row[c] for c in codes if c in row})
+        names.append(name)
+        indices.extend(rows)
+        indptr.append(len(indices))
+    return Membership(names, list(entities), np.asarray(indptr, dtype=np.int64), np.asarray(indices, dtype=np.int64))
+
+
+@dataclass
+class GroupSeries:
+    metric: str
+    groups: list
+    years: np.ndarray   # (T,)
+    total: np.ndarray   # (G, T) sum over members
+    count: np.ndarray   # (G, T) members reporting
+    size: np.ndarray    # (G,) members present in the data
+
+    def frame(self, groups=None, how: str = "total", min_share: float = 0.0) -> pd.DataFrame:
+        """Long ``group, year, value, reporting`` rows; ``how`` is ``total`` or ``mean``.
+
+        Years where fewer than ``min_share`` of a group's members report are dropped.
+        """
+        idx = [self.groups.index(g) for g in (groups or self.groups)]
+        total, count, size = self.total[idx], self.count[idx], self.size[idx]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            value = total if how == "total" else total / count
+            share = count / size[:, None]
+        df = pd.DataFrame({
+            "group": np.repeat([self.groups[i] for i in idx], len(self.years)),
+            "year": np.tile(self.years, len(idx)),
+            "value": value.ravel(),
+            "reporting": count.ravel(),
+            "share": share.ravel(),
+        })
+        keep = (df["reporting"] > 0) & (df["share"] >= min_share)
+        return df[keep].drop(columns="share").reset_index(drop=True)
+
+
+def country_codes(path=OWID_PATH) -> dict:
+    """OWID country name → ISO-3 code (real codes only)."""
+    df = read_owid(path).dropna(subset=["iso_code"])
+    df = df[~df["iso_code"].astype(str).str.startswith("OWID_")]
+    return df.drop_duplicates("country").set_index("country")["iso_code"].astype(str).to_dict()
+
+
+@disk_cache
+def group_series(metric: str, groups: tuple, path=OWID_PATH) -> GroupSeries:
+    """Aggregate ``metric`` for every group in ``groups`` (``((name, codes), ...)``) at once."""
+    countries, years, values = owid_matrix(metric, path)
+    codes = country_codes(path)
+    member = membership(dict(groups), [codes.get(c, c) for c in countries])
+    total, count = member.aggregate(values)
+    return GroupSeries(metric, member.groups, years, total, count, member.sizes())
+
+
+def peer_series(metric: str, groups: dict = None) -> GroupSeries:
+    """:func:`group_series` for a ``{name: codes}`` dict (default: :func:`peer_groups`)."""
+    groups = peer_groups() if groups is None else groups
+    return group_series(metric, tuple((name, tuple(codes)) for name, codes in groups.items()))
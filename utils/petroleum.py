@@ -0,0 +1,82 @@
+"""
+Country-partitioned index over the INT-Export petroleum production table.
+
+The long table from :func:`utils.data.read_petroleum` is split once into one
+contiguous ``(series × year)`` array per country, so selecting a country is
+a dict lookup instead of a boolean mask over every row, and overlaying or
+summing many countries costs the same as one.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from utils.cache import disk_cache
+from utils.data import PETROLEUM_PATH, read_petroleum
+
+
+@dataclass
+class ProductionIndex:
+    countries: list    # "World" first, then alphabetical
+    series: list       # series names, in file order
+    years: np.ndarray  # (T,) shared year axis
+    values: dict       # country -> (len(series), T) float array, NaN = no data
+
+    def series_index(self, series: str) -> int:
+        return self.series.index(series)
+
+    def country_frame(self, country: str) -> pd.DataFrame:
+        """All series of one country in long format (rows without data dropped)."""
+        block = self.values[country]
+        df = pd.DataFrame({
+            "series_name": np.repeat(self.series, len(self.years)),
+            "year": np.tile(self.years, len(self.series)),
+            "production_mbpd": block.ravel(),
+        })
+        return df.dropna(subset=["production_mbpd"])
+
+    def long_frame(self, countries) -> pd.DataFrame:
+        """All series of several countries in long format, with a ``country`` column."""
+        frames = [self.country_frame(c).assign(country=c) for c in countries]
+        if not frames:
+            return pd.DataFrame(columns=["country", "series_name", "year", "production_mbpd"])
+        return pd.concat(frames, ignore_index=True)[["country", "series_name", "year", "production_mbpd"]]
+
+    def overlay(self, countries, series: str, with_sum: bool = False) -> pd.DataFrame:
+        """One series for several countries in long format, optionally plus their sum."""
+        row = self.series_index(series)
+        stacked = np.vstack([self.values[c][row] for c in countries])
+        labels = list(countries)
+        if with_sum:
+            total = np.where(np.isnan(stacked).all(axis=0), np.nan, np.nansum(stacked, axis=0))
+            stacked = np.vstack([stacked, total])
+            labels.append("Sum of selected")
+        df = pd.DataFrame({
+            "country": np.repeat(labels, len(self.years)),
+            "year": np.tile(self.years, len(labels)),
+            "production_mbpd": stacked.ravel(),
+        })
+        return df.dropna(subset=["production_mbpd"])
+
+
+@disk_cache
+def production_index(path=PETROLEUM_PATH) -> ProductionIndex:
+    df = read_petroleum(path).copy()
+    df["series_name"] = df["series_name"].str.strip()
+
+    series = df["series_name"].drop_duplicates().tolist()
+    years = np.arange(int(df["year"].min()), int(df["year"].max()) + 1)
+
+    wide = df.pivot_table(index=["country", "series_name"], columns="year", values="production_mbpd", aggfunc="first")
+    wide = wide.reindex(columns=years)
+
+    values = {}
+    for country, block in wide.groupby(level="country", sort=False):
+        block = block.droplevel("country").reindex(series)
+        values[country] = np.ascontiguousarray(block.to_numpy(dtype=float))
+
+    countries = sorted(values)
+    if "World" in values:
+        countries = ["World"] + [c for c in countries if c != "World"]
+    return ProductionIndex(countries=countries, series=series, years=years, values=values)
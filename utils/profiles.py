@@ -0,0 +1,260 @@
+"""
+One-page country profiles for batch export.
+
+:func:`profile_inputs` slices everything a profile needs for one country
+out of the shared, disk-cached datasets (OWID panel, ranking indexes,
+petroleum production index) into a small plain dict.  :func:`render_profile`
+turns such a dict into a five-panel Plotly figure and writes it as HTML
+(and PNG/PDF when ``kaleido`` is installed).  Rendering needs nothing but
+the dict, so it can run in worker processes; :func:`input_hash` of the dict
+tells whether a country's profile needs rebuilding.
+
+Panels mirror the dashboard pages: fossil trend (page 1), GDP vs fossil
+change (page 10), energy intensity (page 11), renewables share (page 9)
+and petroleum production (page 4).
+"""
+
+import hashlib
+import html
+import io
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+
+from utils.data import OWID_PATH, read_owid
+from utils.metrics import fossil_totals
+from utils.petroleum import production_index
+from utils.rankings import ranking_index
+
+# bump to force every profile to re-render after a layout change
+PROFILE_VERSION = 1
+PETROLEUM_SERIES = "Total petroleum and other liquids (Mb/d)"
+CHANGE_YEARS = 10
+
+
+def _series(frame, column):
+    rows = frame.dropna(subset=[column])
+    return {"year": rows["year"].to_numpy(dtype=int), "value": rows[column].to_numpy(dtype=float)}
+
+
+def _rank(index, country):
+    """``(rank, out_of, year)`` of ``country`` in the latest year it has a value."""
+    if country not in index.entities:
+        return None
+    i = index.entities.index(country)
+    has = np.flatnonzero(~np.isnan(index.values[i]))
+    if not has.size:
+        return None
+    col = has[-1]
+    rank = int(np.flatnonzero(index.order[col, :index.counts[col]] == i)[0]) + 1
+    return rank, int(index.counts[col]), int(index.years[col])
+
+
+def load_shared(path=OWID_PATH) -> dict:
+    """The cached datasets every profile is sliced from (loaded once per process)."""
+    owid = read_owid(path)
+    return {
+        "owid": owid.assign(fossil_total=fossil_totals(owid)["fossil_total"]),
+        "intensity": ranking_index("energy_per_gdp", ascending=True, path=path),
+        "renewables": ranking_index("renewables_share_energy", ascending=False, path=path),
+        "petroleum": production_index(),
+    }
+
+
+def profile_countries(shared: dict) -> list:
+    """Countries with a real ISO code (aggregates excluded)."""
+    owid = shared["owid"]
+    iso = owid["iso_code"].astype("string")
+    return sorted(owid.loc[iso.notna() & ~iso.str.startswith("OWID_", na=False), "country"].unique())
+
+
+def profile_inputs(country: str, shared: dict) -> dict:
+    """Everything the profile of ``country`` shows, as plain arrays and numbers."""
+    rows = shared["owid"][shared["owid"]["country"] == country].sort_values("year")
+    inputs = {
+        "country": country,
+        "fossil": _series(rows, "fossil_total"),
+        "gdp": _series(rows, "gdp"),
+        "fossil_consumption": _series(rows, "fossil_fuel_consumption"),
+        "intensity": _series(rows, "energy_per_gdp"),
+        "renewables": _series(rows, "renewables_share_energy"),
+        "intensity_rank": _rank(shared["intensity"], country),
+        "renewables_rank": _rank(shared["renewables"], country),
+        "petroleum": None,
+    }
+    petroleum = shared["petroleum"]
+    if country in petroleum.values and PETROLEUM_SERIES in petroleum.series:
+        values = petroleum.values[country][petroleum.series_index(PETROLEUM_SERIES)]
+        keep = ~np.isnan(values)
+        inputs["petroleum"] = {"year": petroleum.years[keep], "value": values[keep]}
+    return inputs
+
+
+def _digest(h, obj) -> None:
+    # arrays by content, not by pickle: a fresh and an unpickled array differ in memory layout
+    if isinstance(obj, dict):
+        for key in sorted(obj):
+            h.update(repr(key).encode())
+            _digest(h, obj[key])
+    elif isinstance(obj, np.ndarray):
+        h.update(f"{obj.dtype.str}{obj.shape}".encode())
+        h.update(np.ascontiguousarray(obj).tobytes())
+    else:
+        h.update(repr(obj).encode())
+
+
+def input_hash(inputs: dict) -> str:
+    h = hashlib.sha1(f"{PROFILE_VERSION}".encode())
+    _digest(h, inputs)
+    return h.hexdigest()
+
+
+def manifest_key(inputs: dict, formats) -> str:
+    """Manifest entry of a rendered profile: its inputs and the formats written."""
+    return f"{input_hash(inputs)}:{','.join(formats)}"
+
+
+def is_current(manifest: dict, country: str, key: str, out_dir: Path, formats) -> bool:
+    """Whether the profile of ``country`` in ``out_dir`` was rendered from ``key`` and is complete."""
+    return manifest.get(country) == key and all(
+        (Path(out_dir) / f"{slug(country)}.{fmt}").exists() for fmt in formats
+    )
+
+
+def decoupling(inputs: dict):
+    """GDP and fossil consumption indexed to 100 over the last ``CHANGE_YEARS`` common years."""
+    gdp, fossil = inputs["gdp"], inputs["fossil_consumption"]
+    common = np.intersect1d(gdp["year"], fossil["year"])
+    if common.size < 2:
+        return None
+    years = common[common >= common[-1] - CHANGE_YEARS]
+    g = gdp["value"][np.isin(gdp["year"], years)]
+    f = fossil["value"][np.isin(fossil["year"], years)]
+    if g[0] <= 0 or f[0] <= 0:
+        return None
+    return {"year": years, "gdp": g / g[0] * 100, "fossil": f / f[0] * 100}
+
+
+def _fmt_rank(rank):
+    return f"#{rank[0]} of {rank[1]} ({rank[2]})" if rank else "–"
+
+
+def profile_figure(inputs: dict):
+    from plotly.subplots import make_subplots
+    import plotly.graph_objects as go
+
+    fig = make_subplots(
+        rows=3, cols=2,
+        subplot_titles=(
+            "Fossil fuel consumption (coal + oil + gas, TWh)",
+            "GDP vs fossil fuel use (index, first year = 100)",
+            f"Energy per unit GDP (kWh / $) – rank {_fmt_rank(inputs['intensity_rank'])}",
+            f"Renewables share of energy (%) – rank {_fmt_rank(inputs['renewables_rank'])}",
+            "Petroleum & other liquids production (Mb/d)",
+        ),
+        specs=[[{}, {}], [{}, {}], [{"colspan": 2}, None]],
+        vertical_spacing=0.09,
+    )
+
+    def line(series, row, col, name, color):
+        if series is not None and len(series["year"]):
+            fig.add_trace(go.Scatter(x=series["year"], y=series["value"], name=name, mode="lines",
+                                     line={"color": color}), row=row, col=col)
+        else:
+            fig.add_annotation(text="no data", showarrow=False, xref="x domain", yref="y domain",
+                               x=0.5, y=0.5, row=row, col=col)
+
+    line(inputs["fossil"], 1, 1, "Fossil total", "#8c564b")
+    dec = decoupling(inputs)
+    if dec:
+        fig.add_trace(go.Scatter(x=dec["year"], y=dec["gdp"], name="GDP", line={"color": "#2ca02c"}), row=1, col=2)
+        fig.add_trace(go.Scatter(x=dec["year"], y=dec["fossil"], name="Fossil use", line={"color": "#d62728"}), row=1, col=2)
+    else:
+        line(None, 1, 2, "", "")
+    line(inputs["intensity"], 2, 1, "Energy per GDP", "#1f77b4")
+    line(inputs["renewables"], 2, 2, "Renewables share", "#17becf")
+    line(inputs["petroleum"], 3, 1, "Petroleum production", "#ff7f0e")
+
+    fig.update_layout(
+        title=f"{inputs['country']} – energy profile",
+        template="plotly_white",
+        height=1100,
+        width=1100,
+        showlegend=False,
+        margin={"t": 90},
+    )
+    return fig
+
+
+def summary_rows(inputs: dict) -> list:
+    """``(label, value)`` headline numbers for the top of the report."""
+    rows = []
+    fossil = inputs["fossil"]
+    if len(fossil["year"]):
+        rows.append((f"Fossil consumption {fossil['year'][-1]}", f"{fossil['value'][-1]:,.0f} TWh"))
+    dec = decoupling(inputs)
+    if dec:
+        period = f"{dec['year'][0]}–{dec['year'][-1]}"
+        rows.append((f"GDP change {period}", f"{dec['gdp'][-1] - 100:+.1f}%"))
+        rows.append((f"Fossil change {period}", f"{dec['fossil'][-1] - 100:+.1f}%"))
+    renew = inputs["renewables"]
+    if len(renew["year"]):
+        rows.append((f"Renewables share {renew['year'][-1]}", f"{renew['value'][-1]:.1f}%"))
+    rows.append(("Energy-intensity rank (lowest first)", _fmt_rank(inputs["intensity_rank"])))
+    rows.append(("Renewables-share rank", _fmt_rank(inputs["renewables_rank"])))
+    return rows
+
+
+def slug(country: str) -> str:
+    return "".join(c if c.isalnum() else "_" for c in country).strip("_")
+
+
+def render_profile(inputs: dict, out_dir: Path, formats=("html",)) -> list:
+    """Write the profile of one country; returns the files written."""
+    out_dir = Path(out_dir)
+    fig = profile_figure(inputs)
+    name = slug(inputs["country"])
+    written = []
+
+    if "html" in formats:
+        table = "".join(
+            f"<tr><th>{html.escape(k)}</th><td>{html.escape(v)}</td></tr>" for k, v in summary_rows(inputs)
+        )
+        body = fig.to_html(full_html=False, include_plotlyjs=False)
+        page = (
+            "<!DOCTYPE html><html><head><meta charset='utf-8'>"
+            f"<title>{html.escape(inputs['country'])} – energy profile</title>"
+            "<script src='plotly.min.js'></script>"
+            "<style>body{font-family:sans-serif;margin:2em}table{border-collapse:collapse}"
+            "th,td{padding:4px 12px;text-align:left;border-bottom:1px solid #ddd}</style>"
+            f"</head><body><h1>{html.escape(inputs['country'])}</h1><table>{table}</table>{body}"
+            "<p><small>Source: Our World in Data energy dataset; EIA International petroleum production.</small></p>"
+            "</body></html>"
+        )
+        path = out_dir / f"{name}.html"
+        path.write_text(page, encoding="utf-8")
+        written.append(path)
+
+    for fmt in ("png", "pdf"):
+        if fmt in formats:
+            path = out_dir / f"{name}.{fmt}"
+            fig.write_image(path)
+            written.append(path)
+    return written
+
+
+@lru_cache(maxsize=1)
+def image_export_available() -> bool:
+    """True if Plotly can write PNG/PDF here, probed once with a tiny ``write_image``.
+
+    Importing ``kaleido`` is not enough: newer releases also need a Chrome
+    they can launch, so only an actual export proves PNG/PDF will work.
+    """
+    import plotly.graph_objects as go
+
+    try:
+        go.Figure().write_image(io.BytesIO(), format="png", width=10, height=10)
+    except Exception:
+        return False
+    return True
@@ -0,0 +1,154 @@
+"""
+Opt-in per-rerun profiling of dashboard pages.
+
+With ``ENERGY_PROFILING=1`` set for a deployment, adding ``?profile=1`` to a
+page URL runs that session's page script (and each later fragment rerun)
+under :mod:`cProfile`; ``?profile=cold`` additionally clears Streamlit's
+in-memory caches and makes the disk cache recompute, so the run goes
+through the loaders' ``read_excel`` cold path.  See
+:func:`utils.ui.profile_page`.
+
+Streamlit's caches cannot be bypassed for one session, so a cold run
+empties them for every session of the process.  It is therefore an
+operator action: it needs ``ENERGY_PROFILING_COLD_TOKEN`` set and the same
+value passed as ``&token=``; otherwise the run is profiled warm.
+
+Each run is written as ``<page>/<timestamp>-<label>.pstats`` under
+``.cache/profiling`` (``ENERGY_PROFILING_DIR``); open it with ``python -m
+pstats`` or snakeviz.  :func:`flame_html` renders the call graph of a run
+as an icicle chart (a flame graph drawn top-down) in a standalone HTML
+file next to it.  ``ENERGY_PROFILING_KEEP`` (default 50) runs are kept per
+page.
+"""
+
+import cProfile
+import hmac
+import os
+import pstats
+import time
+from pathlib import Path
+
+import pandas as pd
+
+from utils.cache import ROOT
+
+PROFILE_DIR = Path(os.environ.get("ENERGY_PROFILING_DIR", ROOT / ".cache" / "profiling"))
+ENABLED = os.environ.get("ENERGY_PROFILING") == "1"
+KEEP = int(os.environ.get("ENERGY_PROFILING_KEEP", "50"))
+MODES = ("1", "cold")
+COLD_TOKEN = os.environ.get("ENERGY_PROFILING_COLD_TOKEN", "")
+
+
+def cold_allowed(token: str) -> bool:
+    """Whether ``token`` authorises a cold run (never when no token is configured)."""
+    return bool(COLD_TOKEN) and hmac.compare_digest(token.encode(), COLD_TOKEN.encode())
+
+
+def start() -> cProfile.Profile:
+    profiler = cProfile.Profile()
+    profiler.enable()
+    return profiler
+
+
+def save(profiler: cProfile.Profile, page: str, label: str = "page") -> Path:
+    """Stop ``profiler`` and write its stats as ``<page>/<timestamp>-<label>.pstats``."""
+    profiler.disable()
+    out_dir = PROFILE_DIR / page
+    out_dir.mkdir(parents=True, exist_ok=True)
+    stamp = time.strftime("%Y%m%d-%H%M%S") + f".{int(time.time() * 1000) % 1000:03d}"
+    path = out_dir / f"{stamp}-{label}.pstats"
+    profiler.dump_stats(path)
+    for old in runs(page)[KEEP:]:
+        old.unlink(missing_ok=True)
+        old.with_suffix(".html").unlink(missing_ok=True)
+    return path
+
+
+def runs(page: str) -> list:
+    """Saved ``.pstats`` files of ``page``, newest first."""
+    return sorted((PROFILE_DIR / page).glob("*.pstats"), reverse=True)
+
+
+def _where(func) -> str:
+    filename, line, name = func
+    if filename == "~":  # built-in
+        return name
+    return f"{name} ({Path(filename).name}:{line})"
+
+
+def top_functions(path: Path, limit: int = 25) -> pd.DataFrame:
+    """The ``limit`` functions with the highest cumulative time in a run."""
+    stats = pstats.Stats(str(path)).stats
+    rows = [(_where(f), nc, tt, ct) for f, (cc, nc, tt, ct, callers) in stats.items()]
+    df = pd.DataFrame(rows, columns=["function", "calls", "own_s", "cumulative_s"])
+    return df.sort_values("cumulative_s", ascending=False).head(limit).reset_index(drop=True)
+
+
+def flame_tree(path: Path, min_share: float = 0.005, max_depth: int = 40):
+    """``(ids, labels, parents, values)`` of the call tree of a run, for an icicle chart.
+
+    cProfile records caller → callee edges rather than whole stacks, so the
+    tree is unfolded from the functions without a recorded caller, and a
+    function's time under a given parent is its edge time scaled by the
+    share of the parent's total time that node stands for (as snakeviz
+    does).  Branches below ``min_share`` of the run are pruned.
+    """
+    run = pstats.Stats(str(path))
+    stats = run.stats
+    callees = {}
+    for func, (cc, nc, tt, ct, callers) in stats.items():
+        for caller, edge in callers.items():
+            callees.setdefault(caller, []).append((func, edge[3]))
+
+    total = max(run.total_tt, 1e-9)
+    ids, labels, parents, values = ["rerun"], [f"rerun ({total:.2f} s)"], [""], [total]
+
+    def unfold(func, value, node_id, stack):
+        if len(stack) >= max_depth:
+            return
+        children = [(f, t) for f, t in callees.get(func, ()) if f not in stack]
+        scale = value / stats[func][3] if stats[func][3] else 0.0
+        weighted = [(f, t * scale) for f, t in children]
+        covered = sum(t for _, t in weighted)
+        if covered > value:  # recursion can double count; keep children within the parent
+            weighted = [(f, t * value / covered) for f, t in weighted]
+        for k, (child, t) in enumerate(sorted(weighted, key=lambda ft: -ft[1])):
+            if t < min_share * total:
+                break
+            child_id = f"{node_id}/{k}"
+            ids.append(child_id)
+            labels.append(_where(child))
+            parents.append(node_id)
+            values.append(t)
+            unfold(child, t, child_id, stack | {child})
+
+    roots = [(f, s[3]) for f, s in stats.items() if not s[4]]
+    covered = sum(t for _, t in roots)
+    for k, (func, t) in enumerate(sorted(roots, key=lambda ft: -ft[1])):
+        t = t * min(1.0, total / covered) if covered else t
+        if t < min_share * total:
+            break
+        ids.append(f"rerun/{k}")
+        labels.append(_where(func))
+        parents.append("rerun")
+        values.append(t)
+        unfold(func, t, f"rerun/{k}", frozenset({func}))
+    return ids, labels, parents, values
+
+
+def flame_html(path: Path) -> Path:
+    """Write (once) and return the icicle-chart HTML of a saved run."""
+    out = Path(path).with_suffix(".html")
+    if out.exists():
+        return out
+    import plotly.graph_objects as go
+
+    ids, labels, parents, values = flame_tree(path)
+    fig = go.Figure(go.Icicle(
+        ids=ids, labels=labels, parents=parents, values=values,
+        branchvalues="total", tiling={"orientation": "v"}, maxdepth=12,
+        hovertemplate="%{label}<br>%{value:.3f} s (%{percentRoot:.1%})<extra></extra>",
+    ))
+    fig.update_layout(title=f"{Path(path).parent.name} – {Path(path).stem}", margin={"t": 50, "l": 10, "r": 10, "b": 10}, height=800)
+    fig.write_html(out, include_plotlyjs=True)
+    return out
@@ -0,0 +1,178 @@
+"""
+Batched trend projections of the renewables share for every country.
+
+Instead of fitting one model per country in a Python loop, the trailing
+``window`` years of the country × year ``renewables_share_energy`` matrix
+are fitted in a single vectorised weighted least-squares pass (missing
+years get weight 0).  Two models share that solver:
+
+* ``linear``   – share = a + b·year
+* ``logistic`` – logit(share / 100) = a + b·year, i.e. an S-curve that
+  saturates at 100 %, fitted on the linearised (logit) scale.
+
+For each entity the fit gives an estimated year in which the share crosses
+``target`` (default 50 %) and an interval obtained by moving the slope
+± ``z`` standard errors around the fitted centre of the window.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+
+from utils.cache import disk_cache
+from utils.data import OWID_PATH, owid_matrix, read_owid
+
+MODELS = ("linear", "logistic")
+METRIC = "renewables_share_energy"
+_EPS = 0.5  # % – keeps the logit finite for shares of 0 or 100
+
+
+@dataclass
+class Projection:
+    model: str
+    window: int
+    target: float
+    entities: list        # "World" first, then countries
+    years: np.ndarray     # (T,) observed year axis
+    values: np.ndarray    # (n, T) observed share, NaN = missing
+    intercept: np.ndarray  # (n,) on the model scale, centred at ``x0``
+    slope: np.ndarray     # (n,) per year on the model scale
+    slope_se: np.ndarray  # (n,)
+    x0: float             # centring year of the fit (mid-window)
+    n_obs: np.ndarray     # (n,) points in the window
+    latest: np.ndarray    # (n,) last observed share
+    crossing: np.ndarray  # (n,) estimated crossing year, NaN = never on trend
+    lo: np.ndarray        # (n,) earliest crossing year within the interval
+    hi: np.ndarray        # (n,) latest crossing year, inf = may never cross
+    reached: np.ndarray   # (n,) first observed year at/above target, NaN = not yet
+
+    def index(self, entity: str) -> int:
+        return self.entities.index(entity)
+
+    def curve(self, entity: str, years) -> np.ndarray:
+        """Fitted share (%) of one entity at ``years``."""
+        i = self.index(entity)
+        eta = self.intercept[i] + self.slope[i] * (np.asarray(years, dtype=float) - self.x0)
+        if self.model == "logistic":
+            return 100.0 / (1.0 + np.exp(-eta))
+        return eta
+
+    def table(self):
+        """One row per entity with enough points in the window."""
+        import pandas as pd
+
+        ok = self.n_obs >= 3
+        return pd.DataFrame({
+            "entity": np.asarray(self.entities)[ok],
+            "latest_share": self.latest[ok],
+            "trend_pp_per_year": self._trend_pp()[ok],
+            "crossing_year": self.crossing[ok],
+            "crossing_lo": self.lo[ok],
+            "crossing_hi": self.hi[ok],
+            "reached_in": self.reached[ok],
+            "points": self.n_obs[ok],
+        })
+
+    def _trend_pp(self) -> np.ndarray:
+        """Slope in percentage points per year at the latest observation."""
+        if self.model == "linear":
+            return self.slope
+        p = np.clip(self.latest, _EPS, 100 - _EPS) / 100
+        return self.slope * p * (1 - p) * 100
+
+
+def _transform(values: np.ndarray, model: str) -> np.ndarray:
+    if model == "linear":
+        return values
+    p = np.clip(values, _EPS, 100 - _EPS) / 100
+    return np.log(p / (1 - p))
+
+
+def batched_fit(x: np.ndarray, y: np.ndarray):
+    """Row-wise least squares of ``y`` (n, T) on ``x`` (T,), ignoring NaNs.
+
+    Returns ``(intercept, slope, slope_se, x0, n_obs)`` with the intercept
+    taken at the centre ``x0`` of ``x``.
+    """
+    w = ~np.isnan(y)
+    yz = np.where(w, y, 0.0)
+    x0 = float(x.mean())
+    xc = np.broadcast_to(x - x0, y.shape)
+
+    n = w.sum(axis=1).astype(float)
+    sx = (w * xc).sum(axis=1)
+    sy = yz.sum(axis=1)
+    sxx = (w * xc * xc).sum(axis=1)
+    sxy = (xc * yz).sum(axis=1)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mx, my = sx / n, sy / n
+        vxx = sxx - n * mx * mx
+        slope = (sxy - n * mx * my) / vxx
+        intercept = my - slope * mx
+        resid = np.where(w, y - (intercept[:, None] + slope[:, None] * xc), 0.0)
+        sigma2 = (resid ** 2).sum(axis=1) / (n - 2)
+        slope_se = np.sqrt(sigma2 / vxx)
+    return intercept, slope, slope_se, x0, n.astype(int)
+
+
+def _crossing(eta_target, intercept, slope, x0):
+    with np.errstate(invalid="ignore", divide="ignore"):
+        year = x0 + (eta_target - intercept) / slope
+    return year
+
+
+def project(entities, years, values, model="linear", window=20, target=50.0, z=1.96) -> Projection:
+    """Fit ``model`` to the last ``window`` years of every row of ``values``."""
+    if model not in MODELS:
+        raise ValueError(f"unknown model {model!r}; choose from {MODELS}")
+
+    has_data = ~np.isnan(values)
+    last_col = np.where(has_data.any(axis=0))[0]
+    end = last_col[-1] + 1 if last_col.size else len(years)
+    start = max(end - window, 0)
+    x = years[start:end].astype(float)
+    y = _transform(values[:, start:end], model)
+
+    intercept, slope, slope_se, x0, n_obs = batched_fit(x, y)
+    eta_target = float(_transform(np.array(target), model))
+
+    # crossing where the fitted line meets the target; only meaningful going up
+    crossing = np.where(slope > 0, _crossing(eta_target, intercept, slope, x0), np.nan)
+    ahead = intercept >= eta_target  # fitted centre of the window already above target
+    bounds = []
+    for b in (slope + z * slope_se, slope - z * slope_se):
+        never = np.where(ahead, -np.inf, np.inf)
+        bounds.append(np.where(b > 0, _crossing(eta_target, intercept, b, x0), never))
+    lo, hi = np.fmin(*bounds), np.fmax(*bounds)
+    lo[np.isinf(lo)] = np.nan
+
+    # last observed value and first year at/above target
+    idx = np.where(has_data, np.arange(len(years)), -1).max(axis=1)
+    latest = np.where(idx >= 0, values[np.arange(len(values)), np.maximum(idx, 0)], np.nan)
+    above = np.nan_to_num(values, nan=-np.inf) >= target
+    reached = np.where(above.any(axis=1), years[above.argmax(axis=1)], np.nan).astype(float)
+
+    too_few = n_obs < 3
+    for arr in (crossing, lo, hi):
+        arr[too_few] = np.nan
+
+    return Projection(
+        model=model, window=window, target=target, entities=list(entities), years=years,
+        values=values, intercept=intercept, slope=slope, slope_se=slope_se, x0=x0,
+        n_obs=n_obs, latest=latest, crossing=crossing, lo=lo, hi=hi, reached=reached,
+    )
+
+
+@disk_cache
+def renewables_projection(model: str = "linear", window: int = 20, target: float = 50.0,
+                          path=OWID_PATH) -> Projection:
+    """Projection of ``renewables_share_energy`` for World and every country."""
+    countries, years, values = owid_matrix(METRIC, path)
+
+    world = read_owid(path)
+    world = world[world["country"] == "World"].set_index("year")[METRIC]
+    world_row = world.reindex(years).to_numpy(dtype=float)[None, :]
+
+    return project(["World"] + countries, years, np.vstack([world_row, values]),
+                   model=model, window=window, target=target)
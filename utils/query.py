@@ -0,0 +1,212 @@
+"""
+Generic query engine over the OWID panel, used by the metric explorer.
+
+:func:`owid_columns` lays the validated OWID frame out once as shared
+numpy columns sorted by ``(entity, year)``, with per-entity row offsets, so
+a query for any metric × entities × year range is a few array slices rather
+than a new loader or a full-frame filter.  :class:`SearchIndex` is an
+inverted index over column names, units, entity names and the homepage
+questions; every token of a search string is prefix-matched against it.
+"""
+
+import ast
+import bisect
+import re
+from collections import defaultdict
+from dataclasses import dataclass, field
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from utils.cache import ROOT, disk_cache
+from utils.data import OWID_PATH, read_owid
+
+HOMEPAGE = ROOT / "Homepage.py"
+
+# (suffix or exact name, unit) – first match wins; OWID naming conventions
+UNITS = [
+    ("energy_per_gdp", "kWh per $"),
+    ("energy_per_capita", "kWh per person"),
+    ("elec_per_capita", "kWh per person"),
+    ("_per_capita", "per person"),
+    ("_share_energy", "% of primary energy"),
+    ("_share_elec", "% of electricity"),
+    ("_change_pct", "% change"),
+    ("_change_twh", "TWh change"),
+    ("carbon_intensity_elec", "gCO₂ per kWh"),
+    ("greenhouse_gas_emissions", "MtCO₂e"),
+    ("_consumption", "TWh"),
+    ("_electricity", "TWh"),
+    ("_production", "TWh"),
+    ("gdp", "international-$"),
+    ("population", "people"),
+]
+
+
+def unit_of(column: str) -> str:
+    for pattern, unit in UNITS:
+        if column == pattern or column.endswith(pattern):
+            return unit
+    return ""
+
+
+def label_of(column: str) -> str:
+    """``fossil_fuel_consumption`` → ``Fossil fuel consumption``."""
+    return column.replace("_", " ").capitalize()
+
+
+def question_pages(path=HOMEPAGE) -> list:
+    """``(question, page)`` pairs from the homepage, read without running it."""
+    tree = ast.parse(path.read_text(encoding="utf-8"))
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and any(
+            isinstance(t, ast.Name) and t.id == "question_page_pairs" for t in node.targets
+        ):
+            return [tuple(pair) for pair in ast.literal_eval(node.value)]
+    return []
+
+
+# ────────────────────────────────────────────────────────────
+# Columnar store
+# ────────────────────────────────────────────────────────────
+@dataclass
+class OwidColumns:
+    entities: list        # sorted entity names
+    iso: list             # ISO code per entity ("" for aggregates)
+    offsets: np.ndarray   # (len(entities) + 1,) row range of each entity
+    year: np.ndarray      # (rows,) int, ascending within an entity
+    columns: dict         # metric -> (rows,) float array
+    units: dict           # metric -> unit string
+    position: dict = field(init=False, repr=False)  # entity -> index into entities
+
+    def __post_init__(self):
+        self.position = {e: i for i, e in enumerate(self.entities)}
+
+    def metrics(self) -> list:
+        return sorted(self.columns)
+
+    def entity_rows(self, entity: str) -> slice:
+        i = self.position[entity]
+        return slice(int(self.offsets[i]), int(self.offsets[i + 1]))
+
+    def year_range(self) -> tuple:
+        return int(self.year.min()), int(self.year.max())
+
+
+@disk_cache
+def owid_columns(path=OWID_PATH) -> OwidColumns:
+    """Every numeric OWID column as a float array sorted by ``(country, year)``."""
+    df = read_owid(path).sort_values(["country", "year"], kind="stable")
+    entities, starts = np.unique(df["country"].to_numpy(dtype=str), return_index=True)
+    offsets = np.append(starts, len(df))
+
+    iso = df.drop_duplicates("country").set_index("country")["iso_code"]
+    numeric = [c for c in df.columns if c != "year" and pd.api.types.is_numeric_dtype(df[c])]
+    return OwidColumns(
+        entities=entities.tolist(),
+        iso=[str(iso.get(e)) if pd.notna(iso.get(e)) else "" for e in entities],
+        offsets=offsets,
+        year=df["year"].to_numpy(dtype=int),
+        columns={c: np.ascontiguousarray(df[c].to_numpy(dtype=float)) for c in numeric},
+        units={c: unit_of(c) for c in numeric},
+    )
+
+
+# ────────────────────────────────────────────────────────────
+# Search
+# ────────────────────────────────────────────────────────────
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text: str) -> list:
+    return _TOKEN.findall(str(text).lower())
+
+
+@dataclass
+class SearchIndex:
+    docs: list                                     # (kind, key, label, detail)
+    postings: dict = field(default_factory=dict)   # token -> set of doc ids
+    tokens: list = field(default_factory=list)     # sorted vocabulary, for prefix lookups
+
+    @classmethod
+    def build(cls, store: OwidColumns, pages=()) -> "SearchIndex":
+        docs = [("metric", m, label_of(m), store.units[m]) for m in store.metrics()]
+        docs += [("entity", e, e, code) for e, code in zip(store.entities, store.iso)]
+        docs += [("page", page, question, page) for question, page in pages]
+
+        postings = defaultdict(set)
+        for i, (kind, key, label, detail) in enumerate(docs):
+            for token in tokenize(f"{key} {label} {detail}"):
+                postings[token].add(i)
+        return cls(docs=docs, postings=dict(postings), tokens=sorted(postings))
+
+    def _prefix(self, token: str) -> set:
+        hits = set()
+        i = bisect.bisect_left(self.tokens, token)
+        while i < len(self.tokens) and self.tokens[i].startswith(token):
+            hits |= self.postings[self.tokens[i]]
+            i += 1
+        return hits
+
+    def search(self, text: str, kinds=None, limit: int = 20) -> list:
+        """Docs matching every token of ``text`` (prefix match); exact-token hits rank first."""
+        terms = tokenize(text)
+        if not terms:
+            return []
+        matched = None
+        for term in terms:
+            hits = self._prefix(term)
+            matched = hits if matched is None else matched & hits
+            if not matched:
+                return []
+        exact = lambda i: sum(i in self.postings.get(t, ()) for t in terms)
+        ranked = sorted(matched, key=lambda i: (-exact(i), len(self.docs[i][2]), self.docs[i][2]))
+        docs = [self.docs[i] for i in ranked]
+        if kinds:
+            docs = [d for d in docs if d[0] in kinds]
+        return docs[:limit]
+
+
+# ────────────────────────────────────────────────────────────
+# Query engine
+# ────────────────────────────────────────────────────────────
+class QueryEngine:
+    """Answers ``metric × entities × years`` queries from one shared :class:`OwidColumns`."""
+
+    def __init__(self, store: OwidColumns, pages=()):
+        self.store = store
+        self.index = SearchIndex.build(store, pages)
+        self.series = lru_cache(maxsize=512)(self._series)
+
+    def _series(self, metric: str, entities: tuple, start: int, end: int) -> pd.DataFrame:
+        s = self.store
+        values = s.columns[metric]
+        parts = []
+        for entity in entities:
+            rows = s.entity_rows(entity)
+            years = s.year[rows]
+            lo, hi = np.searchsorted(years, [start, end + 1])
+            v = values[rows][lo:hi]
+            keep = ~np.isnan(v)
+            parts.append((entity, years[lo:hi][keep], v[keep]))
+        return pd.DataFrame({
+            "entity": np.repeat([p[0] for p in parts], [len(p[1]) for p in parts]),
+            "year": np.concatenate([p[1] for p in parts]) if parts else np.array([], dtype=int),
+            metric: np.concatenate([p[2] for p in parts]) if parts else np.array([], dtype=float),
+        })
+
+    def query(self, metrics, entities, start: int, end: int) -> pd.DataFrame:
+        """Long ``entity, year, <metric>...`` frame; results per metric are memoised."""
+        metrics = [metrics] if isinstance(metrics, str) else list(metrics)
+        key = tuple(sorted(entities))
+        frames = [self.series(m, key, int(start), int(end)) for m in metrics]
+        out = frames[0]
+        for f in frames[1:]:
+            out = out.merge(f, on=["entity", "year"], how="outer")
+        return out.sort_values(["entity", "year"], kind="stable").reset_index(drop=True)
+
+
+def query_engine(path=OWID_PATH) -> QueryEngine:
+    """Engine over the current OWID release (build once per process and data version)."""
+    return QueryEngine(owid_columns(path), question_pages())
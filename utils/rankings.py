@@ -0,0 +1,74 @@
+"""
+Per-year ranking index for OWID metrics.
+
+Every year's ranking is precomputed once as an argsort index array, so a
+page with a year slider and a top-N slider only slices: ``order[year][:N]``.
+Missing values sort last and are cut off by the per-year ``counts``.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from utils.cache import disk_cache
+from utils.data import OWID_PATH, owid_matrix
+
+# default sort direction per metric: True = lowest value ranks first
+ASCENDING = {
+    "renewables_share_energy": False,
+    "low_carbon_share_energy": False,
+    "energy_per_gdp": True,
+    "fossil_share_energy": True,
+    "carbon_intensity_elec": True,
+}
+
+
+@dataclass
+class RankingIndex:
+    metric: str
+    ascending: bool
+    entities: list
+    years: np.ndarray   # (T,)
+    values: np.ndarray  # (n, T)
+    order: np.ndarray   # (T, n) entity indices, best first, NaN last
+    counts: np.ndarray  # (T,) entities with a value in each year
+
+    def years_with_data(self) -> list:
+        return self.years[self.counts > 0].tolist()
+
+    def top(self, year: int, n: int = None) -> pd.DataFrame:
+        """Ranked ``rank, <entity>, value`` rows for ``year`` (all of them if ``n`` is None)."""
+        col = int(np.searchsorted(self.years, year))
+        count = int(self.counts[col]) if n is None else min(n, int(self.counts[col]))
+        idx = self.order[col, :count]
+        return pd.DataFrame({
+            "rank": np.arange(1, count + 1),
+            "entity": np.asarray(self.entities, dtype=object)[idx],
+            "value": self.values[idx, col],
+        })
+
+
+def build_ranking(metric: str, entities, years, values, ascending: bool) -> RankingIndex:
+    """Argsort every year column of an ``(entities × years)`` matrix at once."""
+    key = values if ascending else -values
+    key = np.where(np.isnan(key), np.inf, key)
+    order = np.argsort(key.T, axis=1, kind="stable").astype(np.int32)
+    return RankingIndex(
+        metric=metric,
+        ascending=ascending,
+        entities=list(entities),
+        years=np.asarray(years),
+        values=values,
+        order=order,
+        counts=(~np.isnan(values)).sum(axis=0),
+    )
+
+
+@disk_cache
+def ranking_index(metric: str, ascending: bool = None, path=OWID_PATH) -> RankingIndex:
+    """Country ranking of an OWID ``metric`` for every year."""
+    if ascending is None:
+        ascending = ASCENDING.get(metric, False)
+    countries, years, values = owid_matrix(metric, path)
+    return build_ranking(metric, countries, years, values, ascending)
@@ -0,0 +1,274 @@
+"""
+Incremental refresh of OWID-derived tables.
+
+A new OWID release usually changes the latest year or two and a handful of
+revised series, yet a changed ``data_version`` makes every cached table
+recompute from scratch.  :func:`refresh` instead diffs the new release
+against the snapshot stored at the last refresh, cell by cell
+(``country, year, column``), and updates only what the changed cells feed:
+
+* **fossil totals**   – rows whose coal/oil/gas values changed
+* **period changes**  – countries whose start/end-year totals changed
+  (everything, if the latest year moved)
+* **rankings**        – year columns of each :data:`utils.rankings.ASCENDING`
+  metric that contain a changed value
+* **coverage**        – ±1 per added/removed cell, per column and year
+
+The updated results are written into the disk cache under the new data
+version (see ``disk_cache.prime``), so pages and the API pick them up
+without recomputing, and the cell changes are appended to a changelog.
+
+Snapshot and changelog live in ``ENERGY_REFRESH_DIR`` (default
+``<repo>/.cache/owid``).
+"""
+
+import os
+import pickle
+import tempfile
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from utils.cache import DATA_DIR, ROOT, data_version
+from utils.data import OWID_PATH, country_matrix, owid_matrix, read_owid
+from utils.metrics import (FOSSIL_COLUMNS, column_coverage, coverage_table,
+                           fossil_reductions, fossil_totals, period_changes)
+from utils.rankings import ASCENDING, RankingIndex, build_ranking, ranking_index
+
+STORE_DIR = Path(os.environ.get("ENERGY_REFRESH_DIR", ROOT / ".cache" / "owid"))
+SNAPSHOT = "snapshot.pkl"
+CHANGELOG = "changelog.csv"
+KEYS = ["country", "year"]
+PERIOD_YEARS = 10
+
+
+@dataclass
+class Snapshot:
+    version: str
+    frame: pd.DataFrame        # validated OWID release
+    totals: pd.DataFrame       # fossil_totals(frame)
+    periods: tuple             # fossil_reductions() result
+    rankings: dict             # metric -> RankingIndex
+    coverage: pd.DataFrame     # coverage_table(frame)
+
+
+@dataclass
+class RefreshReport:
+    version: str
+    full: bool                   # True when there was no snapshot to diff against
+    changes: pd.DataFrame        # country, year, column, old, new, change
+    recomputed: dict = field(default_factory=dict)  # derived table -> what was redone
+
+    def summary(self) -> pd.DataFrame:
+        """Changed cells per column and kind of change."""
+        if self.changes.empty:
+            return pd.DataFrame(columns=["column", "change", "cells"])
+        return (
+            self.changes.groupby(["column", "change"]).size()
+            .rename("cells").reset_index().sort_values("cells", ascending=False)
+        )
+
+
+# ────────────────────────────────────────────────────────────
+# Cell-level diff
+# ────────────────────────────────────────────────────────────
+def diff_releases(old: pd.DataFrame, new: pd.DataFrame, rtol: float = 1e-9) -> pd.DataFrame:
+    """Cells that differ between two releases: ``country, year, column, old, new, change``.
+
+    ``change`` is ``added`` (no value before), ``removed`` (no value now) or
+    ``revised``.  Rows, columns or values present on one side only count as
+    added/removed cells; non-numeric columns compare by equality.
+    """
+    old = old.set_index(KEYS)
+    new = new.set_index(KEYS)
+    columns = sorted((set(old.columns) | set(new.columns)) - set(KEYS))
+    index = old.index.union(new.index)
+    old = old.reindex(index=index, columns=columns)
+    new = new.reindex(index=index, columns=columns)
+
+    frames = []
+    for col in columns:
+        a, b = old[col], new[col]
+        a_has, b_has = a.notna().to_numpy(), b.notna().to_numpy()
+        if pd.api.types.is_numeric_dtype(a) and pd.api.types.is_numeric_dtype(b):
+            av, bv = a.to_numpy(dtype=float), b.to_numpy(dtype=float)
+            with np.errstate(invalid="ignore"):
+                same = np.isclose(av, bv, rtol=rtol, atol=0.0)
+        else:
+            same = (a.astype("string") == b.astype("string")).fillna(False).to_numpy(dtype=bool)
+        changed = (a_has != b_has) | (a_has & b_has & ~same)
+        if not changed.any():
+            continue
+        frames.append(pd.DataFrame({
+            "country": index.get_level_values("country")[changed],
+            "year": index.get_level_values("year")[changed],
+            "column": col,
+            "old": a.to_numpy(dtype=object)[changed],
+            "new": b.to_numpy(dtype=object)[changed],
+            "change": np.select([~a_has[changed], ~b_has[changed]], ["added", "removed"], "revised"),
+        }))
+
+    if not frames:
+        return pd.DataFrame(columns=["country", "year", "column", "old", "new", "change"])
+    return pd.concat(frames, ignore_index=True)
+
+
+# ────────────────────────────────────────────────────────────
+# Incremental updates of the derived tables
+# ────────────────────────────────────────────────────────────
+def update_totals(prev: pd.DataFrame, new: pd.DataFrame, changes: pd.DataFrame) -> pd.DataFrame:
+    """Recompute fossil totals only for rows with a changed fuel value (or new/removed rows)."""
+    touched = changes.loc[changes["column"].isin(FOSSIL_COLUMNS), KEYS].drop_duplicates()
+    new_keys = pd.MultiIndex.from_frame(new[KEYS])
+    prev = prev.set_index(KEYS)
+    prev = prev[prev.index.isin(new_keys)]  # drop removed rows
+
+    touched_idx = pd.MultiIndex.from_frame(touched) if len(touched) else pd.MultiIndex.from_tuples([], names=KEYS)
+    missing = new_keys.difference(prev.index)
+    redo = new_keys.isin(touched_idx.union(missing))
+    fresh = fossil_totals(new[redo]).set_index(KEYS)
+
+    out = pd.concat([prev[~prev.index.isin(fresh.index)], fresh]).reindex(new_keys)
+    return out.reset_index()
+
+
+def update_periods(prev: tuple, totals: pd.DataFrame, changes: pd.DataFrame, years: int = PERIOD_YEARS):
+    """Refresh the period-change table for countries whose end-point totals changed."""
+    max_year = int(totals["year"].max())
+    start_year = max_year - years
+    prev_table, prev_start, prev_max = prev
+    if (prev_start, prev_max) != (start_year, max_year):
+        return period_changes(totals, start_year, max_year), start_year, max_year, "all"
+
+    fuel = changes[changes["column"].isin(FOSSIL_COLUMNS) & changes["year"].isin([start_year, max_year])]
+    affected = set(fuel["country"])
+    if not affected:
+        return prev_table, start_year, max_year, []
+    fresh = period_changes(totals[totals["country"].isin(affected)], start_year, max_year)
+    kept = prev_table[~prev_table["country"].isin(affected)]
+    table = pd.concat([kept, fresh], ignore_index=True).sort_values("change_pct")
+    return table, start_year, max_year, sorted(affected)
+
+
+def update_ranking(prev: RankingIndex, countries, years, values) -> tuple:
+    """Re-sort only the year columns whose values changed; full rebuild if the axes moved."""
+    if list(prev.entities) != list(countries) or not np.array_equal(prev.years, years):
+        return build_ranking(prev.metric, countries, years, values, prev.ascending), "all"
+
+    differs = ~((prev.values == values) | (np.isnan(prev.values) & np.isnan(values)))
+    cols = np.flatnonzero(differs.any(axis=0))
+    if not cols.size:
+        return prev, []
+    part = build_ranking(prev.metric, countries, years[cols], values[:, cols], prev.ascending)
+    order, counts = prev.order.copy(), prev.counts.copy()
+    order[cols], counts[cols] = part.order, part.counts
+    index = RankingIndex(prev.metric, prev.ascending, list(countries), years, values, order, counts)
+    return index, years[cols].tolist()
+
+
+def update_coverage(prev: pd.DataFrame, changes: pd.DataFrame) -> pd.DataFrame:
+    """Apply +1 / -1 per added / removed cell to the coverage table."""
+    sign = changes["change"].map({"added": 1, "removed": -1, "revised": 0})
+    delta = sign.groupby([changes["column"], changes["year"]]).sum()
+    if delta.empty:
+        return prev
+    delta = delta.unstack("year", fill_value=0)
+    index = prev.index.append(delta.index.difference(prev.index))  # keep column order
+    cols = prev.columns.union(delta.columns)
+    out = prev.reindex(index=index, columns=cols, fill_value=0) + delta.reindex(index=index, columns=cols, fill_value=0)
+    out = out.astype(int)
+    out.columns.name = prev.columns.name
+    return out
+
+
+# ────────────────────────────────────────────────────────────
+# Snapshot store
+# ────────────────────────────────────────────────────────────
+def load_snapshot(store_dir: Path = STORE_DIR):
+    try:
+        with open(Path(store_dir) / SNAPSHOT, "rb") as fh:
+            return pickle.load(fh)
+    except (FileNotFoundError, EOFError, pickle.UnpicklingError):
+        return None
+
+
+def save_snapshot(snapshot: Snapshot, store_dir: Path = STORE_DIR) -> None:
+    store_dir = Path(store_dir)
+    store_dir.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=store_dir, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as fh:
+            pickle.dump(snapshot, fh, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, store_dir / SNAPSHOT)
+    finally:
+        Path(tmp).unlink(missing_ok=True)
+
+
+def append_changelog(changes: pd.DataFrame, version: str, store_dir: Path = STORE_DIR) -> Path:
+    path = Path(store_dir) / CHANGELOG
+    if not changes.empty:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        changes.assign(release=version).to_csv(path, mode="a", header=not path.exists(), index=False)
+    return path
+
+
+# ────────────────────────────────────────────────────────────
+# Refresh
+# ────────────────────────────────────────────────────────────
+def _ranked_metrics(frame: pd.DataFrame) -> list:
+    return [m for m in ASCENDING if m in frame.columns]
+
+
+def refresh(path=OWID_PATH, store_dir: Path = STORE_DIR) -> RefreshReport:
+    """Bring the derived OWID tables up to date with the release at ``path``.
+
+    ``path`` must be in ``data/``: results are cached under
+    :func:`~utils.cache.data_version`, which only fingerprints that
+    directory, so a release elsewhere could be replaced without the cache
+    noticing.
+    """
+    if Path(path).resolve().parent != DATA_DIR.resolve():
+        raise ValueError(f"refresh reads releases from data/ only (the cache fingerprints that directory), got {path}")
+    version = data_version()
+    new = read_owid(path)
+    prev = load_snapshot(store_dir)
+
+    matrices = {m: country_matrix(new, m) for m in _ranked_metrics(new)}
+
+    if prev is None:
+        totals = fossil_totals(new)
+        max_year = int(new["year"].max())
+        periods = (period_changes(totals, max_year - PERIOD_YEARS, max_year), max_year - PERIOD_YEARS, max_year)
+        rankings = {m: build_ranking(m, *matrices[m], ASCENDING[m]) for m in matrices}
+        coverage = coverage_table(new)
+        changes = diff_releases(new.iloc[:0], new.iloc[:0])
+        recomputed = {"fossil_totals": "all", "period_changes": "all", "coverage": "all",
+                      **{f"ranking:{m}": "all" for m in rankings}}
+    else:
+        changes = diff_releases(prev.frame, new)
+        totals = update_totals(prev.totals, new, changes)
+        table, start_year, max_year, redone = update_periods(prev.periods, totals, changes)
+        periods = (table, start_year, max_year)
+        rankings, recomputed = {}, {"period_changes": redone}
+        for m, (countries, years, values) in matrices.items():
+            if m in prev.rankings:
+                rankings[m], recomputed[f"ranking:{m}"] = update_ranking(prev.rankings[m], countries, years, values)
+            else:
+                rankings[m], recomputed[f"ranking:{m}"] = build_ranking(m, countries, years, values, ASCENDING[m]), "all"
+        coverage = update_coverage(prev.coverage, changes)
+        fuel_rows = changes[changes["column"].isin(FOSSIL_COLUMNS)][KEYS].drop_duplicates()
+        recomputed["fossil_totals"] = len(fuel_rows)
+        recomputed["coverage"] = int((changes["change"] != "revised").sum())
+
+    # publish under the new data version so readers skip the full recompute
+    fossil_reductions.prime(periods, path)
+    column_coverage.prime(coverage, path)
+    for m, index in rankings.items():
+        owid_matrix.prime(matrices[m], m, path)
+        ranking_index.prime(index, m, ASCENDING[m], path)
+
+    save_snapshot(Snapshot(version, new, totals, periods, rankings, coverage), store_dir)
+    append_changelog(changes, version, store_dir)
+    return RefreshReport(version=version, full=prev is None, changes=changes, recomputed=recomputed)
@@ -0,0 +1,207 @@
+"""
+Declarative schema registry for every source file in ``data/``.
+
+Each loader in :mod:`utils.data` / :mod:`utils.iea` passes its raw frame
+through :func:`validate` with the matching schema.  Because the loaders are
+disk cached, column checks, numeric coercion and range checks run once per
+data release instead of once per page per process, and pages receive frames
+whose required columns are guaranteed present and typed.
+
+Rules
+-----
+* A missing **required** column raises :class:`SchemaError`.  Columns only
+  some views read are optional; those views check them with :func:`require`
+  where they use them, so a release without one breaks only those views.
+* ``float`` / ``int`` columns are coerced with ``pd.to_numeric(errors="coerce")``
+  (skipped when already numeric); ``int`` columns become ``int64`` once no
+  value is missing.
+* ``str`` columns are converted to stripped text (missing values stay
+  missing).  A ``str`` **key** column whose values are all numbers raises
+  :class:`SchemaError` – it usually means a shifted header row.
+* **key** columns must be non-null; rows where they are missing are dropped.
+* Values outside ``[min, max]`` are replaced with NaN and logged.
+"""
+
+import logging
+from dataclasses import dataclass
+
+import pandas as pd
+from pandas.api.types import is_numeric_dtype
+
+log = logging.getLogger(__name__)
+
+
+class SchemaError(ValueError):
+    """A source file does not match its declared schema."""
+
+
+@dataclass(frozen=True)
+class Column:
+    name: str
+    dtype: str = "float"  # "float", "int" or "str"
+    required: bool = True
+    key: bool = False
+    min: float = None
+    max: float = None
+
+
+@dataclass(frozen=True)
+class Schema:
+    source: str
+    columns: tuple
+    normalise_columns: bool = False  # strip + lower-case headers before checking
+
+    def names(self) -> list:
+        return [c.name for c in self.columns]
+
+
+def validate(df: pd.DataFrame, schema: Schema) -> pd.DataFrame:
+    """Check and coerce ``df`` against ``schema``; returns the cleaned frame."""
+    df = df.copy()
+    if schema.normalise_columns:
+        df.columns = df.columns.astype(str).str.strip().str.lower()
+
+    missing = [c.name for c in schema.columns if c.required and c.name not in df.columns]
+    if missing:
+        raise SchemaError(f"{schema.source}: missing required column(s) {', '.join(missing)}")
+
+    for col in schema.columns:
+        if col.name not in df.columns:
+            continue
+        series = df[col.name]
+
+        if col.dtype in ("float", "int"):
+            if not is_numeric_dtype(series):
+                series = pd.to_numeric(series, errors="coerce")
+            out = pd.Series(False, index=series.index)
+            if col.min is not None:
+                out |= series < col.min
+            if col.max is not None:
+                out |= series > col.max
+            if out.any():
+                log.warning("%s: %d value(s) of %s outside [%s, %s] set to NaN",
+                            schema.source, int(out.sum()), col.name, col.min, col.max)
+                series = series.mask(out)
+            df[col.name] = series
+        elif col.dtype == "str":
+            text = series.where(series.isna(), series.astype(str)).str.strip()
+            present = text.dropna()
+            if col.key and len(present) and pd.to_numeric(present, errors="coerce").notna().all():
+                raise SchemaError(f"{schema.source}: key column {col.name} holds only numbers, expected text")
+            df[col.name] = text
+
+    keys = [c.name for c in schema.columns if c.key and c.name in df.columns]
+    if keys:
+        df = df.dropna(subset=keys)
+
+    for col in schema.columns:
+        if col.dtype == "int" and col.name in df.columns and df[col.name].notna().all():
+            df[col.name] = df[col.name].astype("int64")
+    return df
+
+
+def require(df: pd.DataFrame, columns, schema: Schema) -> pd.DataFrame:
+    """Raise :class:`SchemaError` unless ``df`` has every column in ``columns``; returns ``df``."""
+    missing = [c for c in columns if c not in df.columns]
+    if missing:
+        raise SchemaError(f"{schema.source}: missing column(s) {', '.join(missing)} needed for this view")
+    return df
+
+
+# ────────────────────────────────────────────────────────────
+# Registry
+# ────────────────────────────────────────────────────────────
+def _share(name, required=True):
+    return Column(name, min=0, max=100, required=required)
+
+
+def _non_negative(name, required=True):
+    return Column(name, min=0, required=required)
+
+
+OWID = Schema(
+    source="owid-energy-data.xlsx",
+    normalise_columns=True,
+    columns=(
+        Column("country", "str", key=True),
+        Column("year", "int", key=True, min=1800, max=2100),
+        Column("iso_code", "str"),
+        # metrics: each view checks the ones it reads (see require)
+        _non_negative("coal_consumption", required=False),
+        _non_negative("oil_consumption", required=False),
+        _non_negative("gas_consumption", required=False),
+        _non_negative("fossil_fuel_consumption", required=False),
+        _share("renewables_share_energy", required=False),
+        _non_negative("energy_per_gdp", required=False),
+        _non_negative("gdp", required=False),
+        _share("fossil_share_energy", required=False),
+        _share("low_carbon_share_energy", required=False),
+        _non_negative("primary_energy_consumption", required=False),
+        _non_negative("population", required=False),
+    ),
+)
+
+PETROLEUM = Schema(
+    source="INT-Export petroleum production",
+    columns=(
+        Column("country", "str", key=True),
+        Column("series_name", "str", key=True),
+        Column("year", "int", key=True, min=1900, max=2100),
+        Column("production_mbpd", key=True),
+    ),
+)
+
+IEA_WORLD = Schema(
+    source="IEA World-series files",
+    columns=(
+        Column("dataset", "str", key=True),
+        Column("indicator", "str", key=True),
+        Column("year", "int", key=True, min=1900, max=2100),
+        Column("value", key=True),
+        Column("unit", "str", required=False),
+    ),
+)
+
+COUNTRIES = Schema(
+    source="Countries.csv",
+    normalise_columns=True,
+    columns=(
+        Column("country name", "str", key=True),
+        Column("country code", "str", key=True),
+        Column("year", "int", key=True, min=1900, max=2100),
+        _non_negative("gdp per capita"),
+        _non_negative("population", required=False),
+        Column("continent name", "str", required=False),
+    ),
+)
+
+BP_SCENARIOS = Schema(
+    source="bpEO24-change-in-oil-demand-by-region.xlsx",
+    columns=(
+        Column("Year", "str", key=True),
+        Column("Developed"),
+        Column("China"),
+        Column("Emerging ex. China"),
+        Column("Total"),
+    ),
+)
+
+EMBER = Schema(
+    source="emberChartData*.xlsx",
+    normalise_columns=True,
+    columns=(
+        Column("country_or_region", "str", key=True),
+        Column("year", "int", key=True, min=1900, max=2100),
+        Column("variable", "str", key=True),
+        _non_negative("generation_twh"),
+    ),
+)
+
+SCHEMAS = {
+    "owid": OWID,
+    "petroleum": PETROLEUM,
+    "iea_world": IEA_WORLD,
+    "countries": COUNTRIES,
+    "bp_scenarios": BP_SCENARIOS,
+    "ember": EMBER,
+}
@@ -0,0 +1,141 @@
+"""
+Trajectory-similarity index: "which countries have a path like India's?"
+
+Every pairwise score is computed from the years *both* countries report:
+with the zero-filled country × year matrix ``X`` and its presence mask
+``M``, the per-pair counts, sums, sums of squares and cross products are
+the matrix products ``M·Mᵀ``, ``X·Mᵀ``, ``X²·Mᵀ`` and ``X·Xᵀ``, which give
+the Pearson correlation of every pair in one vectorised pass.  Only the
+top-k neighbours per country are kept.  The index is disk cached per metric and
+data version, so a lookup at request time is a row read of ``k`` entries.
+
+Scores
+------
+``correlation``  Pearson correlation over the years both countries report;
+                 higher is closer.
+``distance``     RMS difference over the shared years of the two series,
+                 each z-normalised over *all* its own years (so the shape
+                 is compared, not the country's size).  Unlike ``r`` it also
+                 sees where the shared years sit in each country's own
+                 range, e.g. a country that peaked while the other was
+                 still rising.  Lower is closer.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from utils.cache import disk_cache
+from utils.data import OWID_PATH, owid_matrix
+
+
+@dataclass
+class SimilarityIndex:
+    metric: str
+    method: str
+    countries: list
+    neighbours: np.ndarray  # (n, k) row indices into ``countries``, best first; -1 = none
+    scores: np.ndarray      # (n, k) score of each neighbour
+    overlap: np.ndarray     # (n, k) number of shared years behind each score
+
+    def lookup(self, country: str) -> pd.DataFrame:
+        """Nearest neighbours of ``country`` (empty frame if unknown)."""
+        try:
+            row = self.countries.index(country)
+        except ValueError:
+            return pd.DataFrame(columns=["country", "score", "shared_years"])
+        keep = self.neighbours[row] >= 0
+        return pd.DataFrame({
+            "country": [self.countries[i] for i in self.neighbours[row][keep]],
+            "score": self.scores[row][keep].round(3),
+            "shared_years": self.overlap[row][keep],
+        })
+
+
+def _standardise(values: np.ndarray):
+    """Rows z-normalised over their own years (0 where missing) and the presence mask as floats."""
+    mask = ~np.isnan(values)
+    m = mask.astype(float)
+    count = np.maximum(m.sum(axis=1, keepdims=True), 1)
+    centred = np.where(mask, values - np.where(mask, values, 0.0).sum(axis=1, keepdims=True) / count, 0.0)
+    scale = np.sqrt((centred ** 2).sum(axis=1, keepdims=True) / count)
+    return centred / np.where(scale > 0, scale, 1.0), m
+
+
+def pairwise_correlation(values: np.ndarray):
+    """Pearson correlation of every pair of rows over the columns both report.
+
+    Returns ``(r, overlap)``, both ``(n, n)``; ``r`` is NaN where a pair shares
+    fewer than two years or one series is constant over the shared years.
+    """
+    # standardise each row first: r is unchanged, but the sums stay well conditioned
+    x, m = _standardise(values)
+
+    n = m @ m.T
+    sx = x @ m.T              # sx[i, j] = Σ x_i over the years shared with j
+    sxx = (x * x) @ m.T
+    sxy = x @ x.T
+    with np.errstate(invalid="ignore", divide="ignore"):
+        var = n * sxx - sx * sx
+        r = (n * sxy - sx * sx.T) / np.sqrt(var * var.T)
+    r[(n < 2) | ~(var > 1e-12 * n * n) | ~(var.T > 1e-12 * n * n)] = np.nan
+    return np.clip(r, -1.0, 1.0), n
+
+
+def pairwise_distance(values: np.ndarray):
+    """RMS difference of every pair of rows over the columns both report.
+
+    Each row is z-normalised over all its own years first; the squared
+    distance over the shared years is ``Σzᵢ² + Σzⱼ² − 2·Σzᵢzⱼ``, again as
+    matrix products.  Returns ``(d, overlap)``, both ``(n, n)``; ``d`` is NaN
+    where a pair shares fewer than two years.
+    """
+    z, m = _standardise(values)
+    n = m @ m.T
+    szz = (z * z) @ m.T       # szz[i, j] = Σ z_i² over the years shared with j
+    with np.errstate(invalid="ignore", divide="ignore"):
+        d = np.sqrt(np.maximum(szz + szz.T - 2 * (z @ z.T), 0.0) / n)
+    d[n < 2] = np.nan
+    return d, n
+
+
+@disk_cache
+def similarity_index(
+    metric: str = "fossil_fuel_consumption",
+    method: str = "correlation",
+    k: int = 10,
+    min_overlap: int = 10,
+    path=OWID_PATH,
+) -> SimilarityIndex:
+    """Build the top-``k`` neighbour index for every country on ``metric``.
+
+    Pairs sharing fewer than ``min_overlap`` years are never neighbours.
+    """
+    if method not in ("correlation", "distance"):
+        raise ValueError(f"unknown method {method!r}")
+
+    countries, _, values = owid_matrix(metric, path)
+    pairwise = pairwise_correlation if method == "correlation" else pairwise_distance
+    score, overlap = pairwise(values)
+
+    # rank so that larger is always better
+    rank_key = score if method == "correlation" else -score
+    rank_key = np.where((overlap >= min_overlap) & ~np.isnan(rank_key), rank_key, -np.inf)
+    np.fill_diagonal(rank_key, -np.inf)
+
+    n = len(countries)
+    k = max(0, min(k, n - 1))
+    top = np.argpartition(-rank_key, k - 1, axis=1)[:, :k] if k else np.empty((n, 0), dtype=int)
+    order = np.argsort(-np.take_along_axis(rank_key, top, axis=1), axis=1)
+    top = np.take_along_axis(top, order, axis=1)
+
+    valid = np.isfinite(np.take_along_axis(rank_key, top, axis=1))
+    return SimilarityIndex(
+        metric=metric,
+        method=method,
+        countries=countries,
+        neighbours=np.where(valid, top, -1),
+        scores=np.take_along_axis(score, top, axis=1),
+        overlap=np.take_along_axis(overlap, top, axis=1).astype(int),
+    )
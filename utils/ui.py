@@ -0,0 +1,234 @@
+"""Streamlit widgets shared by several pages."""
+
+import functools
+import logging
+import sys
+import time
+from pathlib import Path
+
+import streamlit as st
+
+from utils.export import FORMATS, download_bytes, export_file
+from utils.schema import SchemaError
+
+log = logging.getLogger(__name__)
+
+
+def export_buttons(name: str, frame, filters=None, formats=("csv", "parquet")):
+    """CSV / Parquet download buttons for one dataset.
+
+    The file is generated in chunks only when a button is clicked (in
+    Streamlit's download thread, without a rerun) and cached per data
+    version and ``filters``; see :func:`utils.export.export_file`.
+    ``frame`` may be a DataFrame or a zero-argument callable returning one.
+    Files over ``ENERGY_DOWNLOAD_MAX_MB`` are refused (see
+    :func:`utils.export.download_bytes`).
+    """
+    cols = st.columns(len(formats) + 2)  # trailing spacer keeps the buttons compact
+    for col, fmt in zip(cols, formats):
+        col.download_button(
+            f"⬇️ {fmt.upper()}",
+            data=lambda fmt=fmt: download_bytes(export_file(frame, name, fmt, filters)),
+            file_name=f"{name}.{fmt}",
+            mime=FORMATS[fmt],
+            key=f"export-{name}-{fmt}",
+            on_click="ignore",
+        )
+
+
+def load_or_stop(loader, *args, **kwargs):
+    """Call a page's data loader, turning a missing or malformed source file into a page error.
+
+    Schema problems are detected once at ingest (see :mod:`utils.schema`);
+    this shows them as a readable message instead of a traceback.
+    """
+    try:
+        return loader(*args, **kwargs)
+    except SchemaError as exc:
+        st.error(f"Data file does not match its expected schema – {exc}")
+    except FileNotFoundError as exc:
+        st.error(f"Data file not found: `{exc.filename or exc}`")
+    stop()
+
+
+def stop():
+    """``st.stop()`` for a page: saves the rerun's profile first (see :func:`profile_page`)."""
+    _finish_profile()
+    st.stop()
+
+
+def end_page(page: str, shared=()):
+    """End-of-page hook: call once as the last line of a page as ``end_page(__file__)``.
+
+    Runs :func:`memory_guard` on the page's top-level variables and saves
+    the rerun's profile (see :func:`profile_page`).  ``shared`` is passed
+    on to the guard.
+    """
+    memory_guard(page, sys._getframe(1).f_globals, shared)
+    _finish_profile()
+
+
+def _widget_keys() -> set:
+    """Session-state keys bound to a widget on the page."""
+    from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+    ctx = get_script_run_ctx()
+    try:
+        return set(ctx.session_state._state._key_id_mapper._key_id_mapping)
+    except AttributeError:  # no script context, or Streamlit internals moved: trim nothing
+        return set(st.session_state.keys())
+
+
+def memory_guard(page: str, namespace: dict, shared=()):
+    """Record what this session holds for ``page`` and enforce the per-session budget.
+
+    ``namespace`` is the page script's globals; ``shared`` names top-level
+    variables every session sees (``st.cache_resource`` results), which are
+    not charged to the session.  When state pushes state plus page objects
+    over ``ENERGY_SESSION_BUDGET_MB``, the largest state entries not bound
+    to a widget are dropped with a warning (see :func:`utils.memory.trim_plan`).
+    Add ``?memory=1`` to the URL to show the process-wide report in the
+    sidebar.
+    """
+    from utils.memory import BUDGET_BYTES, LEDGER, deep_sizeof, page_objects, trim_plan
+
+    session_id = _session_id()
+    page_name = Path(page).stem
+
+    held = sum(page_objects(namespace, shared).values())
+    sizes = {key: deep_sizeof(value) for key, value in st.session_state.items()}
+    drop = trim_plan(sizes, BUDGET_BYTES, fixed=held, protected=_widget_keys())
+    for key in drop:
+        del st.session_state[key]
+    if drop:
+        freed = sum(sizes[k] for k in drop)
+        log.warning("session %s on %s over budget: trimmed %s (%.1f MB)", session_id, page_name, drop, freed / 2**20)
+        st.toast(f"⚠️ Session memory exceeded {BUDGET_BYTES / 2**20:.0f} MB – cleared {len(drop)} large entr{'y' if len(drop) == 1 else 'ies'}.")
+    state = sum(sizes.values()) - sum(sizes[k] for k in drop)
+    LEDGER.record(session_id, page_name, state, page_bytes=held, trimmed=len(drop))
+
+    if st.query_params.get("memory") == "1":
+        summary = LEDGER.summary()
+        with st.sidebar.expander("🧠 Memory", expanded=True):
+            mb = lambda b: f"{b / 2**20:,.1f} MB"
+            st.markdown(
+                f"- Process RSS: **{mb(summary['rss_bytes'])}**\n"
+                f"- Active sessions: **{summary['sessions']}** ({summary['over_budget']} over budget)\n"
+                f"- Per-session: **{mb(summary['session_bytes'])}** (state {mb(summary['state_bytes'])})\n"
+                f"- Shared (caches, libraries): **{mb(summary['shared_bytes'])}**\n"
+                f"- Budget per session: {mb(summary['budget_bytes'])}"
+            )
+            st.dataframe(LEDGER.by_page(), hide_index=True, use_container_width=True)
+
+
+# ──────────────────────────────────────────────────────────
+# Profiling
+# ──────────────────────────────────────────────────────────
+_profiles = {}  # session id -> (profiler, page, mode, started)
+
+
+def _session_id() -> str:
+    from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+    ctx = get_script_run_ctx()
+    return ctx.session_id if ctx else "bare"
+
+
+def _profile_mode():
+    from utils.profiling import ENABLED, MODES
+
+    mode = st.query_params.get("profile")
+    return mode if ENABLED and mode in MODES else None
+
+
+
+def profile_page(page: str):
+    """Profile this rerun of ``page`` when the URL has ``?profile=1`` or ``?profile=cold``.
+
+    Call right after ``st.set_page_config`` as ``profile_page(__file__)``;
+    the run is saved by :func:`end_page` at the end of the page, which
+    also lists the page's saved runs in the sidebar with download links.
+    ``cold`` clears ``st.cache_data`` / ``st.cache_resource`` for the whole
+    process and makes the disk cache recompute, so the loaders' source
+    files are parsed again; because that affects every session it also
+    needs ``&token=`` matching ``ENERGY_PROFILING_COLD_TOKEN``, and runs
+    warm without it.  Needs ``ENERGY_PROFILING=1``
+    (see :mod:`utils.profiling`).
+    """
+    mode = _profile_mode()
+    if mode is None:
+        return
+    from utils import profiling
+    from utils.cache import recompute
+
+    session_id = _session_id()
+    stale = _profiles.pop(session_id, None)  # previous run ended in an exception
+    if stale:
+        stale[0].disable()
+    if mode == "cold" and not profiling.cold_allowed(st.query_params.get("token", "")):
+        st.toast("⏱️ Cold profiling needs a valid token – profiling this run warm.")
+        mode = "1"
+    if mode == "cold":
+        st.cache_data.clear()
+        st.cache_resource.clear()
+        recompute(True)
+    _profiles[session_id] = (profiling.start(), Path(page).stem, mode, time.perf_counter())
+
+
+def _finish_profile():
+    run = _profiles.pop(_session_id(), None)
+    if run is None:
+        return
+    from utils import profiling
+    from utils.cache import recompute
+
+    profiler, page, mode, started = run
+    recompute(False)
+    path = profiling.save(profiler, page, "cold" if mode == "cold" else "page")
+    elapsed = time.perf_counter() - started
+    log.info("profiled %s (%s) in %.2f s -> %s", page, mode, elapsed, path)
+    _profile_sidebar(page, path, elapsed)
+
+
+def _profile_sidebar(page: str, latest: Path, elapsed: float):
+    from utils import profiling
+
+    with st.sidebar.expander("⏱️ Profile", expanded=True):
+        st.markdown(f"This rerun took **{elapsed:.2f} s** – saved as `{latest.name}`.")
+        st.dataframe(profiling.top_functions(latest, limit=15), hide_index=True, use_container_width=True)
+        saved = profiling.runs(page)
+        run = st.selectbox("Saved runs", saved, format_func=lambda p: p.stem, key="_profile_run")
+        c1, c2 = st.columns(2)
+        c1.download_button("⬇️ pstats", data=lambda: run.read_bytes(), file_name=run.name,
+                           mime="application/octet-stream", key="_profile_pstats", on_click="ignore")
+        c2.download_button("🔥 Flame graph", data=lambda: profiling.flame_html(run).read_bytes(),
+                           file_name=f"{page}-{run.stem}.html", mime="text/html",
+                           key="_profile_flame", on_click="ignore")
+        st.caption(f"Files: `{latest.parent}`")
+
+
+def fragment(func):
+    """``st.fragment`` for a page's interactive sections, profiled under ``?profile=``.
+
+    Changing a widget inside the function reruns only that function, not
+    the whole page script.  During a full page run the fragment is part of
+    the page's profile; a fragment-only rerun is saved as a separate run
+    labelled with the function name and announced with a toast.
+    """
+    page = Path(func.__code__.co_filename).stem
+
+    @functools.wraps(func)
+    def run(*args, **kwargs):
+        if _profile_mode() is None or _session_id() in _profiles:
+            return func(*args, **kwargs)
+        from utils import profiling
+
+        profiler = profiling.start()
+        started = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            path = profiling.save(profiler, page, func.__name__)
+            st.toast(f"⏱️ {func.__name__} rerun took {time.perf_counter() - started:.2f} s – saved as {path.name}")
+
+    return st.fragment(run)